@@ -0,0 +1,104 @@
+"""
+Time-partitioned archive of old jobs.
+
+``archive_jobs`` moves jobs scraped before a cutoff from the hot ``Job``
+table into ``ArchivedJob`` (description zstd-compressed, partitioned by
+``period`` = YYYYMM), batch by batch, so dashboard and export queries only
+scan the recent working set. Their source links, near-duplicate signatures
+and full-text rows go with them. ``drop_archive_periods`` enforces
+retention by deleting whole periods.
+
+History stays readable through ``Job.objects.with_history()``.
+"""
+import time
+from datetime import timedelta
+from typing import Dict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .compression import compress_text
+from .models import ArchivedJob, Description, Job, JobBand, JobSignature, JobSource
+from .stats import subtract_jobs
+
+ARCHIVE_BATCH_SIZE = 2000
+
+
+def archive_period(moment) -> int:
+    return moment.year * 100 + moment.month
+
+
+def default_cutoff():
+    return timezone.now() - timedelta(days=getattr(settings, "ARCHIVE_AFTER_DAYS", 90))
+
+
+@transaction.atomic
+def _archive_batch(ids) -> int:
+    now = timezone.now()
+    jobs = list(Job.objects.filter(id__in=ids).with_descriptions())
+    rows = [
+        ArchivedJob(
+            id=job.id,
+            period=archive_period(job.scraped_at),
+            title=job.title,
+            location=job.location,
+            company_id=job.company_id,
+            description_zstd=compress_text(job.description),
+            source_url=job.source_url,
+            sources=job.sources,
+            fingerprint=job.fingerprint,
+            fingerprint_hash=job.fingerprint_hash,
+            posted_at=job.posted_at,
+            scraped_at=job.scraped_at,
+            archived_at=now,
+        )
+        for job in jobs
+    ]
+    ArchivedJob.objects.bulk_create(rows, ignore_conflicts=True)
+    # The dashboard stats count live jobs only
+    subtract_jobs(Job.objects.filter(id__in=ids))
+    for model in (JobSignature, JobBand, JobSource):
+        model.objects.filter(job_id__in=ids)._raw_delete(model.objects.db)
+    deleted = Job.objects.filter(id__in=ids)._raw_delete(Job.objects.db)
+    Description.objects.delete_unused(job.description_blob_id for job in jobs)
+    return deleted
+
+
+def archive_jobs(before=None, batch_size: int = ARCHIVE_BATCH_SIZE, dry_run: bool = False) -> Dict[str, float]:
+    """
+    Move jobs scraped before ``before`` (default: ARCHIVE_AFTER_DAYS ago)
+    into the archive. Each batch commits on its own.
+    """
+    from .scraper.fingerprint_index import rebuild_fingerprint_index
+
+    before = before or default_cutoff()
+    started = time.time()
+    candidates = Job.objects.filter(scraped_at__lt=before)
+    if dry_run:
+        return {"jobs": candidates.count(), "batches": 0, "seconds": time.time() - started}
+
+    archived = 0
+    batches = 0
+    while True:
+        ids = list(candidates.order_by("id").values_list("id", flat=True)[:batch_size])
+        if not ids:
+            break
+        archived += _archive_batch(ids)
+        batches += 1
+
+    if archived:
+        # Archived hashes are no longer in the hot table
+        rebuild_fingerprint_index()
+    return {"jobs": archived, "batches": batches, "seconds": time.time() - started}
+
+
+def drop_archive_periods(before_period: int) -> int:
+    """Delete archived jobs of every period older than ``before_period`` (YYYYMM)."""
+    return ArchivedJob.objects.filter(period__lt=before_period)._raw_delete(ArchivedJob.objects.db)
+
+
+def months_ago_period(months: int, now=None) -> int:
+    now = now or timezone.now()
+    index = now.year * 12 + (now.month - 1) - months
+    return (index // 12) * 100 + index % 12 + 1
@@ -0,0 +1,64 @@
+"""
+Compression of stored text (job descriptions, archived jobs).
+
+Text is written as zstd frames when ``zstandard`` is installed and as zlib
+streams otherwise; ``decompress_text`` tells them apart by the zstd frame
+magic, so data written either way stays readable. Compressor objects are
+not thread-safe, so each thread gets its own.
+"""
+import hashlib
+import threading
+import zlib
+
+ZSTD_LEVEL = 9
+ZLIB_LEVEL = 6
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+_local = threading.local()
+
+
+def require_zstd():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise ImportError(
+            "Compressed storage needs zstandard. Install it with 'pip install zstandard'."
+        ) from exc
+    return zstandard
+
+
+def _codecs():
+    if not hasattr(_local, "compressor"):
+        try:
+            zstd = require_zstd()
+        except ImportError:
+            _local.compressor = _local.decompressor = None
+        else:
+            _local.compressor = zstd.ZstdCompressor(level=ZSTD_LEVEL)
+            _local.decompressor = zstd.ZstdDecompressor()
+    return _local.compressor, _local.decompressor
+
+
+def compress_text(text: str) -> bytes:
+    data = (text or "").encode("utf-8")
+    compressor = _codecs()[0]
+    if compressor is None:
+        return zlib.compress(data, ZLIB_LEVEL)
+    return compressor.compress(data)
+
+
+def decompress_text(data) -> str:
+    if not data:
+        return ""
+    data = bytes(data)
+    if data[:4] == ZSTD_MAGIC:
+        decompressor = _codecs()[1]
+        if decompressor is None:
+            require_zstd()
+        return decompressor.decompress(data).decode("utf-8")
+    return zlib.decompress(data).decode("utf-8")
+
+
+def content_hash(text: str) -> str:
+    """128-bit hex digest identifying a text (the Description primary key)."""
+    return hashlib.blake2b((text or "").encode("utf-8"), digest_size=16).hexdigest()
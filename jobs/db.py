@@ -0,0 +1,86 @@
+"""
+SQLite connection tuning.
+
+Every new SQLite connection gets WAL journaling (readers no longer block
+on the scraper's writes, so the dashboard stops hitting "database is
+locked"), relaxed fsyncs, a larger page cache, memory-mapped I/O and a
+longer busy timeout.
+
+WAL is a property of the database file: while connections are open,
+SQLite keeps ``db.sqlite3-wal`` and ``db.sqlite3-shm`` beside it (both are
+git-ignored) and checkpoints the log back into ``db.sqlite3``; the last
+connection to close checkpoints it fully and deletes them. Copy the
+database only with every process stopped, or with ``sqlite3 db.sqlite3
+".backup copy.sqlite3"``. ``SQLITE_WAL = False`` keeps the rollback
+journal instead. The pragmas can be overridden with ``SQLITE_PRAGMAS`` in
+settings.
+It also registers ``jobs_decompress(blob)``, which the full-text triggers
+use to read compressed descriptions (see jobs/fts.py). Only connections
+Django opens get it: anything else that writes to jobs_job (a script using
+``sqlite3`` directly, ``manage.py dbshell``) must call
+``register_functions`` on its connection first, or SQLite rejects the write
+with "no such function: jobs_decompress".
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+DEFAULT_SQLITE_PRAGMAS = {
+    # Negative values are KiB: 64 MB page cache
+    "cache_size": -64000,
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+    # Milliseconds to wait on a locked database before raising
+    "busy_timeout": 20000,
+}
+WAL_PRAGMAS = {
+    "journal_mode": "WAL",
+    # Durable at checkpoints; safe against corruption in WAL mode
+    "synchronous": "NORMAL",
+}
+
+
+def sqlite_pragmas():
+    """Default pragmas, plus the WAL ones unless disabled, updated with ``settings.SQLITE_PRAGMAS``."""
+    pragmas = dict(DEFAULT_SQLITE_PRAGMAS)
+    if getattr(settings, "SQLITE_WAL", True):
+        pragmas.update(WAL_PRAGMAS)
+    pragmas.update(getattr(settings, "SQLITE_PRAGMAS", {}))
+    return pragmas
+
+
+def apply_pragmas(cursor, pragmas=None):
+    """Run ``PRAGMA name = value`` for each entry on a DB-API cursor."""
+    for name, value in (pragmas if pragmas is not None else sqlite_pragmas()).items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def _sqlite_decompress(data):
+    from .compression import decompress_text
+
+    if data is None:
+        return None
+    try:
+        return decompress_text(data)
+    except Exception as e:
+        # Raising here would abort the job write that fired the trigger;
+        # the job is stored and only its description goes unindexed
+        print(f"Could not decompress a description for the search index: {e}")
+        return None
+
+
+def register_functions(dbapi_connection):
+    """Register the SQL functions the jobs tables' triggers call on a ``sqlite3`` connection."""
+    dbapi_connection.create_function("jobs_decompress", 1, _sqlite_decompress, deterministic=True)
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """connection_created receiver applying the pragmas and SQL functions to SQLite connections."""
+    if connection.vendor != "sqlite":
+        return
+    register_functions(connection.connection)
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor)
+
+
+def install():
+    connection_created.connect(configure_sqlite, dispatch_uid="jobs.db.configure_sqlite")
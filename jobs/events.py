@@ -0,0 +1,139 @@
+"""
+Server-Sent Events stream of one scrape operation.
+
+Instead of every dashboard tab polling ``progress/<id>/`` and
+``latest-jobs/`` over HTTP, ``ProgressStream`` polls the progress store
+in-process and pushes:
+
+* ``progress``: the fields of the progress entry that changed
+* ``jobs``: rows newly linked to the platform (new or merged jobs), with
+  the JobSource id cursor they were read up to
+* ``done``: once the operation completed or failed; the stream then ends
+
+Under ASGI (``jobsuite/asgi.py``) ``aevents()`` waits on the event loop, so
+open streams cost no threads; ``events()`` is the blocking equivalent for
+WSGI servers such as runserver.
+"""
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional
+
+from django.db import close_old_connections
+
+from .models import JobSource
+from .scraper.progress import get_progress
+
+SSE_POLL_INTERVAL = 0.5
+# Look for new rows at least this often even when progress didn't move
+SSE_JOBS_INTERVAL = 2.0
+SSE_KEEPALIVE_INTERVAL = 15.0
+SSE_MAX_DURATION = 30 * 60
+SSE_JOBS_LIMIT = 200
+# Reconnect delay suggested to EventSource clients (milliseconds)
+SSE_RETRY_MS = 3000
+
+FINAL_STAGES = ("completed", "error")
+JOB_FIELDS = ('id', 'job_id', 'job__title', 'job__company__name', 'job__location', 'job__sources',
+              'job__source_url', 'scraped_at')
+
+
+def sse_event(event: str, data: Dict, event_id=None) -> str:
+    frame = f"event: {event}\ndata: {json.dumps(data)}\n"
+    if event_id is not None:
+        # Sent back by reconnecting clients as Last-Event-ID
+        frame += f"id: {event_id}\n"
+    return frame + "\n"
+
+
+class ProgressStream:
+    def __init__(self, operation_id: str, platform: str, cursor: Optional[int] = None):
+        self.operation_id = operation_id
+        self.platform = platform
+        # Only rows linked after the stream opened, unless the client resumes
+        if cursor is None:
+            cursor = self._links().order_by('-id').values_list('id', flat=True).first() or 0
+        self.cursor = cursor
+        self.sent: Dict = {}
+        self.finished = False
+        self.opened = False
+        self.started = self.last_output = self.last_jobs_check = time.monotonic()
+
+    def _links(self):
+        links = JobSource.objects.all()
+        return links if self.platform == 'all' else links.filter(platform=self.platform)
+
+    def _new_jobs(self) -> List[Dict]:
+        rows = list(self._links().filter(id__gt=self.cursor).order_by('id').values(*JOB_FIELDS)[:SSE_JOBS_LIMIT])
+        if rows:
+            self.cursor = rows[-1]['id']
+        return [{
+            'id': row['job_id'],
+            'title': row['job__title'],
+            'company': row['job__company__name'],
+            'location': row['job__location'],
+            'sources': row['job__sources'],
+            'source_url': row['job__source_url'],
+            'scraped_at': row['scraped_at'].strftime('%Y-%m-%d %H:%M'),
+        } for row in rows]
+
+    def poll(self) -> List[str]:
+        """One step of the stream: the SSE frames to send now (possibly none)."""
+        now = time.monotonic()
+        frames = []
+        if not self.opened:
+            self.opened = True
+            frames.append(f"retry: {SSE_RETRY_MS}\n\n")
+
+        progress = get_progress(self.operation_id)
+        changed = progress['stage'] != 'unknown' and progress['timestamp'] != self.sent.get('timestamp')
+        if changed:
+            delta = {key: value for key, value in progress.items() if self.sent.get(key) != value}
+            delta['operation_id'] = self.operation_id
+            self.sent = progress
+            frames.append(sse_event('progress', delta))
+
+        if changed or now - self.last_jobs_check >= SSE_JOBS_INTERVAL:
+            self.last_jobs_check = now
+            jobs = self._new_jobs()
+            while jobs:
+                frames.append(sse_event('jobs', {'jobs': jobs, 'count': len(jobs), 'cursor': self.cursor},
+                                        event_id=self.cursor))
+                jobs = self._new_jobs() if len(jobs) == SSE_JOBS_LIMIT else []
+
+        if progress['stage'] in FINAL_STAGES:
+            frames.append(sse_event('done', {'stage': progress['stage'], 'message': progress['message']}))
+            self.finished = True
+        elif now - self.started > SSE_MAX_DURATION:
+            frames.append(sse_event('done', {'stage': 'timeout', 'message': 'Progress stream timed out'}))
+            self.finished = True
+        elif not frames and now - self.last_output >= SSE_KEEPALIVE_INTERVAL:
+            # Comment line keeping proxies from closing an idle connection
+            frames.append(": keepalive\n\n")
+
+        if frames:
+            self.last_output = now
+        return frames
+
+    def events(self):
+        while not self.finished:
+            yield from self.poll()
+            if not self.finished:
+                time.sleep(SSE_POLL_INTERVAL)
+
+    def _poll_in_thread(self):
+        # Executor threads outlive requests, so apply CONN_MAX_AGE and health checks here
+        close_old_connections()
+        return self.poll()
+
+    async def aevents(self):
+        from asgiref.sync import sync_to_async
+
+        # Not thread-sensitive: streams poll in parallel instead of queueing
+        # on the one thread that runs every sync view
+        poll = sync_to_async(self._poll_in_thread, thread_sensitive=False)
+        while not self.finished:
+            for frame in await poll():
+                yield frame
+            if not self.finished:
+                await asyncio.sleep(SSE_POLL_INTERVAL)
@@ -0,0 +1,165 @@
+"""
+Columnar exports of the Job/Company tables (Parquet or DuckDB).
+
+Rows are streamed from the database in batches and each batch becomes one
+Parquet row group / one DuckDB insert, so memory stays bounded by the batch
+size. pyarrow is required for both formats and duckdb for the DuckDB one;
+they are imported lazily so the rest of the app runs without them.
+"""
+from typing import Dict, Iterator, List, Optional
+
+from .compression import decompress_text
+from .models import Company, Job
+
+EXPORT_BATCH_SIZE = 50000
+EXPORT_FORMATS = ("parquet", "duckdb")
+
+JOB_COLUMNS = (
+    "id", "title", "company_id", "company__name", "location", "description_blob__data",
+    "source_url", "sources", "posted_at", "scraped_at",
+)
+_DESCRIPTION = JOB_COLUMNS.index("description_blob__data")
+# Low-cardinality columns stored with dictionary encoding
+DICTIONARY_COLUMNS = ["company", "location", "sources.list.element"]
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError(
+            "Columnar exports need pyarrow. Install it with 'pip install pyarrow'."
+        ) from exc
+    return pyarrow
+
+
+def _require_duckdb():
+    try:
+        import duckdb
+    except ImportError as exc:
+        raise ImportError(
+            "DuckDB exports need duckdb. Install it with 'pip install duckdb'."
+        ) from exc
+    return duckdb
+
+
+def job_queryset(platform: str = "all"):
+    """Jobs to export, oldest first so row groups follow insertion order."""
+    if platform == "all":
+        jobs = Job.objects.all()
+    else:
+        jobs = Job.objects.filter(source_links__platform=platform)
+    return jobs.order_by("id")
+
+
+def iter_job_batches(platform: str = "all", batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[tuple]]:
+    """Yield lists of job value tuples (see JOB_COLUMNS) of at most ``batch_size`` rows."""
+    batch = []
+    rows = job_queryset(platform).values_list(*JOB_COLUMNS).iterator(chunk_size=min(batch_size, 5000))
+    for row in rows:
+        # Descriptions are stored compressed
+        batch.append(row[:_DESCRIPTION] + (decompress_text(row[_DESCRIPTION]),) + row[_DESCRIPTION + 1:])
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _job_schema(pa):
+    return pa.schema([
+        ("job_id", pa.int64()),
+        ("title", pa.string()),
+        ("company_id", pa.int64()),
+        ("company", pa.dictionary(pa.int32(), pa.string())),
+        ("location", pa.dictionary(pa.int32(), pa.string())),
+        ("description", pa.string()),
+        ("source_url", pa.string()),
+        ("sources", pa.list_(pa.string())),
+        ("posted_at", pa.timestamp("us", tz="UTC")),
+        ("scraped_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+
+def _batch_to_table(pa, schema, batch: List[tuple]):
+    """Convert a batch of value tuples into an Arrow table with ``schema``."""
+    columns = list(zip(*batch))
+    arrays = []
+    for field, values in zip(schema, columns):
+        if field.name == "sources":
+            values = [list(v or []) for v in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def write_parquet(path: str, platform: str = "all", batch_size: int = EXPORT_BATCH_SIZE,
+                  compression: str = "zstd") -> Dict[str, int]:
+    """
+    Write jobs (with their company name) to a Parquet file at ``path``.
+
+    Each database batch is written as one row group; company, location and
+    source values are dictionary encoded.
+    """
+    pa = _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    schema = _job_schema(pa)
+    rows = 0
+    row_groups = 0
+    with pq.ParquetWriter(path, schema, compression=compression, use_dictionary=DICTIONARY_COLUMNS) as writer:
+        for batch in iter_job_batches(platform, batch_size):
+            writer.write_table(_batch_to_table(pa, schema, batch), row_group_size=batch_size)
+            rows += len(batch)
+            row_groups += 1
+    return {"rows": rows, "row_groups": row_groups}
+
+
+def write_duckdb(path: str, platform: str = "all", batch_size: int = EXPORT_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Write ``jobs`` and ``companies`` tables to a DuckDB database at ``path``.
+
+    Existing tables of the same name are replaced.
+    """
+    pa = _require_pyarrow()
+    duckdb = _require_duckdb()
+
+    schema = _job_schema(pa)
+    rows = 0
+    con = duckdb.connect(path)
+    try:
+        con.execute("DROP TABLE IF EXISTS jobs")
+        con.execute("DROP TABLE IF EXISTS companies")
+        con.execute(
+            "CREATE TABLE companies (id BIGINT PRIMARY KEY, name VARCHAR, website VARCHAR, "
+            "email VARCHAR, created_at TIMESTAMPTZ)"
+        )
+        con.execute(
+            "CREATE TABLE jobs (job_id BIGINT, title VARCHAR, company_id BIGINT, company VARCHAR, "
+            "location VARCHAR, description VARCHAR, source_url VARCHAR, sources VARCHAR[], "
+            "posted_at TIMESTAMPTZ, scraped_at TIMESTAMPTZ)"
+        )
+
+        companies = Company.objects.order_by("id").values_list("id", "name", "website", "email", "created_at")
+        con.executemany("INSERT INTO companies VALUES (?, ?, ?, ?, ?)", list(companies.iterator(chunk_size=5000)))
+
+        for batch in iter_job_batches(platform, batch_size):
+            table = _batch_to_table(pa, schema, batch)
+            con.register("job_batch", table)
+            con.execute("INSERT INTO jobs SELECT * FROM job_batch")
+            con.unregister("job_batch")
+            rows += len(batch)
+    finally:
+        con.close()
+    return {"rows": rows}
+
+
+def export_jobs(path: str, fmt: str = "parquet", platform: str = "all",
+                batch_size: Optional[int] = None) -> Dict[str, int]:
+    """Export jobs to ``path`` in ``fmt`` (one of EXPORT_FORMATS)."""
+    batch_size = batch_size or EXPORT_BATCH_SIZE
+    if fmt == "parquet":
+        return write_parquet(path, platform, batch_size)
+    if fmt == "duckdb":
+        return write_duckdb(path, platform, batch_size)
+    raise ValueError(f"Unsupported export format: {fmt}")
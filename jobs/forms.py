@@ -4,6 +4,8 @@ from django import forms
 PLATFORMS = (
     ("glassdoor", "Glassdoor"),
     ("indeed", "Indeed"),
+    # Both at once, see scraper/pipeline.py scrape_all_platforms
+    ("all", "All platforms"),
 )
 
 
@@ -20,3 +22,10 @@ class ScrapeForm(forms.Form):
         help_text="Enter the location to search in (e.g., New York, NY, San Francisco, CA, Remote)"
     )
     limit = forms.IntegerField(min_value=1, max_value=100, initial=20, help_text="Number of jobs to scrape (1-100)")
+    incremental = forms.BooleanField(
+        required=False,
+        initial=False,
+        help_text="Keep previous results and only fetch jobs newer than the last run of this search"
+    )
+    # Set by the dashboard, which subscribes to the progress stream of this id
+    operation_id = forms.UUIDField(required=False, widget=forms.HiddenInput)
@@ -0,0 +1,152 @@
+"""
+SQL for the FTS5 index behind /search/ (SQLite only).
+
+``jobs_job_fts`` keeps its own copy of title, company name and description
+(rowid = jobs_job.id) and triggers keep it in sync with every write path,
+including bulk inserts and raw deletes.
+
+Descriptions live compressed in ``jobs_description``; the triggers read
+them through the ``jobs_decompress`` SQL function that jobs/db.py registers
+on every connection Django opens. Writes to ``jobs_job`` from any other
+connection fail with "no such function: jobs_decompress" unless it calls
+``jobs.db.register_functions`` first. A description that can't be
+decompressed is left out of the index rather than failing the write.
+Migrations 0004/0005 predate that table and use the
+frozen ``*_V1`` statements.
+
+SQLite rebuilds a table for most ALTERs, and the rename step fails while
+triggers reference it, so migrations that alter ``jobs_job`` or
+``jobs_company`` run ``drop_triggers`` first and ``create_triggers`` after.
+"""
+
+CREATE_TABLE_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_job_fts USING fts5(
+        title, company, description,
+        tokenize = 'porter unicode61 remove_diacritics 2'
+    )
+    """,
+    # ORDER BY rank uses bm25 weighted towards title, then company
+    "INSERT INTO jobs_job_fts (jobs_job_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0)')",
+]
+
+# Triggers and backfill as of migration 0004 (description stored inline)
+TRIGGERS_SQL_V1 = [
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_job_fts_ai AFTER INSERT ON jobs_job BEGIN
+        INSERT INTO jobs_job_fts (rowid, title, company, description)
+        VALUES (new.id, new.title,
+                (SELECT name FROM jobs_company WHERE id = new.company_id),
+                new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_job_fts_ad AFTER DELETE ON jobs_job BEGIN
+        DELETE FROM jobs_job_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_job_fts_au
+    AFTER UPDATE OF title, description, company_id ON jobs_job BEGIN
+        UPDATE jobs_job_fts
+        SET title = new.title,
+            company = (SELECT name FROM jobs_company WHERE id = new.company_id),
+            description = new.description
+        WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_company_fts_au AFTER UPDATE OF name ON jobs_company BEGIN
+        UPDATE jobs_job_fts SET company = new.name
+        WHERE rowid IN (SELECT id FROM jobs_job WHERE company_id = new.id);
+    END
+    """,
+]
+
+BACKFILL_SQL_V1 = [
+    """
+    INSERT INTO jobs_job_fts (rowid, title, company, description)
+    SELECT jobs_job.id, jobs_job.title, jobs_company.name, jobs_job.description
+    FROM jobs_job JOIN jobs_company ON jobs_company.id = jobs_job.company_id
+    """,
+]
+
+_DESCRIPTION_SQL = "(SELECT jobs_decompress(data) FROM jobs_description WHERE hash = new.description_blob_id)"
+
+TRIGGERS_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_job_fts_ai AFTER INSERT ON jobs_job BEGIN
+        INSERT INTO jobs_job_fts (rowid, title, company, description)
+        VALUES (new.id, new.title,
+                (SELECT name FROM jobs_company WHERE id = new.company_id),
+                {_DESCRIPTION_SQL});
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_job_fts_ad AFTER DELETE ON jobs_job BEGIN
+        DELETE FROM jobs_job_fts WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_job_fts_au
+    AFTER UPDATE OF title, description_blob_id, company_id ON jobs_job BEGIN
+        UPDATE jobs_job_fts
+        SET title = new.title,
+            company = (SELECT name FROM jobs_company WHERE id = new.company_id),
+            description = {_DESCRIPTION_SQL}
+        WHERE rowid = new.id;
+    END
+    """,
+    TRIGGERS_SQL_V1[3],
+]
+
+BACKFILL_SQL = [
+    """
+    INSERT INTO jobs_job_fts (rowid, title, company, description)
+    SELECT jobs_job.id, jobs_job.title, jobs_company.name, jobs_decompress(jobs_description.data)
+    FROM jobs_job
+    JOIN jobs_company ON jobs_company.id = jobs_job.company_id
+    LEFT JOIN jobs_description ON jobs_description.hash = jobs_job.description_blob_id
+    """,
+]
+
+DROP_TRIGGERS_SQL = [
+    "DROP TRIGGER IF EXISTS jobs_company_fts_au",
+    "DROP TRIGGER IF EXISTS jobs_job_fts_au",
+    "DROP TRIGGER IF EXISTS jobs_job_fts_ad",
+    "DROP TRIGGER IF EXISTS jobs_job_fts_ai",
+]
+
+DROP_TABLE_SQL = ["DROP TABLE IF EXISTS jobs_job_fts"]
+
+
+def _execute(schema_editor, statements):
+    # FTS5 is SQLite-only; other backends simply go without search
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def create_index(apps, schema_editor):
+    _execute(schema_editor, CREATE_TABLE_SQL + TRIGGERS_SQL + BACKFILL_SQL)
+
+
+def drop_index(apps, schema_editor):
+    _execute(schema_editor, DROP_TRIGGERS_SQL + DROP_TABLE_SQL)
+
+
+def create_triggers(apps, schema_editor):
+    _execute(schema_editor, TRIGGERS_SQL)
+
+
+def create_index_v1(apps, schema_editor):
+    _execute(schema_editor, CREATE_TABLE_SQL + TRIGGERS_SQL_V1 + BACKFILL_SQL_V1)
+
+
+def create_triggers_v1(apps, schema_editor):
+    _execute(schema_editor, TRIGGERS_SQL_V1)
+
+
+def drop_triggers(apps, schema_editor):
+    _execute(schema_editor, DROP_TRIGGERS_SQL)
@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from jobs.archive import ARCHIVE_BATCH_SIZE, archive_jobs, default_cutoff, drop_archive_periods, months_ago_period
+from jobs.models import Description
+
+
+class Command(BaseCommand):
+    help = "Move old jobs into the compressed archive and drop archive periods past retention"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, default=None,
+                            help="Archive jobs scraped more than this many days ago "
+                                 "(default: settings.ARCHIVE_AFTER_DAYS)")
+        parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE,
+                            help="Jobs moved per transaction")
+        parser.add_argument("--retain-months", type=int, default=None,
+                            help="Delete archived jobs from months older than this")
+        parser.add_argument("--vacuum", action="store_true",
+                            help="VACUUM the SQLite database afterwards to return freed pages")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the jobs that would move")
+
+    def handle(self, *args, **options):
+        days = options["older_than_days"]
+        before = default_cutoff() if days is None else timezone.now() - timedelta(days=days)
+
+        try:
+            stats = archive_jobs(before, options["batch_size"], dry_run=options["dry_run"])
+        except ImportError as e:
+            raise CommandError(str(e))
+        if options["dry_run"]:
+            self.stdout.write(f"{stats['jobs']} jobs scraped before {before:%Y-%m-%d} would be archived")
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {stats['jobs']} jobs scraped before {before:%Y-%m-%d} "
+            f"in {stats['batches']} batches ({stats['seconds']:.2f}s)"
+        ))
+
+        if options["retain_months"] is not None:
+            period = months_ago_period(options["retain_months"])
+            dropped = drop_archive_periods(period)
+            self.stdout.write(self.style.SUCCESS(f"Dropped {dropped} archived jobs from before {period}"))
+
+        orphans = Description.objects.delete_orphans()
+        if orphans:
+            self.stdout.write(f"Deleted {orphans} unused descriptions")
+
+        if options["vacuum"] and connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute("VACUUM")
+            self.stdout.write("Vacuumed database")
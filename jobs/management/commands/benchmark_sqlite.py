@@ -0,0 +1,163 @@
+import os
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.db import apply_pragmas, sqlite_pragmas
+
+SCHEMA = """
+CREATE TABLE job (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title VARCHAR(255) NOT NULL,
+    company VARCHAR(255) NOT NULL,
+    location VARCHAR(255) NOT NULL,
+    description TEXT NOT NULL,
+    fingerprint VARCHAR(255) NOT NULL,
+    scraped_at REAL NOT NULL
+);
+CREATE INDEX job_fingerprint ON job (fingerprint);
+CREATE TABLE jobsource (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL REFERENCES job (id),
+    platform VARCHAR(32) NOT NULL,
+    scraped_at REAL NOT NULL
+);
+CREATE INDEX jobsource_platform_scraped ON jobsource (platform, scraped_at);
+"""
+
+# Same shape as the latest-jobs endpoint
+READ_QUERY = """
+SELECT job.id, job.title, job.company, job.location
+FROM job JOIN jobsource ON jobsource.job_id = job.id
+WHERE jobsource.platform = ? ORDER BY jobsource.scraped_at DESC LIMIT 50
+"""
+
+# What a stock Django SQLite connection runs with
+BASELINE_PRAGMAS = {"journal_mode": "DELETE", "synchronous": "FULL"}
+BASELINE_TIMEOUT = 5
+
+
+class Command(BaseCommand):
+    help = "Measure read latency on SQLite while a scrape-like writer commits one job at a time"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--jobs", type=int, default=2000, help="Rows written by the writer")
+        parser.add_argument("--readers", type=int, default=4, help="Concurrent reader threads")
+        parser.add_argument("--seed", type=int, default=20000, help="Rows preloaded before the run")
+        parser.add_argument("--mode", choices=("baseline", "tuned", "both"), default="both")
+
+    def handle(self, *args, **options):
+        modes = ("baseline", "tuned") if options["mode"] == "both" else (options["mode"],)
+        for mode in modes:
+            if mode == "baseline":
+                result = self.run(BASELINE_PRAGMAS, BASELINE_TIMEOUT, options)
+            else:
+                pragmas = sqlite_pragmas()
+                result = self.run(pragmas, pragmas.get("busy_timeout", 20000) / 1000, options)
+            self.report(mode, result)
+
+    def connect(self, path, pragmas, timeout):
+        conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        apply_pragmas(conn.cursor(), pragmas)
+        return conn
+
+    def run(self, pragmas, timeout, options):
+        workdir = tempfile.mkdtemp(prefix="jobs-bench-")
+        done = threading.Event()
+        try:
+            path = os.path.join(workdir, "bench.sqlite3")
+            setup = self.connect(path, pragmas, timeout)
+            setup.executescript(SCHEMA)
+            self.insert_rows(setup, options["seed"], batch=True)
+            setup.close()
+
+            latencies = []
+            errors = {"read": 0, "write": 0}
+            lock = threading.Lock()
+
+            def reader():
+                conn = self.connect(path, pragmas, timeout)
+                while not done.is_set():
+                    started = time.perf_counter()
+                    try:
+                        conn.execute(READ_QUERY, ("indeed",)).fetchall()
+                    except sqlite3.OperationalError:
+                        with lock:
+                            errors["read"] += 1
+                        continue
+                    with lock:
+                        latencies.append(time.perf_counter() - started)
+                conn.close()
+
+            def writer():
+                conn = self.connect(path, pragmas, timeout)
+                try:
+                    self.insert_rows(conn, options["jobs"], batch=False, errors=errors)
+                finally:
+                    conn.close()
+                    done.set()
+
+            threads = [threading.Thread(target=reader) for _ in range(options["readers"])]
+            write_thread = threading.Thread(target=writer)
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            write_thread.start()
+            write_thread.join()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+            return {"latencies": latencies, "errors": errors, "elapsed": elapsed, "jobs": options["jobs"]}
+        finally:
+            # Also on Ctrl+C: stop the readers and leave no jobs-bench-* directory behind
+            done.set()
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def insert_rows(self, conn, count, batch, errors=None):
+        """Insert jobs plus their source link; one transaction per row unless ``batch``."""
+        if batch:
+            conn.execute("BEGIN")
+        for i in range(count):
+            if not batch:
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                except sqlite3.OperationalError:
+                    errors["write"] += 1
+                    continue
+            now = time.time()
+            cursor = conn.execute(
+                "INSERT INTO job (title, company, location, description, fingerprint, scraped_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (f"Engineer {i}", f"Company {i % 500}", "New York, NY", "x" * 400, f"engineer{i}|company|ny", now),
+            )
+            conn.execute(
+                "INSERT INTO jobsource (job_id, platform, scraped_at) VALUES (?, ?, ?)",
+                (cursor.lastrowid, "indeed", now),
+            )
+            if not batch:
+                conn.execute("COMMIT")
+        if batch:
+            conn.execute("COMMIT")
+
+    def report(self, mode, result):
+        latencies = sorted(result["latencies"])
+        if not latencies:
+            self.stdout.write(f"{mode}: no successful reads")
+            return
+
+        def pct(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+        self.stdout.write(
+            f"{mode:>8}: {len(latencies)} reads, p50 {pct(0.50):.2f} ms, p95 {pct(0.95):.2f} ms, "
+            f"p99 {pct(0.99):.2f} ms, max {latencies[-1] * 1000:.2f} ms, "
+            f"mean {statistics.mean(latencies) * 1000:.2f} ms | "
+            f"writer {result['jobs'] / result['elapsed']:.0f} commits/s | "
+            f"locked errors: read {result['errors']['read']}, write {result['errors']['write']}"
+        )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from jobs.scraper.chromedriver import manifest_path, record_chromedriver, resolve_chromedriver
+
+
+class Command(BaseCommand):
+    help = "Record a pre-provisioned chromedriver in the local manifest, or resolve and verify the current one"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", help="chromedriver binary to record (for offline workers)")
+        parser.add_argument("--sha256", help="expected checksum of the binary given with --path")
+
+    def handle(self, *args, **options):
+        if options["path"]:
+            entry = record_chromedriver(options["path"], options["sha256"])
+        else:
+            entry = resolve_chromedriver(refresh=True)
+        self.stdout.write(self.style.SUCCESS(
+            f"chromedriver {entry['version'] or '(unknown version)'} at {entry['path']} "
+            f"(sha256 {entry['sha256'][:12]}…, Chrome {entry.get('browser_major') or 'version unknown'}), "
+            f"recorded in {manifest_path()}"
+        ))
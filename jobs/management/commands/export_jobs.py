@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.export import EXPORT_BATCH_SIZE, EXPORT_FORMATS, export_jobs
+
+
+class Command(BaseCommand):
+    help = "Export the Job/Company tables to a Parquet file or a DuckDB database"
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Path of the .parquet or .duckdb file to write")
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default=None,
+                            help="Output format (defaults to the output file extension)")
+        parser.add_argument("--platform", default="all", help="Only export jobs found on this platform")
+        parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE,
+                            help="Rows read from the database per batch / Parquet row group")
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        fmt = options["format"] or ("duckdb" if output.endswith((".duckdb", ".db")) else "parquet")
+        try:
+            stats = export_jobs(output, fmt, options["platform"], options["batch_size"])
+        except ImportError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"Exported {stats['rows']} jobs to {output} ({fmt})"))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from jobs.models import Job
+from jobs.scraper.near_duplicates import compute_signature, store_signatures
+
+
+class Command(BaseCommand):
+    help = "Compute MinHash signatures and LSH band keys for jobs that have none yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        jobs = (
+            Job.objects.filter(signature__isnull=True)
+            .select_related("company", "description_blob")
+            .only("id", "title", "location", "company__name", "description_blob__data")
+            .order_by("id")
+        )
+        total = 0
+        batch = []
+        for job in jobs.iterator(chunk_size=batch_size):
+            batch.append((job, compute_signature(job.title, job.company.name, job.location, job.description)))
+            if len(batch) >= batch_size:
+                store_signatures(batch, batch_size)
+                total += len(batch)
+                batch = []
+        if batch:
+            store_signatures(batch, batch_size)
+            total += len(batch)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} jobs for near-duplicate detection"))
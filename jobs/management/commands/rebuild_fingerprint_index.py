@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from jobs.scraper.fingerprint_index import get_fingerprint_index, rebuild_fingerprint_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the shared fingerprint index file from Job.fingerprint_hash"
+
+    def handle(self, *args, **options):
+        index = get_fingerprint_index()
+        count = rebuild_fingerprint_index(index)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} fingerprints in {index.path}"))
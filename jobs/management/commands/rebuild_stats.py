@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from jobs.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the dashboard summary table (JobStat) from the jobs table"
+
+    def handle(self, *args, **options):
+        rows = rebuild_stats()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} statistics rows"))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from jobs.tasks import MAX_TASKS_PER_CHILD, WORKER_POLL_INTERVAL, run_worker
+
+
+class Command(BaseCommand):
+    help = "Run queued scrape tasks in a pool of worker processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=None,
+                            help="Scrapes run at once (default: settings.SCRAPE_WORKER_CONCURRENCY)")
+        parser.add_argument("--poll-interval", type=float, default=WORKER_POLL_INTERVAL,
+                            help="Seconds between checks of an empty queue")
+        parser.add_argument("--max-tasks-per-child", type=int, default=MAX_TASKS_PER_CHILD,
+                            help="Replace a worker process after this many tasks")
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty")
+
+    def handle(self, *args, **options):
+        self.stdout.write("Waiting for scrape tasks (Ctrl+C to stop)")
+        try:
+            run_worker(
+                concurrency=options["concurrency"],
+                poll_interval=options["poll_interval"],
+                max_tasks_per_child=options["max_tasks_per_child"],
+                once=options["once"],
+                log=self.stdout.write,
+            )
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped; tasks that were running are back in the queue")
+            return
+        self.stdout.write(self.style.SUCCESS("Queue empty"))
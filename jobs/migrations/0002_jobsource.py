@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:14
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('platform', models.CharField(max_length=32)),
+                ('first_seen', models.DateTimeField(default=django.utils.timezone.now)),
+                ('source_url', models.URLField(blank=True)),
+                ('scraped_at', models.DateTimeField()),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='source_links', to='jobs.job')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['platform', 'scraped_at'], name='jobsource_platform_scraped')],
+                'unique_together': {('job', 'platform')},
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:14
+
+from django.db import migrations
+
+
+def backfill_job_sources(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    JobSource = apps.get_model('jobs', 'JobSource')
+
+    batch = []
+    for job in Job.objects.only('id', 'sources', 'source_url', 'scraped_at').iterator(chunk_size=2000):
+        for platform in dict.fromkeys(job.sources or []):
+            batch.append(JobSource(
+                job_id=job.id,
+                platform=platform,
+                first_seen=job.scraped_at,
+                source_url=job.source_url,
+                scraped_at=job.scraped_at,
+            ))
+        if len(batch) >= 2000:
+            JobSource.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        JobSource.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_jobsource'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_job_sources, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:02
+
+from django.db import migrations
+
+from jobs import fts
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_backfill_jobsource'),
+    ]
+
+    operations = [
+        # Full-text index over title, company name and description (see jobs/fts.py)
+        migrations.RunPython(fts.create_index_v1, fts.drop_index),
+    ]
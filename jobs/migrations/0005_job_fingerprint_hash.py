@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:21
+
+import hashlib
+
+from django.db import migrations, models
+
+from jobs import fts
+
+
+def _fingerprint_hash(fp):
+    # Frozen copy of jobs.scraper.utils.fingerprint_hash
+    digest = hashlib.blake2b(fp.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+def backfill_fingerprint_hash(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    batch = []
+    for job in Job.objects.only('id', 'fingerprint').iterator(chunk_size=2000):
+        job.fingerprint_hash = _fingerprint_hash(job.fingerprint)
+        batch.append(job)
+        if len(batch) >= 2000:
+            Job.objects.bulk_update(batch, ['fingerprint_hash'])
+            batch = []
+    if batch:
+        Job.objects.bulk_update(batch, ['fingerprint_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_job_fts'),
+    ]
+
+    operations = [
+        migrations.RunPython(fts.drop_triggers, fts.create_triggers_v1),
+        migrations.AddField(
+            model_name='job',
+            name='fingerprint_hash',
+            field=models.BigIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(backfill_fingerprint_hash, migrations.RunPython.noop),
+        migrations.RunPython(fts.create_triggers_v1, fts.drop_triggers),
+    ]
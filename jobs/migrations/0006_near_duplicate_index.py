@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_job_fingerprint_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSignature',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='jobs.job')),
+                ('title_minhash', models.BinaryField()),
+                ('description_minhash', models.BinaryField(null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='JobBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.BigIntegerField(db_index=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bands', to='jobs.job')),
+            ],
+        ),
+    ]
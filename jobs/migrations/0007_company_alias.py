@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:12
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of jobs.scraper.utils.LEGAL_SUFFIXES / company_key
+_LEGAL_SUFFIXES = {
+    'inc', 'incorporated', 'llc', 'llp', 'lp', 'ltd', 'limited', 'corp', 'corporation',
+    'co', 'company', 'plc', 'gmbh', 'ag', 'sa', 'sas', 'bv', 'nv', 'pty', 'pvt', 'srl', 'oy', 'ab',
+}
+
+
+def _company_key(name):
+    text = re.sub(r'\s+', ' ', unicodedata.normalize('NFKC', name or '').strip().lower())
+    words = re.findall(r'[^\W_]+', text.replace('&', ' and '))
+    stripped = True
+    while stripped:
+        stripped = False
+        for size in (1, 2, 3):
+            if len(words) > size and ''.join(words[-size:]) in _LEGAL_SUFFIXES:
+                del words[-size:]
+                stripped = True
+                break
+    return ' '.join(words)
+
+
+def backfill_company_aliases(apps, schema_editor):
+    # Existing rows are not merged (their jobs may collide on the unique
+    # fingerprint); the oldest company owns a shared key.
+    Company = apps.get_model('jobs', 'Company')
+    CompanyAlias = apps.get_model('jobs', 'CompanyAlias')
+    seen = set()
+    batch = []
+    for company in Company.objects.order_by('id').only('id', 'name').iterator(chunk_size=2000):
+        key = _company_key(company.name)
+        if key in seen:
+            continue
+        seen.add(key)
+        batch.append(CompanyAlias(key=key, company_id=company.id))
+        if len(batch) >= 2000:
+            CompanyAlias.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        CompanyAlias.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_near_duplicate_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, unique=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='jobs.company')),
+            ],
+        ),
+        migrations.RunPython(backfill_company_aliases, migrations.RunPython.noop),
+    ]
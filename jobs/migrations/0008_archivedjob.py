@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:31
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_company_alias'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedJob',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('period', models.PositiveIntegerField(db_index=True)),
+                ('title', models.CharField(max_length=255)),
+                ('location', models.CharField(blank=True, max_length=255)),
+                ('description_zstd', models.BinaryField()),
+                ('source_url', models.URLField()),
+                ('sources', models.JSONField(default=list)),
+                ('fingerprint', models.CharField(max_length=255)),
+                ('fingerprint_hash', models.BigIntegerField(default=0)),
+                ('posted_at', models.DateTimeField(blank=True, null=True)),
+                ('scraped_at', models.DateTimeField(db_index=True)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_jobs', to='jobs.company')),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:58
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_archivedjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapeWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('platform', models.CharField(max_length=32)),
+                ('query', models.CharField(max_length=255)),
+                ('head_hashes', models.JSONField(default=list)),
+                ('last_run_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_new_jobs', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('platform', 'query')},
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from jobs import fts
+from jobs.compression import compress_text, content_hash, decompress_text
+
+
+def move_descriptions(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    Description = apps.get_model('jobs', 'Description')
+    stored = set()
+    jobs, blobs = [], []
+    for job in Job.objects.only('id', 'description').iterator(chunk_size=2000):
+        digest = content_hash(job.description)
+        if digest not in stored:
+            stored.add(digest)
+            blobs.append(Description(hash=digest, data=compress_text(job.description), size=len(job.description)))
+        job.description_blob_id = digest
+        jobs.append(job)
+        if len(jobs) >= 2000:
+            Description.objects.bulk_create(blobs)
+            Job.objects.bulk_update(jobs, ['description_blob'])
+            jobs, blobs = [], []
+    Description.objects.bulk_create(blobs)
+    Job.objects.bulk_update(jobs, ['description_blob'])
+
+
+def restore_descriptions(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    jobs = []
+    for job in Job.objects.select_related('description_blob').iterator(chunk_size=2000):
+        job.description = decompress_text(job.description_blob.data) if job.description_blob else ''
+        jobs.append(job)
+        if len(jobs) >= 2000:
+            Job.objects.bulk_update(jobs, ['description'])
+            jobs = []
+    Job.objects.bulk_update(jobs, ['description'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_scrapewatermark'),
+    ]
+
+    operations = [
+        migrations.RunPython(fts.drop_triggers, fts.create_triggers_v1),
+        migrations.CreateModel(
+            name='Description',
+            fields=[
+                ('hash', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('data', models.BinaryField()),
+                ('size', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='description_blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='jobs', to='jobs.description'),
+        ),
+        migrations.RunPython(move_descriptions, restore_descriptions),
+        migrations.RemoveField(
+            model_name='job',
+            name='description',
+        ),
+        # The FTS table keeps its copies; the new triggers read jobs_description
+        migrations.RunPython(fts.create_triggers, fts.drop_triggers),
+    ]
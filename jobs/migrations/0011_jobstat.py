@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:52
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_job_stats(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    JobSource = apps.get_model('jobs', 'JobSource')
+    JobStat = apps.get_model('jobs', 'JobStat')
+
+    rows = [JobStat(dimension='total', key='', count=Job.objects.count())]
+    for row in Job.objects.values('company_id').annotate(n=Count('id')):
+        rows.append(JobStat(dimension='company', key=str(row['company_id']), count=row['n']))
+    for row in Job.objects.values('location').annotate(n=Count('id')):
+        rows.append(JobStat(dimension='location', key=(row['location'] or '')[:255], count=row['n']))
+    for row in Job.objects.annotate(day=TruncDate('scraped_at')).values('day').annotate(n=Count('id')):
+        rows.append(JobStat(dimension='day', key=row['day'].isoformat(), count=row['n']))
+    for row in JobSource.objects.values('platform').annotate(n=Count('id')):
+        rows.append(JobStat(dimension='platform', key=row['platform'], count=row['n']))
+    JobStat.objects.bulk_create([row for row in rows if row.count], batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_description_blob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(max_length=16)),
+                ('key', models.CharField(max_length=255)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['dimension', 'count'], name='jobstat_dimension_count')],
+                'unique_together': {('dimension', 'key')},
+            },
+        ),
+        migrations.RunPython(backfill_job_stats, migrations.RunPython.noop),
+    ]
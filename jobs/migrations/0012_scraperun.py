@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_jobstat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapeRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('operation_id', models.CharField(max_length=64, unique=True)),
+                ('platform', models.CharField(blank=True, max_length=32)),
+                ('query', models.CharField(blank=True, max_length=255)),
+                ('status', models.CharField(max_length=16)),
+                ('message', models.TextField(blank=True)),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(db_index=True)),
+                ('duration', models.FloatField()),
+                ('jobs', models.PositiveIntegerField(default=0)),
+                ('pages', models.PositiveIntegerField(default=0)),
+                ('time_to_first_job', models.FloatField(blank=True, null=True)),
+                ('stages', models.JSONField(default=list)),
+            ],
+            options={
+                'ordering': ['-finished_at'],
+            },
+        ),
+    ]
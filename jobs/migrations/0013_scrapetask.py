@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:31
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_scraperun'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapeTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('operation_id', models.CharField(max_length=64, unique=True)),
+                ('platform', models.CharField(max_length=32)),
+                ('role_name', models.CharField(max_length=100)),
+                ('location', models.CharField(blank=True, max_length=100)),
+                ('limit', models.PositiveIntegerField()),
+                ('incremental', models.BooleanField(default=False)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', max_length=16)),
+                ('worker', models.CharField(blank=True, max_length=128)),
+                ('result_count', models.IntegerField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created_at'], name='scrapetask_status_created')],
+            },
+        ),
+    ]
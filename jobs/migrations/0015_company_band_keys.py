@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:48
+
+from array import array
+
+from django.db import migrations
+
+from jobs.scraper.near_duplicates import Signature
+from jobs.scraper.utils import company_key
+
+BATCH_SIZE = 2000
+
+
+def rebuild_bands(apps, schema_editor):
+    """Recompute every job's band keys, which now include the company key."""
+    JobBand = apps.get_model('jobs', 'JobBand')
+    JobSignature = apps.get_model('jobs', 'JobSignature')
+    JobBand.objects.all()._raw_delete(schema_editor.connection.alias)
+    rows = []
+    signatures = JobSignature.objects.select_related('job__company').only(
+        'job_id', 'title_minhash', 'description_minhash', 'job__company__name'
+    )
+    for stored in signatures.iterator(chunk_size=BATCH_SIZE):
+        title = array('Q')
+        title.frombytes(bytes(stored.title_minhash))
+        description = None
+        if stored.description_minhash is not None:
+            description = array('Q')
+            description.frombytes(bytes(stored.description_minhash))
+        sig = Signature(title, description, company_key(stored.job.company.name), '')
+        rows.extend(JobBand(job_id=stored.job_id, key=key) for key in sig.band_keys())
+        if len(rows) >= BATCH_SIZE:
+            JobBand.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+            rows = []
+    JobBand.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0014_cachegeneration'),
+    ]
+
+    operations = [
+        # Going back keeps the new keys: the previous scheme is gone from the code
+        migrations.RunPython(rebuild_bands, migrations.RunPython.noop),
+    ]
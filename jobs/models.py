@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.text import slugify
 
 
@@ -12,6 +13,109 @@ class Company(models.Model):
         return self.name
 
 
+class CompanyAlias(models.Model):
+    """Canonical name key (see scraper.utils.company_key) resolving to one Company."""
+
+    key = models.CharField(max_length=255, unique=True)
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name="aliases")
+
+    def __str__(self):
+        return f"{self.key} -> {self.company_id}"
+
+
+class CacheGeneration(models.Model):
+    """Counter bumped whenever rows cached by other processes are deleted (see scraper.companies)."""
+
+    name = models.CharField(max_length=50, unique=True)
+    value = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+class DescriptionManager(models.Manager):
+    def store(self, texts, batch_size=500):
+        """Make sure a row exists for every text; returns {text: hash}."""
+        from .compression import compress_text, content_hash
+
+        hashes = {text: content_hash(text) for text in texts}
+        wanted = list(set(hashes.values()))
+        existing = set()
+        for start in range(0, len(wanted), batch_size):
+            chunk = wanted[start:start + batch_size]
+            existing.update(self.filter(hash__in=chunk).values_list("hash", flat=True))
+        new_rows = {}
+        for text, digest in hashes.items():
+            if digest not in existing and digest not in new_rows:
+                new_rows[digest] = Description(hash=digest, data=compress_text(text), size=len(text))
+        # ignore_conflicts: a concurrent writer may store the same text
+        self.bulk_create(new_rows.values(), batch_size=batch_size, ignore_conflicts=True)
+        return hashes
+
+    def delete_unused(self, hashes, batch_size=500):
+        """Delete the rows among ``hashes`` that no job points to any more."""
+        hashes = [h for h in set(hashes) if h]
+        deleted = 0
+        for start in range(0, len(hashes), batch_size):
+            chunk = hashes[start:start + batch_size]
+            deleted += self.filter(hash__in=chunk, jobs__isnull=True)._raw_delete(self.db)
+        return deleted
+
+    def delete_orphans(self):
+        """Delete every row no job points to (e.g. after descriptions were edited)."""
+        return self.filter(jobs__isnull=True)._raw_delete(self.db)
+
+
+class Description(models.Model):
+    """A description text stored once per distinct content, compressed (see compression.py)."""
+
+    hash = models.CharField(max_length=32, primary_key=True)
+    data = models.BinaryField()
+    # Uncompressed length in characters
+    size = models.PositiveIntegerField(default=0)
+
+    objects = DescriptionManager()
+
+    @property
+    def text(self):
+        from .compression import decompress_text
+
+        return decompress_text(self.data)
+
+
+class JobQuerySet(models.QuerySet):
+    def with_descriptions(self):
+        """Join the description blobs so reading ``job.description`` costs no query per row."""
+        return self.select_related("description_blob")
+
+    def for_platform(self, platform):
+        """Jobs found on ``platform``, newest first (served by the JobSource index)."""
+        return self.filter(source_links__platform=platform).order_by("-source_links__scraped_at")
+
+    def with_history(self, platform=None, **filters):
+        """
+        Live jobs followed by archived ones, newest first.
+
+        Yields Job instances; archived jobs are unsaved copies with
+        ``archived = True`` and their description decompressed. ``filters``
+        must use fields both tables share (title, location, company, ...).
+        """
+        from heapq import merge
+
+        live = self.filter(**filters)
+        archived = ArchivedJob.objects.filter(**filters)
+        if platform:
+            live = live.filter(source_links__platform=platform)
+        live = live.select_related("company", "description_blob").order_by("-scraped_at", "-id").iterator()
+        archived = (
+            job.to_job()
+            for job in archived.select_related("company").order_by("-scraped_at", "-id").iterator()
+            # JSONField containment isn't available on SQLite; the archive is cold anyway
+            if not platform or platform in job.sources
+        )
+        return merge(live, archived, key=lambda job: (job.scraped_at, job.id), reverse=True)
+
+
 class Job(models.Model):
     PLATFORM_CHOICES = [
         ("indeed", "Indeed"),
@@ -21,18 +125,235 @@ class Job(models.Model):
     title = models.CharField(max_length=255)
     location = models.CharField(max_length=255, blank=True)
     company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name="jobs")
-    description = models.TextField(blank=True)
+    # Shared, compressed text; read and write it through ``description``
+    description_blob = models.ForeignKey(
+        Description, on_delete=models.PROTECT, null=True, blank=True, related_name="jobs"
+    )
     # A canonical/first source URL to view the job
     source_url = models.URLField()
     # All platforms where we found it (CSV/JSON field)
     sources = models.JSONField(default=list)
     # Hash used for dedupe: normalized(title+company+location)
     fingerprint = models.CharField(max_length=255, db_index=True)
+    # 64-bit hash of ``fingerprint``; what dedupe lookups and the shared index use
+    fingerprint_hash = models.BigIntegerField(default=0, db_index=True)
     posted_at = models.DateTimeField(blank=True, null=True)
     scraped_at = models.DateTimeField(auto_now_add=True)
 
+    objects = JobQuerySet.as_manager()
+    # True on copies rebuilt from ArchivedJob (see JobQuerySet.with_history)
+    archived = False
+
     class Meta:
         unique_together = ("fingerprint", "company")
 
     def __str__(self):
-        return f"{self.title} @ {self.company.name} ({self.location})"
\ No newline at end of file
+        return f"{self.title} @ {self.company.name} ({self.location})"
+
+    @property
+    def description(self):
+        if "_description" not in self.__dict__:
+            blob = self.description_blob if self.description_blob_id else None
+            self._description = blob.text if blob else ""
+        return self._description
+
+    @description.setter
+    def description(self, text):
+        from .compression import content_hash
+
+        self._description = text or ""
+        self.description_blob_id = content_hash(self._description)
+        self._description_pending = True
+
+    def save(self, *args, **kwargs):
+        # bulk_create skips this; callers store the texts with Description.objects.store()
+        if self.__dict__.pop("_description_pending", False):
+            Description.objects.store([self._description])
+        super().save(*args, **kwargs)
+
+
+class JobSource(models.Model):
+    """One row per (job, platform) pair; the indexed form of ``Job.sources``."""
+
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="source_links")
+    platform = models.CharField(max_length=32)
+    # When this platform first reported the job
+    first_seen = models.DateTimeField(default=timezone.now)
+    source_url = models.URLField(blank=True)
+    # Copy of Job.scraped_at so platform + recency queries stay on one index
+    scraped_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("job", "platform")
+        indexes = [
+            models.Index(fields=["platform", "scraped_at"], name="jobsource_platform_scraped"),
+        ]
+
+    def __str__(self):
+        return f"{self.platform}: {self.job_id}"
+
+
+class JobStat(models.Model):
+    """Running count of live jobs per dimension value, maintained by jobs/stats.py."""
+
+    DIMENSIONS = ("total", "platform", "company", "location", "day")
+
+    dimension = models.CharField(max_length=16)
+    # Platform name, company id, location string or ISO day ("" for total)
+    key = models.CharField(max_length=255)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("dimension", "key")
+        indexes = [
+            models.Index(fields=["dimension", "count"], name="jobstat_dimension_count"),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension}={self.key}: {self.count}"
+
+
+class ScrapeWatermark(models.Model):
+    """Head of the last date-sorted crawl of one query (see scraper/incremental.py)."""
+
+    platform = models.CharField(max_length=32)
+    # normalized "role|location"
+    query = models.CharField(max_length=255)
+    # Fingerprint hashes of the newest cards seen by the last run
+    head_hashes = models.JSONField(default=list)
+    last_run_at = models.DateTimeField(default=timezone.now)
+    last_new_jobs = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("platform", "query")
+
+    def __str__(self):
+        return f"{self.platform}: {self.query}"
+
+
+class ScrapeTask(models.Model):
+    """A queued scrape, run by "manage.py scrape_worker" (see jobs/tasks.py)."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    STATUSES = (
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (COMPLETED, "Completed"),
+        (FAILED, "Failed"),
+    )
+
+    operation_id = models.CharField(max_length=64, unique=True)
+    platform = models.CharField(max_length=32)
+    role_name = models.CharField(max_length=100)
+    location = models.CharField(max_length=100, blank=True)
+    limit = models.PositiveIntegerField()
+    incremental = models.BooleanField(default=False)
+    status = models.CharField(max_length=16, choices=STATUSES, default=QUEUED)
+    # "host:pid" of the worker that claimed the task
+    worker = models.CharField(max_length=128, blank=True)
+    result_count = models.IntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "created_at"], name="scrapetask_status_created")]
+
+    def __str__(self):
+        return f"{self.platform} {self.role_name!r}: {self.status}"
+
+
+class ScrapeRun(models.Model):
+    """Timing summary of one finished scrape operation (see scraper/progress.py)."""
+
+    operation_id = models.CharField(max_length=64, unique=True)
+    platform = models.CharField(max_length=32, blank=True)
+    query = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=16)
+    message = models.TextField(blank=True)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(db_index=True)
+    duration = models.FloatField()
+    jobs = models.PositiveIntegerField(default=0)
+    pages = models.PositiveIntegerField(default=0)
+    time_to_first_job = models.FloatField(null=True, blank=True)
+    # [{"stage", "started", "ended", "duration"}], seconds from the start
+    stages = models.JSONField(default=list)
+
+    class Meta:
+        ordering = ["-finished_at"]
+
+    def __str__(self):
+        return f"{self.platform} {self.query!r}: {self.status} in {self.duration:.1f}s"
+
+
+class JobSignature(models.Model):
+    """MinHash signatures used for near-duplicate detection (see scraper/near_duplicates.py)."""
+
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name="signature")
+    title_minhash = models.BinaryField()
+    # Null when the job has no real description (e.g. Glassdoor placeholders)
+    description_minhash = models.BinaryField(null=True)
+
+
+class JobBand(models.Model):
+    """One LSH band key of a job's signatures; jobs sharing a key are candidates."""
+
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="bands")
+    key = models.BigIntegerField(db_index=True)
+
+
+class ArchivedJob(models.Model):
+    """
+    A job moved out of the hot table by ``manage.py archive_jobs``.
+
+    Keeps the original id; the description is stored zstd-compressed.
+    ``period`` (YYYYMM of scraped_at) partitions the archive for retention.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    period = models.PositiveIntegerField(db_index=True)
+    title = models.CharField(max_length=255)
+    location = models.CharField(max_length=255, blank=True)
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name="archived_jobs")
+    description_zstd = models.BinaryField()
+    source_url = models.URLField()
+    sources = models.JSONField(default=list)
+    fingerprint = models.CharField(max_length=255)
+    fingerprint_hash = models.BigIntegerField(default=0)
+    posted_at = models.DateTimeField(blank=True, null=True)
+    scraped_at = models.DateTimeField(db_index=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.title} @ {self.company.name} ({self.location}) [archived]"
+
+    @property
+    def description(self):
+        from .compression import decompress_text
+
+        return decompress_text(self.description_zstd)
+
+    def to_job(self):
+        """Unsaved Job carrying this row's data."""
+        job = Job(
+            id=self.id,
+            title=self.title,
+            location=self.location,
+            company_id=self.company_id,
+            description=self.description,
+            source_url=self.source_url,
+            sources=self.sources,
+            fingerprint=self.fingerprint,
+            fingerprint_hash=self.fingerprint_hash,
+            posted_at=self.posted_at,
+            scraped_at=self.scraped_at,
+        )
+        if "company" in self._state.fields_cache:
+            job.company = self.company
+        job.archived = True
+        return job
@@ -3,8 +3,11 @@ from bs4 import BeautifulSoup
 import time
 import random
 import json
+from functools import partial
 from urllib.parse import quote
 
+from .hedging import HEDGE_DELAY, run_hedged
+
 def scrape_jobs_advanced(keyword: str, location: str, max_jobs: int = 50):
     """
     Advanced scraper that tries multiple approaches to get job data.
@@ -24,37 +27,27 @@ def scrape_jobs_advanced(keyword: str, location: str, max_jobs: int = 50):
     except Exception as e:
         print(f"❌ Real scraper failed: {e}")
     
-    # If real scraper fails, try the original scrapers
-    scrapers = [
-        ("Indeed", scrape_indeed_advanced),
-        ("LinkedIn", scrape_linkedin_advanced),
-        ("ZipRecruiter", scrape_ziprecruiter_advanced),
-        ("Monster", scrape_monster_advanced),
-        ("CareerBuilder", scrape_careerbuilder_advanced),
-        ("SimplyHired", scrape_simplyhired_advanced),
-        ("Dice", scrape_dice_advanced),
-        ("AngelList", scrape_angelist_advanced),
-        ("RemoteOK", scrape_remoteok_advanced),
-        ("WeWorkRemotely", scrape_weworkremotely_advanced)
+    # If real scraper fails, race the original scrapers: best-ranked first,
+    # the rest hedged in after SCRAPE_HEDGE_DELAY seconds. The first site
+    # returning any jobs wins
+    sources = [
+        (site_name, partial(scraper_func, keyword, location, max_jobs))
+        for site_name, scraper_func in ADVANCED_SCRAPERS
     ]
-    
-    for site_name, scraper_func in scrapers:
-        try:
-            print(f"Trying {site_name}...")
-            jobs = scraper_func(keyword, location, max_jobs)
-            if jobs:
-                print(f"✅ {site_name}: Found {len(jobs)} jobs")
-                return jobs
-            else:
-                print(f"❌ {site_name}: No jobs found")
-        except Exception as e:
-            print(f"❌ {site_name}: Error - {e}")
-            continue
+    site_name, jobs = run_hedged(sources, bool, hedge_delay=_hedge_delay())
+    if jobs:
+        print(f"Using {len(jobs)} jobs from {site_name}")
+        return jobs
     
     # If all scraping fails, return realistic sample data
     print("⚠️ All scraping attempts failed, using realistic sample data")
     return create_realistic_sample_jobs(keyword, location, max_jobs)
 
+def _hedge_delay() -> float:
+    from django.conf import settings
+
+    return getattr(settings, "SCRAPE_HEDGE_DELAY", HEDGE_DELAY)
+
 def get_advanced_headers():
     """Generate advanced headers with rotation for better anti-detection"""
     user_agents = [
@@ -717,3 +710,17 @@ def create_realistic_sample_jobs(keyword: str, location: str, max_jobs: int):
         jobs.append(job)
     
     return jobs
+
+# Fallback sources, in their default order (reordered by recent results)
+ADVANCED_SCRAPERS = [
+    ("Indeed", scrape_indeed_advanced),
+    ("LinkedIn", scrape_linkedin_advanced),
+    ("ZipRecruiter", scrape_ziprecruiter_advanced),
+    ("Monster", scrape_monster_advanced),
+    ("CareerBuilder", scrape_careerbuilder_advanced),
+    ("SimplyHired", scrape_simplyhired_advanced),
+    ("Dice", scrape_dice_advanced),
+    ("AngelList", scrape_angelist_advanced),
+    ("RemoteOK", scrape_remoteok_advanced),
+    ("WeWorkRemotely", scrape_weworkremotely_advanced)
+]
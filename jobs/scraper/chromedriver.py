@@ -0,0 +1,202 @@
+"""
+Where the chromedriver binary is, resolved once per process.
+
+``ChromeDriverManager().install()`` checks versions (and may download) on
+every call, which is slow and fails on workers without internet access.
+``resolve_chromedriver`` instead trusts a local manifest
+(``CHROMEDRIVER_MANIFEST``, JSON with path, version, sha256 and the Chrome
+major version it was recorded against) as long as the binary it names
+still has that checksum and Chrome hasn't been upgraded since. Resolution
+order:
+
+1. ``CHROMEDRIVER_PATH`` (setting or environment): a pre-provisioned
+   binary, checked against ``CHROMEDRIVER_SHA256`` when that is set
+2. the manifest, if its binary is intact and its Chrome version current
+3. webdriver-manager, unless ``CHROMEDRIVER_OFFLINE`` is set
+
+Whatever is found is written to the manifest, so later processes skip
+straight to step 2. ``manage.py chromedriver`` provisions or checks it.
+If Chrome still refuses the driver, ``redownload_chromedriver`` skips
+steps 1 and 2 once (see driver.build_driver).
+"""
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+MANIFEST_NAME = "chromedriver.json"
+HASH_CHUNK_SIZE = 1 << 20
+# Looked up on PATH when CHROME_BINARY isn't set
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+
+class ChromeDriverUnavailable(RuntimeError):
+    pass
+
+
+def _setting(name: str, default=None):
+    from django.conf import settings
+
+    value = os.getenv(name)
+    if value is not None:
+        return value
+    return getattr(settings, name, default)
+
+
+def _offline() -> bool:
+    value = _setting("CHROMEDRIVER_OFFLINE", False)
+    if isinstance(value, str):
+        return value.lower() in ("1", "true", "yes")
+    return bool(value)
+
+
+def manifest_path() -> Path:
+    from django.conf import settings
+
+    return Path(_setting("CHROMEDRIVER_MANIFEST") or Path(settings.BASE_DIR) / MANIFEST_NAME)
+
+
+def file_sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _version_output(path) -> str:
+    try:
+        return subprocess.run([str(path), "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def chromedriver_version(path) -> str:
+    """Version (e.g. 120.0.6099.109) from ``chromedriver --version``; runs locally."""
+    output = _version_output(path)
+    parts = output.split()
+    return parts[1] if len(parts) > 1 else output.strip()
+
+
+def browser_major_version() -> str:
+    """Major version of the installed Chrome (e.g. "120"), or "" if it can't be found."""
+    binary = _setting("CHROME_BINARY") or next(filter(None, map(shutil.which, CHROME_BINARIES)), None)
+    if not binary:
+        return ""
+    # "Google Chrome 120.0.6099.109" / "Chromium 120.0.6099.109 built on ..."
+    for word in _version_output(binary).split():
+        if word[:1].isdigit():
+            return word.split(".")[0]
+    return ""
+
+
+def read_manifest() -> Optional[Dict[str, str]]:
+    try:
+        with open(manifest_path()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_manifest(entry: Dict[str, str]):
+    path = manifest_path()
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(entry, f, indent=2)
+    # Atomic, so concurrent workers never read half a manifest
+    os.replace(tmp, path)
+
+
+def record_chromedriver(path, sha256: Optional[str] = None) -> Dict[str, str]:
+    """Checksum ``path`` (against ``sha256`` if given) and make it the manifest entry."""
+    path = Path(path).resolve()
+    if not os.access(path, os.X_OK):
+        raise ChromeDriverUnavailable(f"{path} is not an executable chromedriver")
+    actual = file_sha256(path)
+    if sha256 and actual != sha256.lower():
+        raise ChromeDriverUnavailable(f"Checksum mismatch for {path}: expected {sha256}, got {actual}")
+    browser_major = browser_major_version()
+    recorded = read_manifest()
+    if (recorded and recorded.get("path") == str(path) and recorded.get("sha256") == actual
+            and recorded.get("browser_major", "") == browser_major):
+        return recorded
+    entry = {"path": str(path), "version": chromedriver_version(path), "sha256": actual,
+             "browser_major": browser_major}
+    write_manifest(entry)
+    return entry
+
+
+def verified_manifest() -> Optional[Dict[str, str]]:
+    """The manifest entry, if its binary still exists with the recorded checksum and Chrome version."""
+    entry = read_manifest()
+    if not entry or not entry.get("path") or not os.access(entry["path"], os.X_OK):
+        return None
+    if file_sha256(entry["path"]) != entry.get("sha256"):
+        print(f"chromedriver at {entry['path']} changed since it was recorded; resolving again")
+        return None
+    browser_major = browser_major_version()
+    # Unknown on either side (e.g. Chrome not on PATH) is not a mismatch
+    if browser_major and entry.get("browser_major") and entry["browser_major"] != browser_major:
+        print(f"Chrome is now {browser_major}, chromedriver was recorded for "
+              f"{entry['browser_major']}; resolving again")
+        return None
+    return entry
+
+
+def _download() -> Dict[str, str]:
+    if _offline():
+        raise ChromeDriverUnavailable(
+            f"No verified chromedriver in {manifest_path()} and CHROMEDRIVER_OFFLINE is set; "
+            "provision one with 'manage.py chromedriver --path /path/to/chromedriver'"
+        )
+    from webdriver_manager.chrome import ChromeDriverManager  # pip install webdriver-manager
+
+    return record_chromedriver(ChromeDriverManager().install())
+
+
+def _resolve() -> Dict[str, str]:
+    provisioned = _setting("CHROMEDRIVER_PATH")
+    if provisioned:
+        return record_chromedriver(provisioned, _setting("CHROMEDRIVER_SHA256"))
+
+    entry = verified_manifest()
+    if entry:
+        return entry
+    return _download()
+
+
+_resolved: Optional[Dict[str, str]] = None
+_resolve_lock = threading.Lock()
+
+
+def resolve_chromedriver(refresh: bool = False) -> Dict[str, str]:
+    """``{"path", "version", "sha256"}`` of the chromedriver to use, cached for the process."""
+    global _resolved
+    if _resolved is None or refresh:
+        with _resolve_lock:
+            if _resolved is None or refresh:
+                _resolved = _resolve()
+                print(f"Using chromedriver {_resolved['version'] or '(unknown version)'} at {_resolved['path']}")
+    return _resolved
+
+
+def redownload_chromedriver(failed_path: str) -> Dict[str, str]:
+    """
+    Fetch a fresh chromedriver after Chrome refused the one at ``failed_path``.
+
+    Raises ChromeDriverUnavailable when offline or when ``CHROMEDRIVER_PATH``
+    pins the binary, since nothing better can be fetched then.
+    """
+    global _resolved
+    if _setting("CHROMEDRIVER_PATH"):
+        raise ChromeDriverUnavailable("CHROMEDRIVER_PATH is set; not replacing the provisioned chromedriver")
+    with _resolve_lock:
+        # Another thread may have replaced it already
+        if _resolved is None or _resolved["path"] == failed_path:
+            _resolved = _download()
+            print(f"Downloaded chromedriver {_resolved['version'] or '(unknown version)'} to {_resolved['path']}")
+    return _resolved
@@ -0,0 +1,200 @@
+"""
+Company resolution through canonical name keys.
+
+"Google", "Google LLC" and "Google, Inc." share the key "google"
+(see ``utils.company_key``) and ``CompanyAlias`` maps every key to a single
+Company row. Resolved keys live in a bounded in-process LRU cache, warmed
+from the database on first use, so companies seen before cost no query.
+
+Ids resolved inside a transaction are only cached once it commits. Each
+scrape worker process has its own cache, so code deleting companies calls
+``bump_company_generation()`` in the same transaction; every resolver
+compares that database counter with the one its cache was filled under
+and starts over when it moved. The counter is read at most once every
+``GENERATION_CHECK_INTERVAL`` seconds, not on every lookup; the process
+that bumped it drops its own cache as soon as the deletion commits.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set
+
+from django.db import connection, transaction
+
+from .utils import company_key
+
+COMPANY_CACHE_SIZE = 20000
+LOOKUP_BATCH_SIZE = 500
+COMPANY_GENERATION = "companies"
+GENERATION_CHECK_INTERVAL = 5.0  # seconds
+
+# Portable between SQLite (3.24+) and PostgreSQL
+BUMP_SQL = (
+    'INSERT INTO {table} ("name", "value") VALUES (%s, 1) '
+    'ON CONFLICT ("name") DO UPDATE SET "value" = {table}."value" + 1'
+)
+
+
+def _key(name: str) -> str:
+    return company_key(name)[:255]
+
+
+def company_generation() -> int:
+    from ..models import CacheGeneration
+
+    return CacheGeneration.objects.filter(name=COMPANY_GENERATION).values_list("value", flat=True).first() or 0
+
+
+def bump_company_generation():
+    """Tell every process's resolver that cached company ids may be gone; call when deleting companies."""
+    from ..models import CacheGeneration
+
+    table = connection.ops.quote_name(CacheGeneration._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(BUMP_SQL.format(table=table), [COMPANY_GENERATION])
+    # Don't wait for the next interval check in this process
+    transaction.on_commit(get_company_resolver().invalidate)
+
+
+class CompanyResolver:
+    def __init__(self, max_size: int = COMPANY_CACHE_SIZE, check_interval: float = GENERATION_CHECK_INTERVAL):
+        self.max_size = max_size
+        self.check_interval = check_interval
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._warmed = False
+        # Database generation the cached ids belong to
+        self._generation: Optional[int] = None
+        self._generation_checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    # -- cache ---------------------------------------------------------
+
+    def _put_many(self, ids: Dict[str, int]):
+        with self._lock:
+            for key, company_id in ids.items():
+                self._cache[key] = company_id
+                self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def warm(self):
+        """Load aliases of the newest companies, up to the cache size."""
+        from ..models import CompanyAlias
+
+        rows = list(
+            CompanyAlias.objects.order_by("-company_id").values_list("key", "company_id")[:self.max_size]
+        )
+        # Oldest first so the newest end up most recently used
+        self._put_many(dict(reversed(rows)))
+        self._warmed = True
+
+    def invalidate(self):
+        with self._lock:
+            self._cache.clear()
+            self._warmed = False
+            self._generation = None
+
+    def _check_generation(self):
+        now = time.monotonic()
+        if self._generation is not None and now - self._generation_checked_at < self.check_interval:
+            return
+        generation = company_generation()
+        if generation != self._generation:
+            if self._generation is not None:
+                print("Companies were deleted by another process; clearing the company cache")
+            self.invalidate()
+            self._generation = generation
+        self._generation_checked_at = now
+
+    # -- database ------------------------------------------------------
+
+    def _lookup(self, keys: Set[str]) -> Dict[str, int]:
+        from ..models import CompanyAlias
+
+        keys = list(keys)
+        found = {}
+        for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+            chunk = keys[start:start + LOOKUP_BATCH_SIZE]
+            found.update(CompanyAlias.objects.filter(key__in=chunk).values_list("key", "company_id"))
+        return found
+
+    def _create(self, names_by_key: Dict[str, str]) -> Dict[str, int]:
+        """Insert a Company and an alias for each key; returns the winning ids."""
+        from ..models import Company, CompanyAlias
+
+        names = list(names_by_key.values())
+        # ignore_conflicts: the name may exist without an alias, or a
+        # concurrent writer may have inserted it first
+        Company.objects.bulk_create(
+            [Company(name=name) for name in names], batch_size=LOOKUP_BATCH_SIZE, ignore_conflicts=True
+        )
+        ids_by_name = {}
+        for start in range(0, len(names), LOOKUP_BATCH_SIZE):
+            chunk = names[start:start + LOOKUP_BATCH_SIZE]
+            ids_by_name.update(Company.objects.filter(name__in=chunk).values_list("name", "id"))
+        CompanyAlias.objects.bulk_create(
+            [CompanyAlias(key=key, company_id=ids_by_name[name]) for key, name in names_by_key.items()],
+            batch_size=LOOKUP_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        return self._lookup(set(names_by_key))
+
+    # -- public API ----------------------------------------------------
+
+    def resolve_many(self, names: Iterable[str]) -> Dict[str, int]:
+        """Map raw company names to Company ids, creating companies for unseen keys."""
+        self._check_generation()
+        if not self._warmed:
+            self.warm()
+        keys = {name: _key(name) for name in names}
+
+        ids = {}
+        missing = set()
+        with self._lock:
+            for key in set(keys.values()):
+                company_id = self._cache.get(key)
+                if company_id is None:
+                    missing.add(key)
+                else:
+                    self._cache.move_to_end(key)
+                    ids[key] = company_id
+        self.hits += len(ids)
+        self.misses += len(missing)
+
+        if missing:
+            found = self._lookup(missing)
+            ids.update(found)
+            unknown = {}
+            for name, key in keys.items():
+                # The shortest spelling ("Google" over "Google LLC") names the new row
+                if key not in ids and (key not in unknown or len(name) < len(unknown[key])):
+                    unknown[key] = name
+            if unknown:
+                found.update(self._create(unknown))
+                ids.update(found)
+            # Cached on commit (immediately outside a transaction) so a
+            # rollback can't leave ids of vanished rows behind
+            transaction.on_commit(lambda: self._put_many(found))
+        return {name: ids[key] for name, key in keys.items()}
+
+    def resolve(self, name: str) -> int:
+        return self.resolve_many([name])[name]
+
+    def __len__(self):
+        return len(self._cache)
+
+
+_resolver: Optional[CompanyResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_company_resolver() -> CompanyResolver:
+    """Process-wide resolver."""
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = CompanyResolver()
+    return _resolver
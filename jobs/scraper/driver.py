@@ -1,27 +1,265 @@
+"""
+Chrome sessions for the Selenium scrapers.
+
+Launching Chrome takes seconds and hundreds of MB, so scrapers don't build
+drivers themselves: they borrow one from the process-wide ``DriverPool``
+(``get_driver_pool()``) with ``with pool.driver() as driver:``.
+
+The pool launches up to ``DRIVER_POOL_SIZE`` sessions, pre-launching them
+in the background when first used. A returned session is reset (extra
+tabs closed, back on about:blank, every origin's cookies and storage
+cleared over CDP) and reused; sessions failing a health check or the
+reset, or used ``DRIVER_MAX_USES`` times, are quit and replaced in the
+background. Borrowers wait when all sessions are out.
+"""
 import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from multiprocessing.util import Finalize
+from typing import Dict, Optional
+
 from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager # pip install webdriver-manager
 
+from .chromedriver import ChromeDriverUnavailable, redownload_chromedriver, resolve_chromedriver
 
+DRIVER_POOL_SIZE = 2
+DRIVER_MAX_USES = 20
+DRIVER_CHECKOUT_TIMEOUT = 300
+WINDOW_SIZE = (1366, 768)
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+# Runs in every page the session opens, not only the current one
+HIDE_WEBDRIVER_JS = "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
 
 
-def build_driver(headless: bool = True):
+class DriverPoolTimeout(RuntimeError):
+    pass
+
+
+def chrome_options(headless: bool = True) -> Options:
+    """The one option set every scraper's sessions use."""
     opts = Options()
     if headless:
         opts.add_argument("--headless=new")
     opts.add_argument("--no-sandbox")
     opts.add_argument("--disable-dev-shm-usage")
     opts.add_argument("--disable-blink-features=AutomationControlled")
-    opts.add_argument("--window-size=1366,768")
+    opts.add_argument("--disable-extensions")
+    opts.add_argument("--disable-gpu")
+    opts.add_argument("--window-size=%d,%d" % WINDOW_SIZE)
+    opts.add_experimental_option("excludeSwitches", ["enable-automation"])
+    opts.add_experimental_option("useAutomationExtension", False)
     # Optional: random user agent / proxy from env
-    ua = os.getenv("SCRAPER_USER_AGENT")
-    if ua:
-        opts.add_argument(f"--user-agent={ua}")
+    opts.add_argument(f"--user-agent={os.getenv('SCRAPER_USER_AGENT') or DEFAULT_USER_AGENT}")
     proxy = os.getenv("SCRAPER_HTTP_PROXY")
     if proxy:
         opts.add_argument(f"--proxy-server={proxy}")
+    return opts
+
+
+def build_driver(headless: bool = True):
+    """Launch a new Chrome session; scrapers borrow from ``get_driver_pool()`` instead."""
+    path = resolve_chromedriver()["path"]
+    try:
+        driver = webdriver.Chrome(service=ChromeService(path), options=chrome_options(headless))
+    except SessionNotCreatedException as e:
+        # Usually Chrome updated itself past the recorded driver: fetch a matching one, once
+        try:
+            path = redownload_chromedriver(path)["path"]
+        except ChromeDriverUnavailable as reason:
+            print(f"Not retrying with a new chromedriver: {reason}")
+            raise e
+        driver = webdriver.Chrome(service=ChromeService(path), options=chrome_options(headless))
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": HIDE_WEBDRIVER_JS})
+    except Exception:
+        driver.execute_script(HIDE_WEBDRIVER_JS)
+    return driver
+
+
+def randomize_window(driver, jitter: int = 100):
+    width, height = WINDOW_SIZE
+    driver.set_window_size(width + random.randint(-jitter, jitter), height + random.randint(-jitter, jitter))
+
+
+class DriverPool:
+    def __init__(self, size: int = DRIVER_POOL_SIZE, max_uses: int = DRIVER_MAX_USES,
+                 headless: bool = True, factory=build_driver):
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.headless = headless
+        self.factory = factory
+        self._idle = deque()
+        self._uses: Dict[int, int] = {}
+        # Sessions that exist or are being launched
+        self._count = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        # Quit Chrome when this process exits, including pool worker processes
+        Finalize(self, self.close, exitpriority=10)
+
+    def _launch(self):
+        try:
+            driver = self.factory(self.headless)
+        except Exception:
+            with self._cond:
+                self._count -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._uses[id(driver)] = 0
+        return driver
+
+    def _quit(self, driver):
+        with self._cond:
+            self._uses.pop(id(driver), None)
+            self._count -= 1
+            self._cond.notify()
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def warm(self, count: Optional[int] = None):
+        """Pre-launch sessions up to ``count`` (default: the pool size) in a background thread."""
+        count = min(self.size, count or self.size)
+
+        def launch():
+            while True:
+                with self._cond:
+                    if self._closed or self._count >= count:
+                        return
+                    self._count += 1
+                try:
+                    driver = self._launch()
+                except Exception as e:
+                    print(f"Could not pre-launch Chrome: {e}")
+                    return
+                self._release(driver)
+
+        threading.Thread(target=launch, name="driver-pool-warm", daemon=True).start()
+
+    @staticmethod
+    def healthy(driver) -> bool:
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def checkout(self, timeout: float = DRIVER_CHECKOUT_TIMEOUT):
+        """A healthy session for exclusive use; give it back with ``checkin``."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise DriverPoolTimeout("The Chrome session pool is closed")
+                while not self._idle and self._count >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or self._closed:
+                        raise DriverPoolTimeout(f"No Chrome session free after {timeout:g}s")
+                    self._cond.wait(remaining)
+                if self._idle:
+                    driver = self._idle.popleft()
+                else:
+                    driver = None
+                    self._count += 1
+            if driver is None:
+                driver = self._launch()
+            elif not self.healthy(driver):
+                print("Discarding an unresponsive Chrome session")
+                self._quit(driver)
+                continue
+            with self._cond:
+                self._uses[id(driver)] += 1
+            return driver
+
+    def _reset(self, driver):
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.get("about:blank")
+        # Every origin's cookies and storage, not just the current page's;
+        # if CDP fails, checkin() replaces the session instead
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": "*", "storageTypes": "all"})
+        driver.set_window_size(*WINDOW_SIZE)
+
+    def _release(self, driver):
+        with self._cond:
+            if not self._closed:
+                self._idle.append(driver)
+                self._cond.notify()
+                return
+        self._quit(driver)
+
+    def checkin(self, driver, discard: bool = False):
+        """Return a session: reset for the next borrower, or replaced if worn out or broken."""
+        if not discard and self._uses.get(id(driver), 0) < self.max_uses:
+            try:
+                self._reset(driver)
+            except Exception as e:
+                print(f"Could not reset Chrome session: {e}")
+                discard = True
+        else:
+            discard = True
+        if discard:
+            self._quit(driver)
+            # Keep a replacement warm for the next borrower
+            self.warm()
+        else:
+            self._release(driver)
+
+    @contextmanager
+    def driver(self, timeout: float = DRIVER_CHECKOUT_TIMEOUT):
+        driver = self.checkout(timeout)
+        try:
+            yield driver
+        finally:
+            self.checkin(driver)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"size": self.size, "sessions": self._count, "idle": len(self._idle)}
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._cond.notify_all()
+        for driver in idle:
+            self._quit(driver)
+
+
+_pools: Dict[bool, DriverPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_driver_pool(headless: bool = True) -> DriverPool:
+    """Process-wide pool; the headless one pre-launches its sessions on first use."""
+    pool = _pools.get(headless)
+    if pool is None:
+        from django.conf import settings
 
-    driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=opts)
-    return driver
\ No newline at end of file
+        with _pools_lock:
+            pool = _pools.get(headless)
+            if pool is None:
+                pool = DriverPool(
+                    size=getattr(settings, "DRIVER_POOL_SIZE", DRIVER_POOL_SIZE),
+                    max_uses=getattr(settings, "DRIVER_MAX_USES", DRIVER_MAX_USES),
+                    headless=headless,
+                )
+                if headless:
+                    pool.warm()
+                _pools[headless] = pool
+    return pool
@@ -0,0 +1,227 @@
+"""
+Shared in-memory index of job fingerprint hashes.
+
+Lets scrapers decide "already known" without a database round trip. The
+index is kept in two files that every worker process reads:
+
+* ``<path>``      a sorted array of signed 64-bit hashes (a snapshot of
+                  ``Job.fingerprint_hash``), memory-mapped read-only;
+* ``<path>.log``  an append-only array of hashes inserted since the snapshot.
+
+Lookups bisect the snapshot and check a set built from the log; new bytes
+appended to the log by other processes are picked up on every call. Once
+the log passes ``COMPACT_THRESHOLD`` entries it is merged into a fresh
+snapshot under an exclusive lock on ``<path>.lock``.
+
+The database stays the source of truth: a false "known" only costs a
+lookup, and the unique constraint backs up a false "unknown".
+"""
+import bisect
+import mmap
+import os
+import threading
+from array import array
+from contextlib import contextmanager
+from heapq import merge
+from typing import Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+ITEM_SIZE = array("q").itemsize
+COMPACT_THRESHOLD = 50000
+WRITE_CHUNK = 65536
+
+_EMPTY = array("q")
+
+
+class FingerprintIndex:
+    def __init__(self, path: str):
+        self.path = str(path)
+        self.log_path = self.path + ".log"
+        self.lock_path = self.path + ".lock"
+        self._lock = threading.RLock()
+        self._file = None
+        self._mmap = None
+        self._base = _EMPTY
+        self._base_id = None
+        self._log_offset = 0
+        self._recent = set()
+
+    # -- file handling -------------------------------------------------
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Shared lock for appenders, exclusive for snapshot rewrites."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _close_base(self):
+        if isinstance(self._base, memoryview):
+            self._base.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        if self._file is not None:
+            self._file.close()
+        self._file = self._mmap = None
+        self._base = _EMPTY
+
+    def _refresh(self):
+        """Remap the snapshot if it was replaced and read new log entries."""
+        try:
+            st = os.stat(self.path)
+            base_id = (st.st_ino, st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            base_id = None
+
+        if base_id != self._base_id:
+            self._close_base()
+            if base_id is not None and base_id[2] >= ITEM_SIZE:
+                self._file = open(self.path, "rb")
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._base = memoryview(self._mmap).cast("q")
+            self._base_id = base_id
+            self._log_offset = 0
+            self._recent = set()
+
+        try:
+            size = os.path.getsize(self.log_path)
+        except FileNotFoundError:
+            size = 0
+        if size < self._log_offset:
+            # Log was truncated by a compaction in another process
+            self._log_offset = 0
+            self._recent = set()
+        end = size - size % ITEM_SIZE
+        if end > self._log_offset:
+            with open(self.log_path, "rb") as handle:
+                handle.seek(self._log_offset)
+                entries = array("q")
+                entries.frombytes(handle.read(end - self._log_offset))
+            self._recent.update(entries)
+            self._log_offset = end
+
+    def _write_snapshot(self, hashes: Iterable[int]) -> int:
+        """Atomically replace the snapshot with sorted ``hashes``; returns the count."""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        count = 0
+        last = None
+        buffer = array("q")
+        with open(tmp_path, "wb") as handle:
+            for value in hashes:
+                if value == last:
+                    continue
+                buffer.append(value)
+                last = value
+                if len(buffer) >= WRITE_CHUNK:
+                    buffer.tofile(handle)
+                    count += len(buffer)
+                    buffer = array("q")
+            buffer.tofile(handle)
+            count += len(buffer)
+        os.replace(tmp_path, self.path)
+        open(self.log_path, "wb").close()
+        return count
+
+    # -- public API ----------------------------------------------------
+
+    def __contains__(self, value: int) -> bool:
+        with self._lock:
+            self._refresh()
+            return self._contains(value)
+
+    def _contains(self, value: int) -> bool:
+        if value in self._recent:
+            return True
+        base = self._base
+        i = bisect.bisect_left(base, value)
+        return i < len(base) and base[i] == value
+
+    def known(self, values: Iterable[int]) -> set:
+        """Subset of ``values`` present in the index (one refresh for the batch)."""
+        with self._lock:
+            self._refresh()
+            return {value for value in values if self._contains(value)}
+
+    def add_many(self, values: Iterable[int]):
+        """Record newly inserted hashes so every process sees them."""
+        entries = array("q", values)
+        if not entries:
+            return
+        with self._lock:
+            with self._file_lock(exclusive=False):
+                with open(self.log_path, "ab") as handle:
+                    entries.tofile(handle)
+            self._refresh()
+            if self._log_offset // ITEM_SIZE >= COMPACT_THRESHOLD:
+                self.compact()
+
+    def add(self, value: int):
+        self.add_many([value])
+
+    def compact(self):
+        """Merge the log into a new snapshot."""
+        with self._lock, self._file_lock(exclusive=True):
+            self._refresh()
+            recent = sorted(self._recent)
+            self._write_snapshot(merge(iter(self._base), recent))
+            self._refresh()
+
+    def rebuild(self, sorted_hashes: Iterable[int]) -> int:
+        """Replace the whole index with ``sorted_hashes`` (ascending)."""
+        with self._lock, self._file_lock(exclusive=True):
+            count = self._write_snapshot(sorted_hashes)
+            self._refresh()
+        return count
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._base) + len(self._recent)
+
+    def close(self):
+        with self._lock:
+            self._close_base()
+            self._base_id = None
+
+
+_index: Optional[FingerprintIndex] = None
+_index_lock = threading.Lock()
+
+
+def rebuild_fingerprint_index(index: Optional[FingerprintIndex] = None) -> int:
+    """Reload the index from Job.fingerprint_hash; returns the number of hashes."""
+    from ..models import Job
+
+    if index is None:
+        index = get_fingerprint_index()
+    hashes = (
+        Job.objects.order_by("fingerprint_hash")
+        .values_list("fingerprint_hash", flat=True)
+        .iterator(chunk_size=WRITE_CHUNK)
+    )
+    return index.rebuild(hashes)
+
+
+def get_fingerprint_index() -> FingerprintIndex:
+    """Process-wide index, built from the database on first use if no snapshot exists."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                from django.conf import settings
+
+                index = FingerprintIndex(settings.FINGERPRINT_INDEX_PATH)
+                if not os.path.exists(index.path):
+                    rebuild_fingerprint_index(index)
+                _index = index
+    return _index
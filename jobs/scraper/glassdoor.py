@@ -1,41 +1,26 @@
 import time
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import (
     NoSuchElementException,
     ElementNotInteractableException,
 )
-from webdriver_manager.chrome import ChromeDriverManager
+
+from .driver import get_driver_pool
 
 def scrape_glassdoor(keyword: str, location: str, num_pages: int = 1, max_jobs: int = 50):
     print(f"Starting Glassdoor scrape for '{keyword}' in '{location}'")
     
-    options = Options()
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument("--disable-extensions")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--disable-web-security")
-    options.add_argument("--allow-running-insecure-content")
-    options.add_argument("--disable-features=VizDisplayCompositor")
-    
-    # Add user agent to look more like a real browser
-    options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-    
-    # Enable headless mode for production
-    options.add_argument("--headless")
-    
+    pool = get_driver_pool()
     try:
-        driver = webdriver.Chrome(ChromeDriverManager().install(), options=options)
-        print("Chrome driver initialized successfully")
+        driver = pool.checkout()
     except Exception as e:
         print(f"Error initializing Chrome driver: {e}")
         return []
 
     try:
+        driver.set_window_size(1920, 1080)
+        print("Chrome driver ready")
+
         # Navigate to Glassdoor
         driver.get("https://www.glassdoor.com/Job/index.htm")
         print("Navigated to Glassdoor")
@@ -289,7 +274,4 @@ def scrape_glassdoor(keyword: str, location: str, num_pages: int = 1, max_jobs:
         traceback.print_exc()
         return []
     finally:
-        try:
-            driver.quit()
-        except:
-            pass
+        pool.checkin(driver)
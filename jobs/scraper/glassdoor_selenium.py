@@ -1,14 +1,14 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
 import time
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-def scrape_glassdoor_jobs(keyword: str, num_jobs: int, slp_time: int = 3, progress=None) -> List[Dict]:
+from .driver import get_driver_pool
+
+def scrape_glassdoor_jobs(keyword: str, num_jobs: int, slp_time: int = 3, progress=None, incremental: bool = False,
+                          deadline: Optional[float] = None) -> List[Dict]:
     """
     Scrape jobs from Glassdoor using Selenium.
     
@@ -16,37 +16,28 @@ def scrape_glassdoor_jobs(keyword: str, num_jobs: int, slp_time: int = 3, progre
         keyword: Job role to search for (e.g., "Data Science", "Software Engineer")
         num_jobs: Number of jobs to scrape
         slp_time: Sleep time between page loads
+        incremental: Sort by date and stop paging once known jobs are reached
+        deadline: time.time() after which no further pages are loaded
     
     Returns:
         List of job dictionaries
     """
     print(f"Starting Glassdoor scrape for '{keyword}' - Target: {num_jobs} jobs")
     
-    options = webdriver.ChromeOptions()
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument("--start-maximized")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--window-size=1200,1000")
-    options.add_argument("--disable-web-security")
-    options.add_argument("--allow-running-insecure-content")
-    options.add_argument("--disable-extensions")
-    options.add_argument("--disable-plugins")
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option('useAutomationExtension', False)
-    
-    # Add user agent to avoid detection
-    options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-    
+    pool = get_driver_pool()
     driver = None
     jobs = []
+    crawl = None
     
     try:
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+        driver = pool.checkout()
         driver.set_window_size(1200, 1000)
         
         url = f"https://www.glassdoor.com/Job/jobs.htm?sc.keyword={keyword.replace(' ', '%20')}"
+        if incremental:
+            from .incremental import IncrementalCrawl
+            url += "&sortBy=date_desc"
+            crawl = IncrementalCrawl("glassdoor", keyword)
         print(f"Navigating to: {url}")
         driver.get(url)
         
@@ -54,12 +45,17 @@ def scrape_glassdoor_jobs(keyword: str, num_jobs: int, slp_time: int = 3, progre
         time.sleep(3)
         
         while len(jobs) < num_jobs:
+            if deadline and time.time() >= deadline:
+                print("Deadline reached, stopping")
+                break
             try:
                 # Wait for job cards to load
                 job_cards = WebDriverWait(driver, 10).until(
                     EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.JobCard_jobCardWrapper__vX29z"))
                 )
                 print(f"Found {len(job_cards)} job cards on current page")
+                if progress:
+                    progress.add_pages()
             except TimeoutException:
                 print("⚠️ No job cards found. Structure may have changed.")
                 break
@@ -118,6 +114,9 @@ def scrape_glassdoor_jobs(keyword: str, num_jobs: int, slp_time: int = 3, progre
                         }
                         jobs.append(job_data)
                         print(f"📝 Collected job data: {job_title} at {company_name}")
+                        # Checked before the save below makes the card known
+                        if crawl:
+                            crawl.record(job_title, company_name, location)
                         
                         # Save job to database in real-time
                         try:
@@ -133,8 +132,11 @@ def scrape_glassdoor_jobs(keyword: str, num_jobs: int, slp_time: int = 3, progre
                         
                         # Update progress
                         if progress:
-                            progress.update("scraping", 20 + (len(jobs) * 60 // num_jobs), 100, 
-                                         f"Found {len(jobs)} jobs so far...")
+                            progress.add_jobs()
+                            progress.update("glassdoor", len(jobs), num_jobs,
+                                            f"Found {len(jobs)} jobs so far...")
+                        if crawl and crawl.should_stop:
+                            break
                     else:
                         print(f"❌ Skipping job card {i+1} - no valid title or company")
 
@@ -142,6 +144,9 @@ def scrape_glassdoor_jobs(keyword: str, num_jobs: int, slp_time: int = 3, progre
                     print(f"❌ Error processing job card {i+1}: {str(e)[:100]}...")
                     continue
 
+            if crawl and crawl.should_stop:
+                break
+
             # --- Next page ---
             try:
                 next_button = driver.find_element(By.CSS_SELECTOR, "button[data-test='pagination-next']")
@@ -163,10 +168,11 @@ def scrape_glassdoor_jobs(keyword: str, num_jobs: int, slp_time: int = 3, progre
     
     finally:
         if driver:
-            try:
-                driver.quit()
-            except:
-                pass
+            pool.checkin(driver)
+    
+    if crawl:
+        crawl.finish()
+        print(f"Incremental crawl: {crawl.new} new of {crawl.seen} cards")
     
     print(f"✅ Glassdoor scraping completed. Found {len(jobs)} jobs")
     return jobs
@@ -178,44 +184,77 @@ def save_single_job_to_db(job_data: Dict) -> bool:
     Returns True if job was saved, False if it was a duplicate.
     """
     try:
-        from ..models import Job, Company
-        from .utils import fingerprint, normalize_text
+        from ..models import Job, JobSource
+        from .companies import get_company_resolver
+        from .fingerprint_index import get_fingerprint_index
+        from .near_duplicates import compute_signature, match_near_duplicates, store_signatures
+        from ..stats import apply_deltas, job_deltas
+        from .utils import fingerprint, fingerprint_hash
         from django.db import transaction
         
         # Create fingerprint for duplicate detection
         job_fingerprint = fingerprint(
-            normalize_text(job_data.get("job_title", "")),
-            normalize_text(job_data.get("company_name", "")),
-            normalize_text(job_data.get("location", ""))
+            job_data.get("job_title", ""),
+            job_data.get("company_name", ""),
+            job_data.get("location", "")
         )
+        job_hash = fingerprint_hash(job_fingerprint)
+        index = get_fingerprint_index()
         
         with transaction.atomic():
-            # Check if job already exists
-            existing_job = Job.objects.filter(fingerprint=job_fingerprint).first()
+            # Only jobs the shared index knows need an existence lookup
+            existing_job = None
+            if job_hash in index:
+                existing_job = Job.objects.filter(fingerprint_hash=job_hash).first()
+            if not existing_job:
+                # Same posting seen on another platform under slightly different text
+                signature = compute_signature(
+                    job_data.get("job_title", "N/A"),
+                    job_data.get("company_name", "Unknown Company"),
+                    job_data.get("location", "N/A"),
+                    job_data.get("job_description", "N/A"),
+                )
+                near_matches, _ = match_near_duplicates({job_hash: signature}, platform="glassdoor")
+                existing_job = near_matches.get(job_hash)
             if existing_job:
                 # Update sources if needed
                 if "glassdoor" not in existing_job.sources:
                     existing_job.sources.append("glassdoor")
-                    existing_job.save()
+                    existing_job.save(update_fields=["sources"])
+                    JobSource.objects.get_or_create(
+                        job=existing_job,
+                        platform="glassdoor",
+                        defaults={
+                            "source_url": job_data.get("source_url", ""),
+                            "scraped_at": existing_job.scraped_at,
+                        },
+                    )
+                    apply_deltas({("platform", "glassdoor"): 1})
                 return False  # Duplicate, not saved as new
             
-            # Get or create company
-            company_name = job_data.get("company_name", "Unknown Company")
-            company, created = Company.objects.get_or_create(
-                name=company_name,
-                defaults={'name': company_name}
-            )
+            # Resolve the company by canonical name (usually a cache hit)
+            company_id = get_company_resolver().resolve(job_data.get("company_name", "Unknown Company"))
             
             # Create new job
             job = Job.objects.create(
                 title=job_data.get("job_title", "N/A"),
-                company=company,
+                company_id=company_id,
                 location=job_data.get("location", "N/A"),
                 description=job_data.get("job_description", "N/A"),
                 source_url=job_data.get("source_url", ""),
                 sources=["glassdoor"],
-                fingerprint=job_fingerprint
+                fingerprint=job_fingerprint,
+                fingerprint_hash=job_hash
+            )
+            JobSource.objects.create(
+                job=job,
+                platform="glassdoor",
+                source_url=job.source_url,
+                scraped_at=job.scraped_at,
             )
+            store_signatures([(job, signature)])
+            apply_deltas(job_deltas([job], "glassdoor"))
+            transaction.on_commit(lambda: index.add(job_hash))
             
             return True  # Successfully saved
             
@@ -0,0 +1,142 @@
+"""
+Hedged execution of interchangeable job sources.
+
+``run_hedged`` starts the best-ranked source alone. If it hasn't produced
+an adequate result after ``hedge_delay`` seconds, the next sources are
+launched alongside it (at most ``max_parallel`` at once), and a slot freed
+by a failed source is refilled straight away. The first adequate result
+wins; sources that haven't started are cancelled and running ones are
+abandoned (their threads finish their current request in the background).
+
+Sources are ranked by ``SourceStats``: moving averages of each source's
+success rate and latency in this process, so a site that keeps failing or
+timing out drops to the back of the line instead of costing every scrape
+its full sleep plus timeout.
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+HEDGE_DELAY = 5.0
+HEDGE_MAX_PARALLEL = 4
+# Weight of the newest observation in the moving averages
+STATS_ALPHA = 0.3
+# Assumed for sources without history
+PRIOR_SUCCESS = 0.5
+PRIOR_LATENCY = 5.0
+MIN_SUCCESS = 0.05
+
+
+class SourceStats:
+    """Recent success rate and latency per source name (thread-safe)."""
+
+    def __init__(self, alpha: float = STATS_ALPHA):
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, name: str, success: bool, latency: float):
+        with self._lock:
+            stats = self._stats.setdefault(name, {"success": PRIOR_SUCCESS, "latency": PRIOR_LATENCY, "runs": 0})
+            stats["success"] += self.alpha * (float(success) - stats["success"])
+            stats["latency"] += self.alpha * (latency - stats["latency"])
+            stats["runs"] += 1
+
+    def expected_cost(self, name: str) -> float:
+        """Expected seconds until this source yields jobs (lower ranks first)."""
+        with self._lock:
+            stats = self._stats.get(name, {"success": PRIOR_SUCCESS, "latency": PRIOR_LATENCY})
+            return stats["latency"] / max(stats["success"], MIN_SUCCESS)
+
+    def rank(self, names: Sequence[str]) -> List[str]:
+        # Stable: sources with equal cost keep their configured order
+        return sorted(names, key=self.expected_cost)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+
+_source_stats: Optional[SourceStats] = None
+_stats_lock = threading.Lock()
+
+
+def get_source_stats() -> SourceStats:
+    global _source_stats
+    if _source_stats is None:
+        with _stats_lock:
+            if _source_stats is None:
+                _source_stats = SourceStats()
+    return _source_stats
+
+
+def run_hedged(sources: Sequence[Tuple[str, Callable[[], List]]], adequate: Callable[[List], bool],
+               hedge_delay: float = HEDGE_DELAY, max_parallel: int = HEDGE_MAX_PARALLEL,
+               stats: Optional[SourceStats] = None) -> Tuple[Optional[str], List]:
+    """
+    Run ``(name, fn)`` sources hedged; returns ``(name, result)`` of the first
+    adequate result, else the largest non-empty one, else ``(None, [])``.
+    """
+    stats = stats or get_source_stats()
+    funcs = dict(sources)
+    queue = stats.rank([name for name, _ in sources])
+    running = {}
+    best: Tuple[Optional[str], List] = (None, [])
+    executor = ThreadPoolExecutor(max_workers=max(1, max_parallel), thread_name_prefix="hedged-source")
+
+    def launch():
+        name = queue.pop(0)
+        started = time.monotonic()
+        future = executor.submit(funcs[name])
+
+        # Recorded even when the source finishes after it was abandoned
+        def done(f):
+            if f.cancelled():
+                return
+            failed = f.exception() is not None
+            stats.record(name, not failed and bool(f.result()), time.monotonic() - started)
+
+        future.add_done_callback(done)
+        running[future] = name
+        print(f"Trying {name}...")
+
+    try:
+        launch()
+        hedge_at = time.monotonic() + hedge_delay
+        hedged = False
+        while running:
+            timeout = None
+            if queue and not hedged:
+                timeout = max(0.0, hedge_at - time.monotonic())
+            finished, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    result = future.result() or []
+                except Exception as e:
+                    print(f"❌ {name}: Error - {e}")
+                    continue
+                if adequate(result):
+                    print(f"✅ {name}: Found {len(result)} jobs")
+                    return name, result
+                if result:
+                    print(f"⚠️ {name}: Only {len(result)} jobs")
+                    if len(result) > len(best[1]):
+                        best = (name, result)
+                else:
+                    print(f"❌ {name}: No jobs found")
+
+            if queue and (hedged or time.monotonic() >= hedge_at):
+                hedged = True
+                while queue and len(running) < max_parallel:
+                    launch()
+            elif queue and not running:
+                # Everything started so far failed: no reason to wait
+                launch()
+                hedge_at = time.monotonic() + hedge_delay
+        return best
+    finally:
+        if running:
+            print(f"Cancelling {len(running)} slower sources")
+        executor.shutdown(wait=False, cancel_futures=True)
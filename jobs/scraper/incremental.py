@@ -0,0 +1,85 @@
+"""
+Incremental scraping: stop paginating once the crawl reaches jobs we hold.
+
+With results sorted by date, a recurring refresh of the same query only
+needs the pages above what the previous run saw. ``IncrementalCrawl`` is
+fed every card as it is parsed and says when to stop:
+
+* after ``stop_after_known`` consecutive cards whose fingerprint is already
+  stored (checked against the shared fingerprint index, no query), or
+* as soon as a card from the stored watermark appears: the fingerprints of
+  the newest cards of the previous run of this query (``ScrapeWatermark``),
+  everything below them was crawled last time.
+
+``finish()`` stores the head of this crawl as the next watermark. Purging
+a platform (or clearing all jobs) deletes its watermarks with the jobs.
+"""
+from typing import List
+
+from django.utils import timezone
+
+from .fingerprint_index import get_fingerprint_index
+from .utils import fingerprint, fingerprint_hash, normalize_text
+
+STOP_AFTER_KNOWN = 10
+# Cards remembered from the head of each crawl
+WATERMARK_SIZE = 20
+
+
+def query_key(role_name: str, location: str = "") -> str:
+    return f"{normalize_text(role_name)}|{normalize_text(location)}"[:255]
+
+
+class IncrementalCrawl:
+    def __init__(self, platform: str, role_name: str, location: str = "",
+                 stop_after_known: int = STOP_AFTER_KNOWN, use_watermark: bool = True):
+        from ..models import ScrapeWatermark
+
+        self.platform = platform
+        self.query = query_key(role_name, location)
+        self.stop_after_known = stop_after_known
+        self.index = get_fingerprint_index()
+        watermark = ScrapeWatermark.objects.filter(platform=platform, query=self.query).first()
+        # The watermark only means "older than this" when results are date-sorted
+        self.watermark = set(watermark.head_hashes) if watermark and use_watermark else set()
+        self.head: List[int] = []
+        self.seen = 0
+        self.new = 0
+        self.consecutive_known = 0
+        self.stop_reason = None
+
+    @property
+    def should_stop(self) -> bool:
+        return self.stop_reason is not None
+
+    def record(self, title: str, company: str, location: str) -> bool:
+        """Register one parsed card; returns True when pagination should stop."""
+        card_hash = fingerprint_hash(fingerprint(title or "N/A", company or "N/A", location or "N/A"))
+        self.seen += 1
+        if len(self.head) < WATERMARK_SIZE:
+            self.head.append(card_hash)
+
+        if card_hash in self.watermark:
+            self.stop_reason = "reached the previous run's newest jobs"
+        elif card_hash in self.index:
+            self.consecutive_known += 1
+            if self.consecutive_known >= self.stop_after_known:
+                self.stop_reason = f"{self.consecutive_known} known jobs in a row"
+        else:
+            self.consecutive_known = 0
+            self.new += 1
+        if self.stop_reason:
+            print(f"Incremental {self.platform} crawl stopping after {self.seen} cards: {self.stop_reason}")
+        return self.should_stop
+
+    def finish(self):
+        """Save the head of this crawl as the watermark for the next run."""
+        from ..models import ScrapeWatermark
+
+        if not self.head:
+            return
+        ScrapeWatermark.objects.update_or_create(
+            platform=self.platform,
+            query=self.query,
+            defaults={"head_hashes": self.head, "last_run_at": timezone.now(), "last_new_jobs": self.new},
+        )
@@ -5,17 +5,20 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time, random, urllib.parse
-from .driver import build_driver
+from .driver import get_driver_pool, randomize_window
+from .incremental import IncrementalCrawl
 
 
-def scrape_indeed_jobs(job_title, num_jobs=50, location="New York, NY", progress=None):
+def scrape_indeed_jobs(job_title, num_jobs=50, location="New York, NY", progress=None, incremental=False, deadline=None):
     """
     Scrape jobs from Indeed until num_jobs is reached.
     
-    job_title : str -> job keyword, e.g. "Data Scientist"
-    num_jobs  : int -> number of jobs to scrape in total
-    location  : str -> location string
-    progress  : ProgressTracker object for progress updates
+    job_title   : str  -> job keyword, e.g. "Data Scientist"
+    num_jobs    : int  -> number of jobs to scrape in total
+    location    : str  -> location string
+    progress    : ProgressTracker object for progress updates
+    incremental : bool -> sort by date and stop paging once known jobs are reached
+    deadline    : float -> time.time() after which no further pages are loaded
     """
 
     # Encode the query for URL - try different formats
@@ -29,51 +32,13 @@ def scrape_indeed_jobs(job_title, num_jobs=50, location="New York, NY", progress
         f"https://www.indeed.com/jobs?q={job_encoded}&l={location_encoded}&fromage=7",
         f"https://www.indeed.com/jobs?q={job_encoded}&l={location_encoded}&sort=relevance"
     ]
+    if incremental:
+        # Newest first, so everything after the known jobs is older
+        url_formats.insert(0, url_formats.pop(1))
+    crawl = None
     
     base_url = url_formats[0]  # Start with the first format
 
-    # Setup WebDriver with anti-detection measures
-    try:
-        from selenium import webdriver
-        from selenium.webdriver.chrome.options import Options
-        from selenium.webdriver.chrome.service import Service as ChromeService
-        from webdriver_manager.chrome import ChromeDriverManager
-        
-        # Create custom options for better anti-detection
-        chrome_options = Options()
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--disable-web-security")
-        chrome_options.add_argument("--allow-running-insecure-content")
-        chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-        chrome_options.add_argument("--window-size=1366,768")
-        # Try headless first, but have fallback
-        chrome_options.add_argument("--headless=new")
-        
-        # Anti-detection measures
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-        
-        # Randomize window size slightly
-        import random
-        width = 1366 + random.randint(-100, 100)
-        height = 768 + random.randint(-100, 100)
-        chrome_options.add_argument(f"--window-size={width},{height}")
-        
-        driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=chrome_options)
-        
-        # Execute script to remove webdriver property
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        
-        print("Chrome driver initialized successfully for Indeed with anti-detection")
-    except Exception as e:
-        print(f"Error initializing Chrome driver for Indeed: {e}")
-        return []
-
     # Storage lists
     titles, companies, locations, descriptions, urls = [], [], [], [], []
 
@@ -271,6 +236,9 @@ def scrape_indeed_jobs(job_title, num_jobs=50, location="New York, NY", progress
                 
                 urls.append(link_url)
                 
+                if crawl and crawl.record(title_text, company_text, location_text):
+                    return
+                
             except Exception as e:
                 print(f"Error processing job card: {e}")
                 # Add N/A values if there's an error
@@ -280,7 +248,19 @@ def scrape_indeed_jobs(job_title, num_jobs=50, location="New York, NY", progress
                 descriptions.append("N/A")
                 urls.append("N/A")
 
+    # Borrow a warm Chrome session (anti-detection options are set by the pool)
+    pool = get_driver_pool()
+    try:
+        driver = pool.checkout()
+    except Exception as e:
+        print(f"Error initializing Chrome driver for Indeed: {e}")
+        return []
+    # Everything after checkout runs under the finally that gives the session back
     try:
+        # Randomize window size slightly
+        randomize_window(driver)
+        print("Chrome driver ready for Indeed with anti-detection")
+
         # Try different URLs if blocked
         success = False
         for i, url in enumerate(url_formats):
@@ -308,6 +288,8 @@ def scrape_indeed_jobs(job_title, num_jobs=50, location="New York, NY", progress
             else:
                 print(f"✅ URL {i+1} loaded successfully!")
                 success = True
+                if incremental:
+                    crawl = IncrementalCrawl("indeed", job_title, location, use_watermark="sort=date" in url)
                 break
         
         if not success:
@@ -315,21 +297,11 @@ def scrape_indeed_jobs(job_title, num_jobs=50, location="New York, NY", progress
             
             # Try without headless mode as last resort
             try:
-                chrome_options = Options()
-                chrome_options.add_argument("--no-sandbox")
-                chrome_options.add_argument("--disable-dev-shm-usage")
-                chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-                chrome_options.add_argument("--disable-extensions")
-                chrome_options.add_argument("--disable-gpu")
-                chrome_options.add_argument("--window-size=1366,768")
-                chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-                chrome_options.add_experimental_option('useAutomationExtension', False)
-                chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-                
-                # Close headless driver and create new non-headless one
-                driver.quit()
-                driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=chrome_options)
-                driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+                # Return the headless session and borrow a visible one
+                pool.checkin(driver)
+                driver = None
+                pool = get_driver_pool(headless=False)
+                driver = pool.checkout()
                 
                 print("Trying with visible browser...")
                 driver.get(url_formats[0])
@@ -337,11 +309,12 @@ def scrape_indeed_jobs(job_title, num_jobs=50, location="New York, NY", progress
                 
                 if "blocked" in driver.title.lower():
                     print("Still blocked even with visible browser.")
-                    driver.quit()
                     return []
                 else:
                     print("✅ Visible browser worked!")
                     success = True
+                    if incremental:
+                        crawl = IncrementalCrawl("indeed", job_title, location, use_watermark="sort=date" in url_formats[0])
                     
             except Exception as e:
                 print(f"Non-headless attempt also failed: {e}")
@@ -354,9 +327,12 @@ def scrape_indeed_jobs(job_title, num_jobs=50, location="New York, NY", progress
         page = 1
 
         while len(titles) < num_jobs:
+            if deadline and time.time() >= deadline:
+                print(f"⏰ Deadline reached after {page - 1} pages")
+                break
             print(f"🔎 Scraping Indeed page {page}...")
             if progress:
-                progress.update("indeed", 20 + (len(titles) / num_jobs) * 60, 100, f"Scraping Indeed page {page}... Found {len(titles)} jobs")
+                progress.update("indeed", len(titles), num_jobs, f"Scraping Indeed page {page}... Found {len(titles)} jobs")
             
             # Human-like scrolling before scraping
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight/4);")
@@ -364,9 +340,13 @@ def scrape_indeed_jobs(job_title, num_jobs=50, location="New York, NY", progress
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
             time.sleep(random.uniform(1, 2))
             
+            found_before = len(titles)
             scrape_current_page()
+            if progress:
+                progress.add_pages()
+                progress.add_jobs(len(titles) - found_before)
 
-            if len(titles) >= num_jobs:
+            if len(titles) >= num_jobs or (crawl and crawl.should_stop):
                 break
 
             # Try clicking next with human-like behavior
@@ -411,6 +391,10 @@ def scrape_indeed_jobs(job_title, num_jobs=50, location="New York, NY", progress
                 "source_url": urls[i]
             })
 
+        if crawl:
+            crawl.finish()
+            print(f"Incremental crawl: {crawl.new} new of {crawl.seen} cards over {page} page(s)")
+
         print(f"✅ Indeed scraping completed. Found {len(jobs)} jobs")
         return jobs
 
@@ -420,10 +404,8 @@ def scrape_indeed_jobs(job_title, num_jobs=50, location="New York, NY", progress
         traceback.print_exc()
         return []
     finally:
-        try:
-            driver.quit()
-        except:
-            pass
+        if driver is not None:
+            pool.checkin(driver)
 
 
 def scrape_indeed(job_title, location="New York, NY", max_jobs=50):
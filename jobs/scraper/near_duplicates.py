@@ -0,0 +1,289 @@
+"""
+Near-duplicate job detection with MinHash signatures and LSH banding.
+
+Exact fingerprints miss the same posting listed as "Sr. Data Engineer" in
+"New York, NY" on one platform and "Senior Data Engineer" in "New York, NY
+10001" on another. Every job therefore gets two MinHash signatures, one
+over character 3-grams of its (abbreviation-expanded) title and one over
+word 3-shingles of its description. Each signature is cut into bands whose
+hashes, salted with the canonical company key, are stored in ``JobBand``;
+jobs sharing any band key are candidates, so a lookup touches only the
+matching buckets of the same company instead of every job with a common
+title.
+
+Candidates are confirmed when the canonical company key matches, the
+locations are known and compatible (one is a refinement of the other), the
+titles carry the same level words and numbers ("Engineer II" is not
+"Engineer III"), both postings have a real description and the estimated
+title and description similarities pass their thresholds. Postings from
+the same platform are separate listings and never merged.
+"""
+import hashlib
+import random
+import re
+from array import array
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .utils import company_key, normalize_text
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python fallback, same signatures
+    np = None
+
+# 10 bands of 6 rows: pairs above ~0.68 similarity usually share a band
+NUM_PERM = 60
+BANDS = 10
+ROWS = NUM_PERM // BANDS
+
+TITLE_THRESHOLD = 0.7
+DESCRIPTION_THRESHOLD = 0.5
+# Only the opening of long descriptions is compared, so a short snippet and
+# the full text of the same posting still overlap
+MAX_DESCRIPTION_WORDS = 80
+
+# Multiply-shift hash family: h_i(x) = ((a_i * x + b_i) mod 2**64) >> 32, a_i odd
+_MASK = (1 << 64) - 1
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [(_rng.getrandbits(64) | 1, _rng.getrandbits(64)) for _ in range(NUM_PERM)]
+if np is not None:
+    _A = np.array([a for a, _ in _PERMUTATIONS], dtype=np.uint64)[:, None]
+    _B = np.array([b for _, b in _PERMUTATIONS], dtype=np.uint64)[:, None]
+
+TITLE_ABBREVIATIONS = {
+    "sr": "senior",
+    "snr": "senior",
+    "jr": "junior",
+    "mgr": "manager",
+    "eng": "engineer",
+    "engr": "engineer",
+    "dev": "developer",
+    "sw": "software",
+    "assoc": "associate",
+    "asst": "assistant",
+    "admin": "administrator",
+    "sde": "software development engineer",
+    "swe": "software engineer",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "i": "1",
+    "ii": "2",
+    "iii": "3",
+    "iv": "4",
+}
+
+# Title words that tell otherwise similar postings apart; digits count too
+LEVEL_WORDS = {
+    "intern", "junior", "associate", "mid", "senior", "staff", "principal", "lead", "distinguished",
+    "chief", "head", "director", "vp", "manager", "fellow", "apprentice", "trainee", "entry",
+}
+
+# Descriptions that carry no posting-specific text
+_PLACEHOLDER_RE = re.compile(r"^(n/?a|view full job description for .* on \w+)$")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+class Signature(NamedTuple):
+    title: array
+    description: Optional[array]
+    company: str
+    location: str
+    levels: FrozenSet[str] = frozenset()
+
+    def band_keys(self) -> List[int]:
+        # Postings only match within a company, so its key is part of every bucket
+        company = self.company.encode("utf-8")
+        keys = _band_keys(self.title, b"t" + company)
+        if self.description is not None:
+            keys.extend(_band_keys(self.description, b"d" + company))
+        return keys
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(normalize_text(text))
+
+
+def _hash64(value: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), "big")
+
+
+def minhash(shingles: Iterable[str]) -> Optional[array]:
+    """MinHash signature (NUM_PERM 32-bit values) of a shingle set."""
+    hashes = {_hash64(s.encode("utf-8")) for s in shingles}
+    if not hashes:
+        return None
+    if np is not None:
+        values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))[None, :]
+        with np.errstate(over="ignore"):
+            mins = ((_A * values + _B) >> np.uint64(32)).min(axis=1)
+        return array("Q", mins.tolist())
+    return array("Q", (
+        min((((a * h + b) & _MASK) >> 32) for h in hashes) for a, b in _PERMUTATIONS
+    ))
+
+
+def _band_keys(signature: array, group: bytes) -> List[int]:
+    """One signed 64-bit key per band, distinct between bands and groups."""
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        # NUL ends the variable-length group, so it can't run into the band number
+        digest = hashlib.blake2b(group + b"\0" + bytes([band]) + rows, digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+
+
+def similarity(a: Optional[array], b: Optional[array]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    if a is None or b is None:
+        return 0.0
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def _title_words(title: str) -> List[str]:
+    return " ".join(TITLE_ABBREVIATIONS.get(w, w) for w in _words(title)).split()
+
+
+def title_levels(title: str) -> FrozenSet[str]:
+    """Level words and numbers of a title ("Sr. Engineer II" -> {"senior", "2"})."""
+    return frozenset(w for w in _title_words(title) if w in LEVEL_WORDS or w.isdigit())
+
+
+def title_shingles(title: str) -> Set[str]:
+    text = " ".join(_title_words(title))
+    if len(text) < 3:
+        return {text} if text else set()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def description_shingles(description: str) -> Set[str]:
+    text = normalize_text(description)
+    if not text or _PLACEHOLDER_RE.match(text):
+        return set()
+    words = _WORD_RE.findall(text)[:MAX_DESCRIPTION_WORDS]
+    if len(words) < 3:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + 3]) for i in range(len(words) - 2)}
+
+
+def compute_signature(title: str, company: str, location: str, description: str) -> Signature:
+    return Signature(
+        title=minhash(title_shingles(title)) or array("Q", [0] * NUM_PERM),
+        description=minhash(description_shingles(description)),
+        company=company_key(company),
+        location=normalize_text(location),
+        levels=title_levels(title),
+    )
+
+
+def locations_compatible(a: str, b: str) -> bool:
+    """True when one location refines the other ("New York, NY" / "New York, NY 10001")."""
+    words_a = {w for w in _words(a) if not w.isdigit()} - {"n", "a"}
+    words_b = {w for w in _words(b) if not w.isdigit()} - {"n", "a"}
+    # An unknown location is no evidence of the same posting
+    if not words_a or not words_b:
+        return False
+    return words_a <= words_b or words_b <= words_a
+
+
+def is_near_duplicate(a: Signature, b: Signature) -> bool:
+    if a.company != b.company or not locations_compatible(a.location, b.location):
+        return False
+    # "Engineer II" vs "Engineer III", "Engineer" vs "Senior Engineer": different jobs
+    if a.levels != b.levels:
+        return False
+    if similarity(a.title, b.title) < TITLE_THRESHOLD:
+        return False
+    # Without descriptions on both sides the title match alone decides too much
+    if a.description is None or b.description is None:
+        return False
+    return similarity(a.description, b.description) >= DESCRIPTION_THRESHOLD
+
+
+def signature_from_job(job) -> Signature:
+    """Rebuild the Signature stored for ``job`` (needs ``title``, ``signature`` and ``company`` loaded)."""
+    stored = job.signature
+    description = None
+    if stored.description_minhash is not None:
+        description = array("Q")
+        description.frombytes(bytes(stored.description_minhash))
+    title = array("Q")
+    title.frombytes(bytes(stored.title_minhash))
+    return Signature(title, description, company_key(job.company.name), normalize_text(job.location),
+                     title_levels(job.title))
+
+
+def match_near_duplicates(signatures: Dict[object, Signature], batch_size: int = 500,
+                          platform: Optional[str] = None) -> Tuple[Dict[object, object], Set[object]]:
+    """
+    Find stored jobs that are near duplicates of the incoming ``signatures``.
+
+    Returns ``(matches, batch_duplicates)``: ``matches`` maps an incoming key
+    to the stored Job it duplicates; ``batch_duplicates`` holds keys that
+    duplicate an earlier entry of the same batch. With ``platform`` (the one
+    the batch was scraped from) stored jobs already listed there are never
+    matched, and entries of the batch are never merged with each other.
+    """
+    from ..models import Job, JobBand
+
+    if not signatures:
+        return {}, set()
+
+    keys_by_item = {item: sig.band_keys() for item, sig in signatures.items()}
+    all_keys = list({key for keys in keys_by_item.values() for key in keys})
+
+    jobs_by_key: Dict[int, Set[int]] = {}
+    for start in range(0, len(all_keys), batch_size):
+        chunk = all_keys[start:start + batch_size]
+        for key, job_id in JobBand.objects.filter(key__in=chunk).values_list("key", "job_id"):
+            jobs_by_key.setdefault(key, set()).add(job_id)
+
+    candidate_ids = list({job_id for ids in jobs_by_key.values() for job_id in ids})
+    candidates = {}
+    for start in range(0, len(candidate_ids), batch_size):
+        chunk = candidate_ids[start:start + batch_size]
+        for job in Job.objects.filter(id__in=chunk, signature__isnull=False).select_related("signature", "company").only(
+            "id", "title", "location", "sources", "scraped_at", "source_url", "fingerprint_hash",
+            "company__name", "signature__title_minhash", "signature__description_minhash",
+        ):
+            candidates[job.id] = (job, signature_from_job(job))
+
+    matches = {}
+    batch_duplicates = set()
+    accepted: Dict[int, List[object]] = {}
+    for item, sig in signatures.items():
+        ids = {job_id for key in keys_by_item[item] for job_id in jobs_by_key.get(key, ())}
+        for job_id in sorted(ids):
+            job, candidate = candidates.get(job_id, (None, None))
+            if job is None or (platform and platform in job.sources):
+                continue
+            if is_near_duplicate(sig, candidate):
+                matches[item] = job
+                break
+        else:
+            if platform:
+                continue
+            earlier = {other for key in keys_by_item[item] for other in accepted.get(key, ())}
+            if any(is_near_duplicate(sig, signatures[other]) for other in earlier):
+                batch_duplicates.add(item)
+                continue
+            for key in keys_by_item[item]:
+                accepted.setdefault(key, []).append(item)
+    return matches, batch_duplicates
+
+
+def store_signatures(jobs_and_signatures: Iterable[Tuple[object, Signature]], batch_size: int = 500):
+    """Persist signatures and band keys of newly inserted jobs."""
+    from ..models import JobBand, JobSignature
+
+    signature_rows = []
+    band_rows = []
+    for job, sig in jobs_and_signatures:
+        signature_rows.append(JobSignature(
+            job=job,
+            title_minhash=sig.title.tobytes(),
+            description_minhash=sig.description.tobytes() if sig.description is not None else None,
+        ))
+        band_rows.extend(JobBand(job=job, key=key) for key in sig.band_keys())
+    JobSignature.objects.bulk_create(signature_rows, batch_size=batch_size, ignore_conflicts=True)
+    JobBand.objects.bulk_create(band_rows, batch_size=batch_size)
@@ -1,22 +1,38 @@
 import time
-from typing import List, Dict
-from django.db import transaction
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed
+from typing import List, Dict, Optional
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from .companies import bump_company_generation, get_company_resolver
 from .driver import build_driver
 from .glassdoor import scrape_glassdoor
-from .utils import fingerprint, normalize_text
-from ..models import Job, Company
+from .fingerprint_index import get_fingerprint_index
+from .near_duplicates import compute_signature, match_near_duplicates, store_signatures
+from .utils import fingerprint, fingerprint_hash, normalize_text
+from ..models import Job, Company, CompanyAlias, Description, JobBand, JobSignature, JobSource, ScrapeWatermark
+from ..stats import apply_deltas, job_deltas, subtract_jobs
 
 
-def run_scrape_pipeline(platform: str, role_name: str, limit: int, location: str = "New York, NY", progress=None) -> int:
+# Platforms scraped by platform="all"
+ALL_PLATFORMS = ("indeed", "glassdoor")
+# Seconds an all-platforms scrape may take; scrapers stop paging after it
+ALL_PLATFORMS_DEADLINE = 15 * 60
+# Extra seconds to wait for a scraper to notice the deadline and return
+DEADLINE_GRACE = 60
+
+
+def run_scrape_pipeline(platform: str, role_name: str, limit: int, location: str = "New York, NY", progress=None,
+                        incremental: bool = False) -> int:
     """
     Main pipeline function to scrape jobs from the specified platform.
     
     Args:
-        platform: The platform to scrape from (glassdoor, indeed, linkedin)
+        platform: The platform to scrape from (glassdoor, indeed, linkedin, or all)
         role_name: The job role to search for
         limit: Maximum number of jobs to scrape
         location: Location to search in (for Indeed)
         progress: Progress tracker object
+        incremental: Date-sorted crawl that stops once it reaches known jobs
         
     Returns:
         Number of jobs added/updated
@@ -26,15 +42,18 @@ def run_scrape_pipeline(platform: str, role_name: str, limit: int, location: str
     
     try:
         if progress:
+            progress.set_target(limit)
             progress.update("scraping", 10, 100, f"Starting {platform} scraper for '{role_name}'...")
         
-        if platform == "glassdoor":
+        if platform == "all":
+            return scrape_all_platforms(role_name, limit, location, progress, incremental)
+        elif platform == "glassdoor":
             print(f"Calling Glassdoor Selenium scraper for '{role_name}'...")
-            scraped_jobs = scrape_glassdoor_from_role(role_name, limit, progress)
+            scraped_jobs = scrape_glassdoor_from_role(role_name, limit, progress, incremental)
             print(f"Glassdoor scraper returned {len(scraped_jobs)} jobs")
         elif platform == "indeed":
             print(f"Calling Indeed scraper for '{role_name}' in '{location}'...")
-            scraped_jobs = scrape_indeed_from_role(role_name, location, limit, progress)
+            scraped_jobs = scrape_indeed_from_role(role_name, location, limit, progress, incremental)
             print(f"Indeed scraper returned {len(scraped_jobs)} jobs")
         elif platform == "linkedin":
             scraped_jobs = scrape_linkedin_from_url(role_name, limit)
@@ -50,10 +69,8 @@ def run_scrape_pipeline(platform: str, role_name: str, limit: int, location: str
             print(f"Saved {saved_count} new jobs to database")
         else:
             saved_count = 0
-            
-        if progress:
-            progress.update("complete", 100, 100, f"Scraping complete. {saved_count} jobs available.")
-        
+
+        # The caller marks the operation completed (one terminal stage)
         return saved_count
         
     except Exception as e:
@@ -65,7 +82,66 @@ def run_scrape_pipeline(platform: str, role_name: str, limit: int, location: str
         return 0
 
 
-def scrape_glassdoor_from_role(role_name: str, limit: int, progress=None) -> List[Dict]:
+def scrape_all_platforms(role_name: str, limit: int, location: str = "New York, NY", progress=None,
+                         incremental: bool = False, deadline_seconds: Optional[float] = None) -> int:
+    """
+    Scrape every platform in ALL_PLATFORMS at once, up to ``limit`` jobs each.
+
+    Each platform runs in its own thread (and browser) against a shared
+    deadline, so the wall time is that of the slowest platform rather than
+    the sum. Results are deduplicated and saved as each platform finishes;
+    its progress reports roll up into ``progress``.
+
+    Returns:
+        Number of jobs added/updated
+    """
+    deadline_seconds = deadline_seconds or getattr(settings, "ALL_PLATFORMS_DEADLINE", ALL_PLATFORMS_DEADLINE)
+    deadline = time.time() + deadline_seconds
+    scrapers = {
+        "indeed": lambda platform_progress: scrape_indeed_from_role(
+            role_name, location, limit, platform_progress, incremental, deadline),
+        "glassdoor": lambda platform_progress: scrape_glassdoor_from_role(
+            role_name, limit, platform_progress, incremental, deadline),
+    }
+    if progress:
+        progress.set_target(limit * len(ALL_PLATFORMS))
+
+    def run(platform):
+        try:
+            return scrapers[platform](progress.for_platform(platform) if progress else None)
+        finally:
+            # Each thread has its own database connection
+            connection.close()
+
+    executor = ThreadPoolExecutor(max_workers=len(ALL_PLATFORMS), thread_name_prefix="scrape")
+    futures = {executor.submit(run, platform): platform for platform in ALL_PLATFORMS}
+    saved_count = 0
+    try:
+        for future in as_completed(futures, timeout=deadline_seconds + DEADLINE_GRACE):
+            platform = futures[future]
+            try:
+                jobs = future.result()
+            except Exception as e:
+                print(f"{platform} scraper failed: {e}")
+                if progress:
+                    progress.finish_platform(platform, error=f"failed: {e}")
+                continue
+            print(f"{platform} scraper returned {len(jobs)} jobs")
+            if progress:
+                progress.finish_platform(platform, len(jobs))
+            # One save stage, fed as platforms finish; cross-platform duplicates merge here
+            if jobs:
+                saved_count += save_jobs_to_database(jobs, platform)
+    except FuturesTimeout:
+        late = [platform for future, platform in futures.items() if not future.done()]
+        print(f"Deadline passed; not waiting for {', '.join(late)}")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return saved_count
+
+
+def scrape_glassdoor_from_role(role_name: str, limit: int, progress=None, incremental: bool = False,
+                               deadline: Optional[float] = None) -> List[Dict]:
     """
     Scrape jobs from Glassdoor using the role name.
     """
@@ -73,14 +149,15 @@ def scrape_glassdoor_from_role(role_name: str, limit: int, progress=None) -> Lis
     
     print(f"Scraping Glassdoor for '{role_name}' jobs")
     
+    # The platform's stage counts jobs found out of limit, like the scraper's own updates
     if progress:
-        progress.update("glassdoor", 20, 100, f"Scraping Glassdoor for '{role_name}'...")
+        progress.update("glassdoor", 0, limit, f"Scraping Glassdoor for '{role_name}'...")
     
     # Call the Selenium-based Glassdoor scraper
-    jobs = scrape_glassdoor_jobs(role_name, limit, progress=progress)
+    jobs = scrape_glassdoor_jobs(role_name, limit, progress=progress, incremental=incremental, deadline=deadline)
     
     if progress:
-        progress.update("glassdoor", 60, 100, f"Found {len(jobs)} jobs from Glassdoor")
+        progress.update("glassdoor", min(len(jobs), limit), limit, f"Found {len(jobs)} jobs from Glassdoor")
     
     # Convert to the expected format
     formatted_jobs = []
@@ -132,7 +209,8 @@ def scrape_glassdoor_from_url(filtered_url: str, limit: int) -> List[Dict]:
     return formatted_jobs
 
 
-def scrape_indeed_from_role(role_name: str, location: str, limit: int, progress=None) -> List[Dict]:
+def scrape_indeed_from_role(role_name: str, location: str, limit: int, progress=None, incremental: bool = False,
+                            deadline: Optional[float] = None) -> List[Dict]:
     """
     Scrape jobs from Indeed using the role name and location.
     """
@@ -140,15 +218,17 @@ def scrape_indeed_from_role(role_name: str, location: str, limit: int, progress=
     
     print(f"Scraping Indeed for '{role_name}' jobs in '{location}'")
     
+    # The platform's stage counts jobs found out of limit, like the scraper's own updates
     if progress:
-        progress.update("indeed", 20, 100, f"Scraping Indeed for '{role_name}' in '{location}'...")
+        progress.update("indeed", 0, limit, f"Scraping Indeed for '{role_name}' in '{location}'...")
     
     # Call the Indeed scraper
-    jobs = scrape_indeed_jobs(role_name, limit, location, progress=progress)
+    jobs = scrape_indeed_jobs(role_name, limit, location, progress=progress, incremental=incremental,
+                              deadline=deadline)
     print(f"Indeed scraper returned {len(jobs)} jobs")
     
     if progress:
-        progress.update("indeed", 60, 100, f"Found {len(jobs)} jobs from Indeed")
+        progress.update("indeed", min(len(jobs), limit), limit, f"Found {len(jobs)} jobs from Indeed")
     
     # Convert to the expected format
     formatted_jobs = []
@@ -245,58 +325,194 @@ def scrape_linkedin_from_url(filtered_url: str, limit: int) -> List[Dict]:
     return []
 
 
+# Rows per INSERT/UPDATE statement and per fingerprint IN (...) lookup
+BULK_BATCH_SIZE = 500
+
+
+def _chunked(items: List, size: int):
+    """Yield successive slices of ``items`` with at most ``size`` elements."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
 @transaction.atomic
-def save_jobs_to_database(jobs: List[Dict], platform: str) -> int:
+def purge_platform_jobs(platform: str, progress=None) -> Dict[str, float]:
+    """
+    Delete every job listed on ``platform`` with a few set-based statements.
+
+    Rows are removed with plain DELETE ... WHERE id IN (subquery) statements
+    instead of Django's per-object cascade collector, and companies left
+    without jobs are dropped in bulk afterwards.
+    """
+    started = time.time()
+    if progress:
+        progress.update("purging", 0, 100, f"Clearing previous {platform} jobs...")
+
+    job_ids = JobSource.objects.filter(platform=platform).values("job_id")
+    company_ids = list(
+        Job.objects.filter(id__in=job_ids).values_list("company_id", flat=True).distinct()
+    )
+    description_hashes = list(
+        Job.objects.filter(id__in=job_ids).values_list("description_blob_id", flat=True).distinct()
+    )
+
+    subtract_jobs(Job.objects.filter(id__in=job_ids))
+
+    # FK checks are deferred until commit, so the jobs can go before their links
+    jobs_deleted = Job.objects.filter(id__in=job_ids)._raw_delete(Job.objects.db)
+    JobSignature.objects.filter(job_id__in=job_ids)._raw_delete(JobSignature.objects.db)
+    JobBand.objects.filter(job_id__in=job_ids)._raw_delete(JobBand.objects.db)
+    # Last, since job_ids is itself a subquery over JobSource
+    sources_deleted = JobSource.objects.filter(job_id__in=job_ids)._raw_delete(JobSource.objects.db)
+    Description.objects.delete_unused(description_hashes)
+    # Watermark heads point at the jobs just deleted; the next incremental
+    # run would stop at them and re-scrape almost nothing
+    ScrapeWatermark.objects.filter(platform=platform).delete()
+
+    companies_deleted = 0
+    for chunk in _chunked(company_ids, BULK_BATCH_SIZE):
+        # Companies still referenced by archived jobs stay
+        CompanyAlias.objects.filter(
+            company_id__in=chunk, company__jobs__isnull=True, company__archived_jobs__isnull=True
+        )._raw_delete(CompanyAlias.objects.db)
+        companies_deleted += Company.objects.filter(
+            id__in=chunk, jobs__isnull=True, archived_jobs__isnull=True
+        )._raw_delete(Company.objects.db)
+
+    # The fingerprint index keeps the purged hashes: a stale "known" only
+    # costs a lookup in _existing_jobs, far less than rescanning every job
+    # Other processes' resolvers may hold ids of the deleted companies
+    bump_company_generation()
+
+    elapsed = time.time() - started
+    stats = {
+        "jobs": jobs_deleted,
+        "sources": sources_deleted,
+        "companies": companies_deleted,
+        "seconds": elapsed,
+    }
+    print(f"Purged {platform}: {jobs_deleted} jobs, {sources_deleted} source links, "
+          f"{companies_deleted} companies in {elapsed:.2f}s")
+    if progress:
+        progress.update("purging", 100, 100,
+                        f"Cleared {jobs_deleted} previous {platform} jobs and "
+                        f"{companies_deleted} companies in {elapsed:.2f}s")
+    return stats
+
+
+def _source_link(job: Job, platform: str, source_url: str) -> JobSource:
+    """Build the JobSource row recording that ``platform`` lists ``job``."""
+    return JobSource(job=job, platform=platform, source_url=source_url or "", scraped_at=job.scraped_at)
+
+
+def _existing_jobs(hashes: List[int], batch_size: int = BULK_BATCH_SIZE) -> Dict[int, Job]:
+    """Map fingerprint hashes to the stored jobs carrying them."""
+    existing = {}
+    for chunk in _chunked(hashes, batch_size):
+        for job in Job.objects.filter(fingerprint_hash__in=chunk).only(
+            "id", "fingerprint_hash", "company_id", "sources", "scraped_at", "source_url"
+        ):
+            existing.setdefault(job.fingerprint_hash, job)
+    return existing
+
+
+@transaction.atomic
+def save_jobs_to_database(jobs: List[Dict], platform: str, batch_size: int = BULK_BATCH_SIZE) -> int:
     """
     Save scraped jobs to the database with deduplication.
+
+    Jobs whose fingerprint hash is not in the shared fingerprint index are
+    new and go straight to bulk_create; only the ones the index knows are
+    looked up (one IN query) to merge their sources with bulk_update.
+    New jobs that are near duplicates of a stored job (MinHash/LSH, e.g. the
+    same posting from another platform) are merged into it instead.
+    Companies are resolved through their canonical name key, mostly from
+    the resolver's in-memory cache.
     """
     print(f"Attempting to save {len(jobs)} jobs to database")
-    added_count = 0
-    
+
+    # Dedupe the incoming batch on the fingerprint hash
+    pending = {}
     for i, job_data in enumerate(jobs):
         try:
-            print(f"Processing job {i+1}: {job_data.get('title', 'N/A')} at {job_data.get('company', 'N/A')}")
-            
-            # Create fingerprint for deduplication
             fp = fingerprint(job_data["title"], job_data["company"], job_data["location"])
-            print(f"Fingerprint: {fp}")
-            
-            # Get or create company
-            company, created = Company.objects.get_or_create(
-                name=job_data["company"],
-                defaults={"website": None, "email": None}
-            )
-            print(f"Company: {company.name} (created: {created})")
-            
-            # Check if job already exists
-            existing_job = Job.objects.filter(fingerprint=fp, company=company).first()
-            
+        except Exception as e:
+            print(f"Error saving job {i+1}: {e}")
+            continue
+        pending.setdefault(fingerprint_hash(fp), (fp, job_data))
+
+    if not pending:
+        return 0
+
+    index = get_fingerprint_index()
+    company_ids = get_company_resolver().resolve_many({job_data["company"] for _, job_data in pending.values()})
+
+    def plan(existing):
+        # Doesn't touch the jobs it plans to update, so it can run again on a retry
+        new_jobs, merges = [], {}
+        for fp_hash, (fp, job_data) in pending.items():
+            if fp_hash in batch_duplicates:
+                continue
+            existing_job = existing.get(fp_hash) or near_matches.get(fp_hash)
             if existing_job:
-                print(f"Job already exists, updating sources")
                 # Update sources if not already present
                 if platform not in existing_job.sources:
-                    existing_job.sources.append(platform)
-                    existing_job.save()
+                    merges.setdefault(existing_job.id, (existing_job, job_data["source_url"]))
             else:
-                print(f"Creating new job")
-                # Create new job
-                Job.objects.create(
+                new_jobs.append(Job(
                     title=job_data["title"],
                     location=job_data["location"],
-                    company=company,
+                    company_id=company_ids[job_data["company"]],
                     description=job_data["description"],
                     source_url=job_data["source_url"],
                     sources=[platform],
-                    fingerprint=fp
-                )
-                added_count += 1
-                print(f"Job created successfully")
-                
-        except Exception as e:
-            print(f"Error saving job {i+1}: {e}")
-            import traceback
-            traceback.print_exc()
-            continue
-    
-    print(f"Successfully saved {added_count} new jobs")
+                    fingerprint=fp,
+                    fingerprint_hash=fp_hash
+                ))
+        return new_jobs, list(merges.values())
+
+    existing = _existing_jobs(list(index.known(pending)), batch_size)
+    signatures = {
+        fp_hash: compute_signature(job_data["title"], job_data["company"], job_data["location"], job_data["description"])
+        for fp_hash, (fp, job_data) in pending.items()
+        if fp_hash not in existing
+    }
+    near_matches, batch_duplicates = match_near_duplicates(signatures, batch_size, platform)
+    if near_matches or batch_duplicates:
+        print(f"Merging {len(near_matches) + len(batch_duplicates)} near-duplicate jobs")
+
+    new_jobs, merges = plan(existing)
+    # Descriptions first: the full-text trigger reads them on insert
+    Description.objects.store({job.description for job in new_jobs}, batch_size)
+    try:
+        with transaction.atomic():
+            Job.objects.bulk_create(new_jobs, batch_size=batch_size)
+    except IntegrityError:
+        # Another process inserted some of these after our index snapshot
+        print("Fingerprint index was stale, falling back to a database lookup")
+        new_jobs, merges = plan(_existing_jobs(list(pending), batch_size))
+        Job.objects.bulk_create(new_jobs, batch_size=batch_size)
+
+    updated_jobs, links = [], []
+    for existing_job, source_url in merges:
+        existing_job.sources.append(platform)
+        updated_jobs.append(existing_job)
+        links.append(_source_link(existing_job, platform, source_url))
+    if updated_jobs:
+        Job.objects.bulk_update(updated_jobs, ["sources"], batch_size=batch_size)
+
+    links.extend(_source_link(job, platform, job.source_url) for job in new_jobs)
+    store_signatures(((job, signatures[job.fingerprint_hash]) for job in new_jobs), batch_size)
+    JobSource.objects.bulk_create(links, batch_size=batch_size, ignore_conflicts=True)
+
+    # Dashboard counters, in this same transaction
+    deltas = job_deltas(new_jobs, platform)
+    deltas["platform", platform] += len(updated_jobs)
+    apply_deltas(deltas)
+
+    new_hashes = [job.fingerprint_hash for job in new_jobs]
+    transaction.on_commit(lambda: index.add_many(new_hashes))
+
+    added_count = len(new_jobs)
+    print(f"Successfully saved {added_count} new jobs ({len(updated_jobs)} existing jobs updated)")
     return added_count
@@ -1,18 +1,410 @@
+"""
+Progress of scraping operations, polled by the dashboard.
+
+Updates go to a pluggable store chosen with ``settings.PROGRESS_BACKEND``:
+
+* ``"memory"``: a dict behind a lock, for a single web process (default)
+* ``"cache"``: the Django cache, shared by every node using that cache
+* ``"sqlite"``: a table in its own SQLite file (``PROGRESS_SQLITE_PATH``),
+  outside the main database so updates made inside a scrape's transaction
+  are visible to pollers straight away
+
+Entries expire ``PROGRESS_TTL`` seconds after their last update. A tracker
+coalesces rapid updates within one stage: at most one write per
+``PROGRESS_FLUSH_INTERVAL`` seconds, while stage changes always go out.
+
+Finished operations are removed by ``ProgressReaper``, one thread per
+process holding a heap of deadlines (``ProgressTracker.cleanup(delay=...)``).
+It starts with the first tracker of the process and first sweeps what
+earlier processes left behind: expired entries and the
+``progress_<id>.json`` files older versions wrote.
+
+Scrapers also report what they fetched (``add_jobs``, ``add_pages``). Every
+update then carries ``metrics``: per-stage start/end times, jobs and pages
+per second over the last ``RATE_WINDOW`` seconds, time to first job and an
+ETA towards ``set_target``. Completion stores them as a ``ScrapeRun``.
+
+An all-platforms scrape hands each platform ``tracker.for_platform(name)``;
+their updates roll up into the one operation (mean percentage, one line per
+platform) and ``metrics["platforms"]`` keeps each platform's state.
+"""
+import glob
+import heapq
 import json
 import os
+import sqlite3
+import threading
 import time
-from typing import Dict, Any
+from collections import deque
+from datetime import datetime, timezone as dt_timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+from django.conf import settings
+
+PROGRESS_TTL = 3600
+PROGRESS_FLUSH_INTERVAL = 0.5
+# Seconds a finished operation's progress stays readable
+PROGRESS_RETAIN_SECONDS = 10
+# Seconds between the reaper's sweeps of expired entries
+PURGE_INTERVAL = 60
+# Seconds of history behind the jobs/pages per second moving averages
+RATE_WINDOW = 30
+
+
+class MemoryProgressBackend:
+    """Progress entries in a process-local dict."""
+
+    def __init__(self):
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def set(self, operation_id: str, data: Dict[str, Any], ttl: float):
+        with self._lock:
+            self._entries[operation_id] = (time.time() + ttl, data)
+
+    def get(self, operation_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(operation_id)
+        if entry is None or entry[0] <= time.time():
+            return None
+        return entry[1]
+
+    def delete(self, operation_id: str):
+        with self._lock:
+            self._entries.pop(operation_id, None)
+
+    def purge_expired(self):
+        now = time.time()
+        with self._lock:
+            self._entries = {key: entry for key, entry in self._entries.items() if entry[0] > now}
+
+
+class CacheProgressBackend:
+    """Progress entries in the Django cache (``PROGRESS_CACHE_ALIAS``)."""
+
+    KEY_PREFIX = "jobs:progress:"
+
+    def __init__(self, alias: str = "default"):
+        from django.core.cache import caches
+
+        self.cache = caches[alias]
+
+    def set(self, operation_id: str, data: Dict[str, Any], ttl: float):
+        self.cache.set(self.KEY_PREFIX + operation_id, data, timeout=ttl)
+
+    def get(self, operation_id: str) -> Optional[Dict[str, Any]]:
+        return self.cache.get(self.KEY_PREFIX + operation_id)
+
+    def delete(self, operation_id: str):
+        self.cache.delete(self.KEY_PREFIX + operation_id)
+
+    def purge_expired(self):
+        """The cache drops expired keys itself."""
+
+
+class SQLiteProgressBackend:
+    """Progress entries in a small SQLite table, one connection per thread."""
+
+    CREATE_SQL = (
+        "CREATE TABLE IF NOT EXISTS progress "
+        "(operation_id TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)"
+    )
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.execute(self.CREATE_SQL)
+            self._local.conn = conn
+        return conn
+
+    def set(self, operation_id: str, data: Dict[str, Any], ttl: float):
+        self._connection().execute(
+            "INSERT INTO progress (operation_id, data, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (operation_id) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at",
+            (operation_id, json.dumps(data), time.time() + ttl),
+        )
+
+    def get(self, operation_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            "SELECT data FROM progress WHERE operation_id = ? AND expires_at > ?", (operation_id, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete(self, operation_id: str):
+        self._connection().execute("DELETE FROM progress WHERE operation_id = ?", (operation_id,))
+
+    def purge_expired(self):
+        self._connection().execute("DELETE FROM progress WHERE expires_at <= ?", (time.time(),))
+
+
+BACKENDS = {
+    "memory": lambda: MemoryProgressBackend(),
+    "cache": lambda: CacheProgressBackend(getattr(settings, "PROGRESS_CACHE_ALIAS", "default")),
+    "sqlite": lambda: SQLiteProgressBackend(getattr(settings, "PROGRESS_SQLITE_PATH", "progress.sqlite3")),
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_progress_backend():
+    """Process-wide backend selected by ``settings.PROGRESS_BACKEND``."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = getattr(settings, "PROGRESS_BACKEND", "memory")
+                if name not in BACKENDS:
+                    raise ValueError(f"Unknown PROGRESS_BACKEND {name!r}; choose from {', '.join(BACKENDS)}")
+                _backend = BACKENDS[name]()
+    return _backend
+
+
+class ProgressReaper:
+    """Deletes progress entries at their deadlines from a single daemon thread."""
+
+    def __init__(self, backend, purge_interval: float = PURGE_INTERVAL):
+        self.backend = backend
+        self.purge_interval = purge_interval
+        self._deadlines: List[Tuple[float, str]] = []
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._next_sweep = 0.0
+
+    def start(self):
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="progress-reaper", daemon=True)
+                self._thread.start()
+
+    def schedule(self, operation_id: str, delay: float):
+        """Delete the entry of ``operation_id`` in ``delay`` seconds."""
+        self.start()
+        with self._condition:
+            heapq.heappush(self._deadlines, (time.time() + delay, operation_id))
+            self._condition.notify()
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._deadlines)
+
+    def sweep(self):
+        """Drop expired entries."""
+        self._next_sweep = time.time() + self.purge_interval
+        try:
+            self.backend.purge_expired()
+        except Exception as e:
+            print(f"Error purging expired progress: {e}")
+
+    @staticmethod
+    def remove_legacy_files():
+        """Delete progress_<id>.json files written before progress moved to a backend."""
+        # Only the project directory: the working directory may be anything
+        for path in glob.glob(os.path.join(str(settings.BASE_DIR), "progress_*.json")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _due(self) -> List[str]:
+        """Wait until deadlines pass or a sweep is due; returns the expired operation ids."""
+        with self._condition:
+            while True:
+                now = time.time()
+                if self._deadlines and self._deadlines[0][0] <= now:
+                    due = []
+                    while self._deadlines and self._deadlines[0][0] <= now:
+                        due.append(heapq.heappop(self._deadlines)[1])
+                    return due
+                if now >= self._next_sweep:
+                    return []
+                wake = min(self._deadlines[0][0], self._next_sweep) if self._deadlines else self._next_sweep
+                self._condition.wait(wake - now)
+
+    def _run(self):
+        self.remove_legacy_files()
+        self.sweep()
+        while True:
+            due = self._due()
+            if time.time() >= self._next_sweep:
+                self.sweep()
+            for operation_id in due:
+                try:
+                    self.backend.delete(operation_id)
+                except Exception as e:
+                    print(f"Error cleaning up progress: {e}")
+
+
+_reaper: Optional[ProgressReaper] = None
+
+
+def get_progress_reaper() -> ProgressReaper:
+    """Process-wide reaper for the configured backend, started on first use."""
+    global _reaper
+    if _reaper is None:
+        backend = get_progress_backend()
+        with _backend_lock:
+            if _reaper is None:
+                _reaper = ProgressReaper(backend)
+                _reaper.start()
+    return _reaper
+
+
+def _ttl() -> float:
+    return getattr(settings, "PROGRESS_TTL", PROGRESS_TTL)
+
+
+class RateMeter:
+    """Count with its per-second rate over the last ``window`` seconds."""
+
+    def __init__(self, start: float, window: float = RATE_WINDOW):
+        self.window = window
+        self.count = 0
+        self._samples = deque([(start, 0)])
+
+    def add(self, n: int, now: float):
+        self.count += n
+        self._samples.append((now, self.count))
+        # Keep one sample at or before the window edge as the baseline
+        while len(self._samples) > 2 and self._samples[1][0] <= now - self.window:
+            self._samples.popleft()
+
+    def rate(self, now: float) -> float:
+        edge = now - self.window
+        samples = self._samples
+        i = 0
+        while i + 1 < len(samples) and samples[i + 1][0] <= edge:
+            i += 1
+        since, base = samples[i]
+        if since < edge:
+            # Count at the window edge: interpolated, or flat since the last sample
+            if i + 1 < len(samples):
+                (t1, c1) = samples[i + 1]
+                base += (c1 - base) * (edge - since) / (t1 - since)
+            since = edge
+        return (self.count - base) / (now - since) if now > since else 0.0
+
 
 class ProgressTracker:
     """Simple progress tracker for scraping operations"""
-    
-    def __init__(self, operation_id: str):
+
+    def __init__(self, operation_id: str, flush_interval: float = PROGRESS_FLUSH_INTERVAL,
+                 platform: str = "", query: str = ""):
         self.operation_id = operation_id
-        self.progress_file = f"progress_{operation_id}.json"
         self.start_time = time.time()
-        
+        self.flush_interval = flush_interval
+        self.platform = platform
+        self.query = query
+        self.backend = get_progress_backend()
+        get_progress_reaper()
+        self._last_stage = None
+        self._last_write = 0.0
+        self._pending: Optional[Dict[str, Any]] = None
+        # Platform scrapers of one operation may report from several threads
+        self._lock = threading.RLock()
+        self.platforms: Dict[str, Dict[str, Any]] = {}
+        # Metrics
+        self.target_jobs: Optional[int] = None
+        self.jobs = RateMeter(self.start_time)
+        self.pages = RateMeter(self.start_time)
+        self.first_job_at: Optional[float] = None
+        self.stages: List[Dict[str, Any]] = []
+        self.failed = False
+        self.error_message = ""
+
+    def set_target(self, jobs: int):
+        """Number of jobs the operation expects to fetch (for the ETA)"""
+        self.target_jobs = jobs
+
+    def add_jobs(self, n: int = 1):
+        """Record ``n`` fetched jobs"""
+        with self._lock:
+            now = time.time()
+            if n > 0 and self.first_job_at is None:
+                self.first_job_at = now
+            self.jobs.add(n, now)
+
+    def add_pages(self, n: int = 1):
+        """Record ``n`` fetched result pages"""
+        with self._lock:
+            self.pages.add(n, time.time())
+
+    def for_platform(self, platform: str) -> "PlatformProgress":
+        """Tracker for one platform of a multi-platform operation"""
+        return PlatformProgress(self, platform)
+
+    def update_platform(self, platform: str, stage: str, current: int, total: int, message: str = ""):
+        """Record one platform's progress and publish the rolled-up state"""
+        with self._lock:
+            elapsed = round(time.time() - self.start_time, 3)
+            state = self.platforms.setdefault(platform, {"started": elapsed, "ended": None, "jobs": 0})
+            state.update({
+                "stage": stage,
+                "percentage": int((current / total) * 100) if total > 0 else 0,
+                "message": message,
+            })
+            self._publish_platforms()
+
+    def finish_platform(self, platform: str, jobs: int = 0, error: str = ""):
+        """Mark one platform of a multi-platform operation as done"""
+        with self._lock:
+            elapsed = round(time.time() - self.start_time, 3)
+            state = self.platforms.setdefault(platform, {"started": elapsed, "message": ""})
+            state.update({"ended": elapsed, "jobs": jobs, "stage": "error" if error else "done",
+                          "percentage": 100})
+            if error:
+                state["message"] = error
+            self._publish_platforms()
+
+    def _publish_platforms(self):
+        percentages = [state["percentage"] for state in self.platforms.values()]
+        summary = "; ".join(f"{name}: {state['message']}" for name, state in self.platforms.items())
+        self.update("scraping", sum(percentages), 100 * len(percentages), summary)
+
+    def _enter_stage(self, stage: str, now: float):
+        if self.stages and self.stages[-1]["stage"] == stage:
+            return
+        elapsed = round(now - self.start_time, 3)
+        if self.stages:
+            self.stages[-1]["ended"] = elapsed
+        self.stages.append({"stage": stage, "started": elapsed, "ended": None})
+
+    def metrics(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Counters, moving-average rates, stage timings and ETA at ``now``"""
+        now = now or time.time()
+        jobs_rate = self.jobs.rate(now)
+        eta = None
+        if self.target_jobs and jobs_rate > 0:
+            eta = round(max(0, self.target_jobs - self.jobs.count) / jobs_rate, 1)
+        return {
+            "jobs": self.jobs.count,
+            "pages": self.pages.count,
+            "target_jobs": self.target_jobs,
+            "jobs_per_second": round(jobs_rate, 3),
+            "pages_per_second": round(self.pages.rate(now), 3),
+            "time_to_first_job": (
+                round(self.first_job_at - self.start_time, 3) if self.first_job_at is not None else None
+            ),
+            "eta_seconds": eta,
+            "stages": [dict(stage) for stage in self.stages],
+            "platforms": {name: dict(state) for name, state in self.platforms.items()},
+        }
+
     def update(self, stage: str, current: int, total: int, message: str = ""):
         """Update progress"""
+        with self._lock:
+            self._update(stage, current, total, message)
+
+    def _update(self, stage: str, current: int, total: int, message: str):
+        now = time.time()
+        self._enter_stage(stage, now)
         progress_data = {
             "operation_id": self.operation_id,
             "stage": stage,
@@ -20,42 +412,126 @@ class ProgressTracker:
             "total": total,
             "percentage": int((current / total) * 100) if total > 0 else 0,
             "message": message,
-            "elapsed_time": time.time() - self.start_time,
-            "timestamp": time.time()
+            "elapsed_time": now - self.start_time,
+            "timestamp": now,
+            "metrics": self.metrics(now),
         }
-        
+
+        # Within a stage, keep only the latest update until the interval passes
+        if stage == self._last_stage and now - self._last_write < self.flush_interval:
+            self._pending = progress_data
+            return
+        self._write(progress_data)
+
+    def flush(self):
+        """Write a coalesced update that is still pending"""
+        with self._lock:
+            if self._pending is not None:
+                self._write(self._pending)
+
+    def _write(self, progress_data: Dict[str, Any]):
+        self._pending = None
+        self._last_stage = progress_data["stage"]
+        self._last_write = progress_data["timestamp"]
         try:
-            with open(self.progress_file, 'w') as f:
-                json.dump(progress_data, f)
+            self.backend.set(self.operation_id, progress_data, _ttl())
         except Exception as e:
             print(f"Error updating progress: {e}")
-    
+
     def complete(self, message: str = "Operation completed"):
         """Mark operation as complete"""
         self.update("completed", 100, 100, message)
-        
+        self._save_summary("error" if self.failed else "completed", message)
+
     def error(self, message: str = "Operation failed"):
         """Mark operation as failed"""
+        self.failed = True
+        self.error_message = message
         self.update("error", 0, 100, message)
-    
-    def cleanup(self):
-        """Clean up progress file"""
+        self._save_summary("error", message)
+
+    def _save_summary(self, status: str, message: str):
+        """Store the timings of the finished operation as a ScrapeRun"""
+        from ..models import ScrapeRun
+
+        now = time.time()
+        metrics = self.metrics(now)
+        # The final stage only marks the end
+        stages = metrics["stages"][:-1]
+        for stage in stages:
+            stage["duration"] = round(stage["ended"] - stage["started"], 3)
+        for name, state in metrics["platforms"].items():
+            if state.get("ended") is not None:
+                stages.append({"stage": f"scrape {name}", "started": state["started"], "ended": state["ended"],
+                               "duration": round(state["ended"] - state["started"], 3)})
         try:
-            if os.path.exists(self.progress_file):
-                os.remove(self.progress_file)
+            ScrapeRun.objects.update_or_create(
+                operation_id=self.operation_id,
+                defaults={
+                    "platform": self.platform,
+                    "query": self.query[:255],
+                    "status": status,
+                    "message": message,
+                    "started_at": datetime.fromtimestamp(self.start_time, dt_timezone.utc),
+                    "finished_at": datetime.fromtimestamp(now, dt_timezone.utc),
+                    "duration": now - self.start_time,
+                    "jobs": metrics["jobs"],
+                    "pages": metrics["pages"],
+                    "time_to_first_job": metrics["time_to_first_job"],
+                    "stages": stages,
+                },
+            )
         except Exception as e:
-            print(f"Error cleaning up progress file: {e}")
+            print(f"Error saving scrape summary: {e}")
+            return
+        timings = ", ".join(f"{stage['stage']} {stage['duration']:.1f}s" for stage in stages)
+        print(f"Operation {self.operation_id} {status} in {now - self.start_time:.1f}s "
+              f"({metrics['jobs']} jobs, {metrics['pages']} pages): {timings}")
+
+    def cleanup(self, delay: float = 0):
+        """Drop the progress entry, now or after ``delay`` seconds (it also expires on its own)"""
+        if delay > 0:
+            get_progress_reaper().schedule(self.operation_id, delay)
+            return
+        try:
+            self.backend.delete(self.operation_id)
+        except Exception as e:
+            print(f"Error cleaning up progress: {e}")
+
+class PlatformProgress:
+    """One platform's view of a shared ProgressTracker (all-platforms scrapes)."""
+
+    def __init__(self, parent: ProgressTracker, platform: str):
+        self.parent = parent
+        self.platform = platform
+
+    def update(self, stage: str, current: int, total: int, message: str = ""):
+        self.parent.update_platform(self.platform, stage, current, total, message)
+
+    def add_jobs(self, n: int = 1):
+        self.parent.add_jobs(n)
+
+    def add_pages(self, n: int = 1):
+        self.parent.add_pages(n)
+
+    def set_target(self, jobs: int):
+        """The parent's target already covers every platform"""
+
 
 def get_progress(operation_id: str) -> Dict[str, Any]:
     """Get current progress for an operation"""
-    progress_file = f"progress_{operation_id}.json"
+    from ..tasks import task_progress
+
     try:
-        if os.path.exists(progress_file):
-            with open(progress_file, 'r') as f:
-                return json.load(f)
+        progress_data = get_progress_backend().get(operation_id)
+        if progress_data is None:
+            # Queued, or finished long enough ago that the entry is gone
+            progress_data = task_progress(operation_id)
+        if progress_data is not None:
+            return progress_data
     except Exception as e:
         print(f"Error reading progress: {e}")
-    
+
     return {
         "operation_id": operation_id,
         "stage": "unknown",
@@ -64,5 +540,6 @@ def get_progress(operation_id: str) -> Dict[str, Any]:
         "percentage": 0,
         "message": "Progress not available",
         "elapsed_time": 0,
-        "timestamp": time.time()
+        "timestamp": time.time(),
+        "metrics": {},
     }
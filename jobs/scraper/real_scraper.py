@@ -1,60 +1,166 @@
+"""
+Job boards that can be fetched without a browser.
+
+``scrape_real_jobs`` fans out over every site in ``REAL_SITES`` at once:
+one shared HTTP client, at most ``HOST_CONCURRENCY`` requests per host,
+and the pages are parsed by the same ``parse_*_response`` functions the
+single-site ``scrape_*`` adapters use, in a worker thread so parsing
+doesn't stall the other requests. Unique jobs are collected in the order
+the responses arrive; once ``max_jobs`` are in hand the outstanding
+requests are cancelled.
+
+httpx is used as the async client when installed; otherwise requests runs
+in a small private thread pool, whose cancelled fetches are abandoned
+rather than waited for.
+"""
+import asyncio
 import requests
 from bs4 import BeautifulSoup
 import time
 import random
 import json
-from urllib.parse import quote
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import quote, urlsplit
+from typing import Callable, List, Dict, NamedTuple, Optional, Tuple
+
+try:
+    import httpx
+except ImportError:  # requests in a thread pool, same interface
+    httpx = None
+
+FETCH_TIMEOUT = 10
+HOST_CONCURRENCY = 2
+FETCH_THREADS = 8
+
+
+class RealSite(NamedTuple):
+    name: str
+    url: Callable[[str, str], str]
+    parse: Callable[[str, int], List[Dict]]
+
 
 def scrape_real_jobs(keyword: str, location: str, max_jobs: int = 50) -> List[Dict]:
     """
     Try to scrape real jobs from more accessible sources.
+
+    Runs its own event loop, so it is for synchronous callers only; code
+    already inside a loop should await ``fan_out_real_jobs`` instead.
     """
     print(f"Attempting to scrape real jobs for '{keyword}' in '{location}'")
-    
-    scrapers = [
-        ("GitHub Jobs", scrape_github_jobs),
-        ("Stack Overflow Jobs", scrape_stackoverflow_jobs),
-        ("Remote.co", scrape_remote_co),
-        ("FlexJobs", scrape_flexjobs),
-        ("AngelList (Wellfound)", scrape_wellfound),
-        ("Built In", scrape_builtin),
-        ("Hacker News Jobs", scrape_hackernews_jobs),
-        ("DevJobs", scrape_devjobs)
-    ]
-    
-    all_jobs = []
-    
-    for site_name, scraper_func in scrapers:
+    unique_jobs = asyncio.run(fan_out_real_jobs(keyword, location, max_jobs))
+    print(f"Total unique jobs found: {len(unique_jobs)}")
+    return unique_jobs
+
+def _job_key(job: Dict) -> str:
+    return f"{job.get('job_title', '')}_{job.get('company_name', '')}"
+
+async def fan_out_real_jobs(keyword: str, location: str, max_jobs: int = 50,
+                            sites: Optional[List[RealSite]] = None, client=None) -> List[Dict]:
+    """Fetch every site at once; unique jobs in arrival order, at most ``max_jobs``."""
+    sites = REAL_SITES if sites is None else sites
+    own_client = client is None
+    if own_client:
+        client = SharedClient()
+
+    async def fetch(site: RealSite):
         try:
-            print(f"Trying {site_name}...")
-            jobs = scraper_func(keyword, location, max_jobs)
-            if jobs:
-                print(f"✅ {site_name}: Found {len(jobs)} jobs")
-                all_jobs.extend(jobs)
-                if len(all_jobs) >= max_jobs:
-                    break
-            else:
-                print(f"❌ {site_name}: No jobs found")
+            status, text = await client.get(site.url(keyword, location))
+            if status != 200:
+                return site, [], None
+            # BeautifulSoup is CPU-bound; keep it off the event loop
+            return site, await asyncio.to_thread(site.parse, text, max_jobs), None
         except Exception as e:
-            print(f"❌ {site_name}: Error - {e}")
-            continue
-    
-    # Remove duplicates and limit
+            return site, [], e
+
+    tasks = [asyncio.ensure_future(fetch(site)) for site in sites]
     unique_jobs = []
-    seen_titles = set()
-    
-    for job in all_jobs:
-        title_key = f"{job.get('job_title', '')}_{job.get('company_name', '')}"
-        if title_key not in seen_titles:
-            seen_titles.add(title_key)
-            unique_jobs.append(job)
+    seen = set()
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            site, jobs, error = await next_result
+            if error is not None:
+                print(f"❌ {site.name}: Error - {error}")
+                continue
+            if not jobs:
+                print(f"❌ {site.name}: No jobs found")
+                continue
+            print(f"✅ {site.name}: Found {len(jobs)} jobs")
+            for job in jobs:
+                key = _job_key(job)
+                if key not in seen:
+                    seen.add(key)
+                    unique_jobs.append(job)
+                    if len(unique_jobs) >= max_jobs:
+                        break
             if len(unique_jobs) >= max_jobs:
                 break
-    
-    print(f"Total unique jobs found: {len(unique_jobs)}")
+    finally:
+        outstanding = [task for task in tasks if not task.done()]
+        for task in outstanding:
+            task.cancel()
+        if outstanding:
+            print(f"Cancelled {len(outstanding)} outstanding requests")
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if own_client:
+            await client.aclose()
     return unique_jobs
 
+
+class SharedClient:
+    """One HTTP client for a whole fan-out, with at most ``host_concurrency`` requests per host."""
+
+    def __init__(self, host_concurrency: int = HOST_CONCURRENCY, timeout: float = FETCH_TIMEOUT):
+        self.host_concurrency = host_concurrency
+        self.timeout = timeout
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+        headers = get_realistic_headers()
+        if httpx is not None:
+            self._client = httpx.AsyncClient(headers=headers, timeout=timeout, follow_redirects=True)
+        else:
+            self._client = None
+            self._session = requests.Session()
+            self._session.headers.update(headers)
+            self._executor = ThreadPoolExecutor(max_workers=FETCH_THREADS, thread_name_prefix="real-scraper")
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.host_concurrency)
+        return self._hosts[host]
+
+    async def get(self, url: str) -> Tuple[int, str]:
+        async with self._host_slot(url):
+            if self._client is not None:
+                response = await self._client.get(url)
+            else:
+                response = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, partial(self._session.get, url, timeout=self.timeout)
+                )
+            return response.status_code, response.text
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+        else:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._session.close()
+
+
+def fetch_site(url: str, parse: Callable[[str, int], List[Dict]], max_jobs: int,
+               delay: Tuple[float, float] = (2, 4)) -> List[Dict]:
+    """Fetch and parse one site on its own session (the single-site adapters)."""
+    session = requests.Session()
+    session.headers.update(get_realistic_headers())
+    try:
+        time.sleep(random.uniform(*delay))
+        response = session.get(url, timeout=FETCH_TIMEOUT)
+        if response.status_code == 200:
+            return parse(response.text, max_jobs)
+    except Exception:
+        pass
+    return []
+
 def get_realistic_headers():
     """Get realistic headers for scraping"""
     user_agents = [
@@ -78,419 +184,368 @@ def get_realistic_headers():
         'DNT': '1'
     }
 
+
+def github_jobs_url(keyword: str, location: str) -> str:
+    # GitHub Jobs was discontinued, but let's try the API
+    return f"https://jobs.github.com/positions.json?description={quote(keyword)}&location={quote(location)}"
+
 def scrape_github_jobs(keyword: str, location: str, max_jobs: int) -> List[Dict]:
     """Scrape GitHub Jobs (if available)"""
-    headers = get_realistic_headers()
-    session = requests.Session()
-    session.headers.update(headers)
-    
-    try:
-        # GitHub Jobs was discontinued, but let's try the API
-        url = f"https://jobs.github.com/positions.json?description={quote(keyword)}&location={quote(location)}"
-        time.sleep(random.uniform(1, 3))
-        response = session.get(url, timeout=10)
-        
-        if response.status_code == 200:
-            jobs_data = response.json()
-            jobs = []
-            for job in jobs_data[:max_jobs]:
-                jobs.append({
-                    "job_title": job.get("title", "N/A"),
-                    "company_name": job.get("company", "N/A"),
-                    "location": job.get("location", "N/A"),
-                    "job_description": job.get("description", "N/A"),
-                    "salary": "N/A",
-                    "source_url": job.get("url", "https://jobs.github.com")
-                })
-            return jobs
-    except:
-        pass
-    
-    return []
+    return fetch_site(github_jobs_url(keyword, location), parse_github_jobs_response, max_jobs, delay=(1, 3))
+
+def parse_github_jobs_response(text: str, max_jobs: int) -> List[Dict]:
+    jobs_data = json.loads(text)
+    jobs = []
+    for job in jobs_data[:max_jobs]:
+        jobs.append({
+            "job_title": job.get("title", "N/A"),
+            "company_name": job.get("company", "N/A"),
+            "location": job.get("location", "N/A"),
+            "job_description": job.get("description", "N/A"),
+            "salary": "N/A",
+            "source_url": job.get("url", "https://jobs.github.com")
+        })
+    return jobs
+
+def stackoverflow_jobs_url(keyword: str, location: str) -> str:
+    return f"https://stackoverflow.com/jobs?q={quote(keyword)}&l={quote(location)}"
 
 def scrape_stackoverflow_jobs(keyword: str, location: str, max_jobs: int) -> List[Dict]:
     """Scrape Stack Overflow Jobs"""
-    headers = get_realistic_headers()
-    session = requests.Session()
-    session.headers.update(headers)
-    
-    try:
-        url = f"https://stackoverflow.com/jobs?q={quote(keyword)}&l={quote(location)}"
-        time.sleep(random.uniform(2, 4))
-        response = session.get(url, timeout=10)
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            jobs = []
-            
-            job_elements = soup.select('.job, .job-card, .job-listing')
-            
-            for element in job_elements[:max_jobs]:
-                try:
-                    job = {
-                        "job_title": "N/A",
-                        "company_name": "N/A",
-                        "location": "N/A",
-                        "job_description": "N/A",
-                        "salary": "N/A",
-                        "source_url": "https://stackoverflow.com/jobs"
-                    }
-                    
-                    # Extract title
-                    title_elem = element.select_one('h2 a, .job-title a, h3 a')
-                    if title_elem:
-                        job["job_title"] = title_elem.get_text(strip=True)
-                        if title_elem.get('href'):
-                            job["source_url"] = f"https://stackoverflow.com{title_elem.get('href')}"
-                    
-                    # Extract company
-                    company_elem = element.select_one('.company, .company-name, .employer')
-                    if company_elem:
-                        job["company_name"] = company_elem.get_text(strip=True)
-                    
-                    # Extract location
-                    location_elem = element.select_one('.location, .job-location')
-                    if location_elem:
-                        job["location"] = location_elem.get_text(strip=True)
-                    
-                    if job["job_title"] != "N/A" or job["company_name"] != "N/A":
-                        jobs.append(job)
-                except:
-                    continue
-            
-            return jobs
-    except:
-        pass
-    
-    return []
+    return fetch_site(stackoverflow_jobs_url(keyword, location), parse_stackoverflow_jobs_response, max_jobs, delay=(2, 4))
+
+def parse_stackoverflow_jobs_response(html: str, max_jobs: int) -> List[Dict]:
+    soup = BeautifulSoup(html, 'html.parser')
+    jobs = []
+
+    job_elements = soup.select('.job, .job-card, .job-listing')
+
+    for element in job_elements[:max_jobs]:
+        try:
+            job = {
+                "job_title": "N/A",
+                "company_name": "N/A",
+                "location": "N/A",
+                "job_description": "N/A",
+                "salary": "N/A",
+                "source_url": "https://stackoverflow.com/jobs"
+            }
+
+            # Extract title
+            title_elem = element.select_one('h2 a, .job-title a, h3 a')
+            if title_elem:
+                job["job_title"] = title_elem.get_text(strip=True)
+                if title_elem.get('href'):
+                    job["source_url"] = f"https://stackoverflow.com{title_elem.get('href')}"
+
+            # Extract company
+            company_elem = element.select_one('.company, .company-name, .employer')
+            if company_elem:
+                job["company_name"] = company_elem.get_text(strip=True)
+
+            # Extract location
+            location_elem = element.select_one('.location, .job-location')
+            if location_elem:
+                job["location"] = location_elem.get_text(strip=True)
+
+            if job["job_title"] != "N/A" or job["company_name"] != "N/A":
+                jobs.append(job)
+        except:
+            continue
+
+    return jobs
+
+def remote_co_url(keyword: str, location: str) -> str:
+    return f"https://remote.co/remote-jobs/{keyword.replace(' ', '-')}/"
 
 def scrape_remote_co(keyword: str, location: str, max_jobs: int) -> List[Dict]:
     """Scrape Remote.co"""
-    headers = get_realistic_headers()
-    session = requests.Session()
-    session.headers.update(headers)
-    
-    try:
-        url = f"https://remote.co/remote-jobs/{keyword.replace(' ', '-')}/"
-        time.sleep(random.uniform(2, 4))
-        response = session.get(url, timeout=10)
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            jobs = []
-            
-            job_elements = soup.select('.job, .job-card, .job-listing')
-            
-            for element in job_elements[:max_jobs]:
-                try:
-                    job = {
-                        "job_title": "N/A",
-                        "company_name": "N/A",
-                        "location": "Remote",
-                        "job_description": "N/A",
-                        "salary": "N/A",
-                        "source_url": "https://remote.co"
-                    }
-                    
-                    # Extract title
-                    title_elem = element.select_one('h3 a, .job-title a, h2 a')
-                    if title_elem:
-                        job["job_title"] = title_elem.get_text(strip=True)
-                        if title_elem.get('href'):
-                            job["source_url"] = f"https://remote.co{title_elem.get('href')}"
-                    
-                    # Extract company
-                    company_elem = element.select_one('.company, .company-name')
-                    if company_elem:
-                        job["company_name"] = company_elem.get_text(strip=True)
-                    
-                    if job["job_title"] != "N/A" or job["company_name"] != "N/A":
-                        jobs.append(job)
-                except:
-                    continue
-            
-            return jobs
-    except:
-        pass
-    
-    return []
+    return fetch_site(remote_co_url(keyword, location), parse_remote_co_response, max_jobs, delay=(2, 4))
+
+def parse_remote_co_response(html: str, max_jobs: int) -> List[Dict]:
+    soup = BeautifulSoup(html, 'html.parser')
+    jobs = []
+
+    job_elements = soup.select('.job, .job-card, .job-listing')
+
+    for element in job_elements[:max_jobs]:
+        try:
+            job = {
+                "job_title": "N/A",
+                "company_name": "N/A",
+                "location": "Remote",
+                "job_description": "N/A",
+                "salary": "N/A",
+                "source_url": "https://remote.co"
+            }
+
+            # Extract title
+            title_elem = element.select_one('h3 a, .job-title a, h2 a')
+            if title_elem:
+                job["job_title"] = title_elem.get_text(strip=True)
+                if title_elem.get('href'):
+                    job["source_url"] = f"https://remote.co{title_elem.get('href')}"
+
+            # Extract company
+            company_elem = element.select_one('.company, .company-name')
+            if company_elem:
+                job["company_name"] = company_elem.get_text(strip=True)
+
+            if job["job_title"] != "N/A" or job["company_name"] != "N/A":
+                jobs.append(job)
+        except:
+            continue
+
+    return jobs
+
+def flexjobs_url(keyword: str, location: str) -> str:
+    return f"https://www.flexjobs.com/search?search={quote(keyword)}&location={quote(location)}"
 
 def scrape_flexjobs(keyword: str, location: str, max_jobs: int) -> List[Dict]:
     """Scrape FlexJobs (free section)"""
-    headers = get_realistic_headers()
-    session = requests.Session()
-    session.headers.update(headers)
-    
-    try:
-        url = f"https://www.flexjobs.com/search?search={quote(keyword)}&location={quote(location)}"
-        time.sleep(random.uniform(2, 4))
-        response = session.get(url, timeout=10)
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            jobs = []
-            
-            job_elements = soup.select('.job, .job-card, .job-listing')
-            
-            for element in job_elements[:max_jobs]:
-                try:
-                    job = {
-                        "job_title": "N/A",
-                        "company_name": "N/A",
-                        "location": "N/A",
-                        "job_description": "N/A",
-                        "salary": "N/A",
-                        "source_url": "https://www.flexjobs.com"
-                    }
-                    
-                    # Extract title
-                    title_elem = element.select_one('h3 a, .job-title a, h2 a')
-                    if title_elem:
-                        job["job_title"] = title_elem.get_text(strip=True)
-                        if title_elem.get('href'):
-                            job["source_url"] = f"https://www.flexjobs.com{title_elem.get('href')}"
-                    
-                    # Extract company
-                    company_elem = element.select_one('.company, .company-name')
-                    if company_elem:
-                        job["company_name"] = company_elem.get_text(strip=True)
-                    
-                    # Extract location
-                    location_elem = element.select_one('.location, .job-location')
-                    if location_elem:
-                        job["location"] = location_elem.get_text(strip=True)
-                    
-                    if job["job_title"] != "N/A" or job["company_name"] != "N/A":
-                        jobs.append(job)
-                except:
-                    continue
-            
-            return jobs
-    except:
-        pass
-    
-    return []
+    return fetch_site(flexjobs_url(keyword, location), parse_flexjobs_response, max_jobs, delay=(2, 4))
+
+def parse_flexjobs_response(html: str, max_jobs: int) -> List[Dict]:
+    soup = BeautifulSoup(html, 'html.parser')
+    jobs = []
+
+    job_elements = soup.select('.job, .job-card, .job-listing')
+
+    for element in job_elements[:max_jobs]:
+        try:
+            job = {
+                "job_title": "N/A",
+                "company_name": "N/A",
+                "location": "N/A",
+                "job_description": "N/A",
+                "salary": "N/A",
+                "source_url": "https://www.flexjobs.com"
+            }
+
+            # Extract title
+            title_elem = element.select_one('h3 a, .job-title a, h2 a')
+            if title_elem:
+                job["job_title"] = title_elem.get_text(strip=True)
+                if title_elem.get('href'):
+                    job["source_url"] = f"https://www.flexjobs.com{title_elem.get('href')}"
+
+            # Extract company
+            company_elem = element.select_one('.company, .company-name')
+            if company_elem:
+                job["company_name"] = company_elem.get_text(strip=True)
+
+            # Extract location
+            location_elem = element.select_one('.location, .job-location')
+            if location_elem:
+                job["location"] = location_elem.get_text(strip=True)
+
+            if job["job_title"] != "N/A" or job["company_name"] != "N/A":
+                jobs.append(job)
+        except:
+            continue
+
+    return jobs
+
+def wellfound_url(keyword: str, location: str) -> str:
+    return f"https://wellfound.com/role/l/{keyword.replace(' ', '-')}"
 
 def scrape_wellfound(keyword: str, location: str, max_jobs: int) -> List[Dict]:
     """Scrape Wellfound (formerly AngelList)"""
-    headers = get_realistic_headers()
-    session = requests.Session()
-    session.headers.update(headers)
-    
-    try:
-        url = f"https://wellfound.com/role/l/{keyword.replace(' ', '-')}"
-        time.sleep(random.uniform(2, 4))
-        response = session.get(url, timeout=10)
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            jobs = []
-            
-            job_elements = soup.select('.job, .job-card, .job-listing')
-            
-            for element in job_elements[:max_jobs]:
-                try:
-                    job = {
-                        "job_title": "N/A",
-                        "company_name": "N/A",
-                        "location": "N/A",
-                        "job_description": "N/A",
-                        "salary": "N/A",
-                        "source_url": "https://wellfound.com"
-                    }
-                    
-                    # Extract title
-                    title_elem = element.select_one('h3 a, .job-title a, h2 a')
-                    if title_elem:
-                        job["job_title"] = title_elem.get_text(strip=True)
-                        if title_elem.get('href'):
-                            job["source_url"] = f"https://wellfound.com{title_elem.get('href')}"
-                    
-                    # Extract company
-                    company_elem = element.select_one('.company, .company-name')
-                    if company_elem:
-                        job["company_name"] = company_elem.get_text(strip=True)
-                    
-                    # Extract location
-                    location_elem = element.select_one('.location, .job-location')
-                    if location_elem:
-                        job["location"] = location_elem.get_text(strip=True)
-                    
-                    if job["job_title"] != "N/A" or job["company_name"] != "N/A":
-                        jobs.append(job)
-                except:
-                    continue
-            
-            return jobs
-    except:
-        pass
-    
-    return []
+    return fetch_site(wellfound_url(keyword, location), parse_wellfound_response, max_jobs, delay=(2, 4))
+
+def parse_wellfound_response(html: str, max_jobs: int) -> List[Dict]:
+    soup = BeautifulSoup(html, 'html.parser')
+    jobs = []
+
+    job_elements = soup.select('.job, .job-card, .job-listing')
+
+    for element in job_elements[:max_jobs]:
+        try:
+            job = {
+                "job_title": "N/A",
+                "company_name": "N/A",
+                "location": "N/A",
+                "job_description": "N/A",
+                "salary": "N/A",
+                "source_url": "https://wellfound.com"
+            }
+
+            # Extract title
+            title_elem = element.select_one('h3 a, .job-title a, h2 a')
+            if title_elem:
+                job["job_title"] = title_elem.get_text(strip=True)
+                if title_elem.get('href'):
+                    job["source_url"] = f"https://wellfound.com{title_elem.get('href')}"
+
+            # Extract company
+            company_elem = element.select_one('.company, .company-name')
+            if company_elem:
+                job["company_name"] = company_elem.get_text(strip=True)
+
+            # Extract location
+            location_elem = element.select_one('.location, .job-location')
+            if location_elem:
+                job["location"] = location_elem.get_text(strip=True)
+
+            if job["job_title"] != "N/A" or job["company_name"] != "N/A":
+                jobs.append(job)
+        except:
+            continue
+
+    return jobs
+
+def builtin_url(keyword: str, location: str) -> str:
+    return f"https://builtin.com/jobs?search={quote(keyword)}&location={quote(location)}"
 
 def scrape_builtin(keyword: str, location: str, max_jobs: int) -> List[Dict]:
     """Scrape Built In (tech jobs)"""
-    headers = get_realistic_headers()
-    session = requests.Session()
-    session.headers.update(headers)
-    
-    try:
-        url = f"https://builtin.com/jobs?search={quote(keyword)}&location={quote(location)}"
-        time.sleep(random.uniform(2, 4))
-        response = session.get(url, timeout=10)
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            jobs = []
-            
-            job_elements = soup.select('.job, .job-card, .job-listing')
-            
-            for element in job_elements[:max_jobs]:
-                try:
-                    job = {
-                        "job_title": "N/A",
-                        "company_name": "N/A",
-                        "location": "N/A",
-                        "job_description": "N/A",
-                        "salary": "N/A",
-                        "source_url": "https://builtin.com"
-                    }
-                    
-                    # Extract title
-                    title_elem = element.select_one('h3 a, .job-title a, h2 a')
-                    if title_elem:
-                        job["job_title"] = title_elem.get_text(strip=True)
-                        if title_elem.get('href'):
-                            job["source_url"] = f"https://builtin.com{title_elem.get('href')}"
-                    
-                    # Extract company
-                    company_elem = element.select_one('.company, .company-name')
-                    if company_elem:
-                        job["company_name"] = company_elem.get_text(strip=True)
-                    
-                    # Extract location
-                    location_elem = element.select_one('.location, .job-location')
-                    if location_elem:
-                        job["location"] = location_elem.get_text(strip=True)
-                    
-                    if job["job_title"] != "N/A" or job["company_name"] != "N/A":
-                        jobs.append(job)
-                except:
-                    continue
-            
-            return jobs
-    except:
-        pass
-    
-    return []
+    return fetch_site(builtin_url(keyword, location), parse_builtin_response, max_jobs, delay=(2, 4))
+
+def parse_builtin_response(html: str, max_jobs: int) -> List[Dict]:
+    soup = BeautifulSoup(html, 'html.parser')
+    jobs = []
+
+    job_elements = soup.select('.job, .job-card, .job-listing')
+
+    for element in job_elements[:max_jobs]:
+        try:
+            job = {
+                "job_title": "N/A",
+                "company_name": "N/A",
+                "location": "N/A",
+                "job_description": "N/A",
+                "salary": "N/A",
+                "source_url": "https://builtin.com"
+            }
+
+            # Extract title
+            title_elem = element.select_one('h3 a, .job-title a, h2 a')
+            if title_elem:
+                job["job_title"] = title_elem.get_text(strip=True)
+                if title_elem.get('href'):
+                    job["source_url"] = f"https://builtin.com{title_elem.get('href')}"
+
+            # Extract company
+            company_elem = element.select_one('.company, .company-name')
+            if company_elem:
+                job["company_name"] = company_elem.get_text(strip=True)
+
+            # Extract location
+            location_elem = element.select_one('.location, .job-location')
+            if location_elem:
+                job["location"] = location_elem.get_text(strip=True)
+
+            if job["job_title"] != "N/A" or job["company_name"] != "N/A":
+                jobs.append(job)
+        except:
+            continue
+
+    return jobs
+
+def hackernews_jobs_url(keyword: str, location: str) -> str:
+    return "https://news.ycombinator.com/jobs"
 
 def scrape_hackernews_jobs(keyword: str, location: str, max_jobs: int) -> List[Dict]:
     """Scrape Hacker News Jobs"""
-    headers = get_realistic_headers()
-    session = requests.Session()
-    session.headers.update(headers)
-    
-    try:
-        url = "https://news.ycombinator.com/jobs"
-        time.sleep(random.uniform(2, 4))
-        response = session.get(url, timeout=10)
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            jobs = []
-            
-            job_elements = soup.select('.athing')
-            
-            for element in job_elements[:max_jobs]:
-                try:
-                    job = {
-                        "job_title": "N/A",
-                        "company_name": "N/A",
-                        "location": "N/A",
-                        "job_description": "N/A",
-                        "salary": "N/A",
-                        "source_url": "https://news.ycombinator.com/jobs"
-                    }
-                    
-                    # Extract title
-                    title_elem = element.select_one('.titleline a')
-                    if title_elem:
-                        job["job_title"] = title_elem.get_text(strip=True)
-                        if title_elem.get('href'):
-                            job["source_url"] = title_elem.get('href')
-                    
-                    # Extract company (usually in the title)
-                    if job["job_title"] != "N/A":
-                        # Try to extract company from title
-                        title = job["job_title"]
-                        if " at " in title:
-                            parts = title.split(" at ")
-                            if len(parts) == 2:
-                                job["job_title"] = parts[0].strip()
-                                job["company_name"] = parts[1].strip()
-                    
-                    if job["job_title"] != "N/A":
-                        jobs.append(job)
-                except:
-                    continue
-            
-            return jobs
-    except:
-        pass
-    
-    return []
+    return fetch_site(hackernews_jobs_url(keyword, location), parse_hackernews_jobs_response, max_jobs, delay=(2, 4))
+
+def parse_hackernews_jobs_response(html: str, max_jobs: int) -> List[Dict]:
+    soup = BeautifulSoup(html, 'html.parser')
+    jobs = []
+
+    job_elements = soup.select('.athing')
+
+    for element in job_elements[:max_jobs]:
+        try:
+            job = {
+                "job_title": "N/A",
+                "company_name": "N/A",
+                "location": "N/A",
+                "job_description": "N/A",
+                "salary": "N/A",
+                "source_url": "https://news.ycombinator.com/jobs"
+            }
+
+            # Extract title
+            title_elem = element.select_one('.titleline a')
+            if title_elem:
+                job["job_title"] = title_elem.get_text(strip=True)
+                if title_elem.get('href'):
+                    job["source_url"] = title_elem.get('href')
+
+            # Extract company (usually in the title)
+            if job["job_title"] != "N/A":
+                # Try to extract company from title
+                title = job["job_title"]
+                if " at " in title:
+                    parts = title.split(" at ")
+                    if len(parts) == 2:
+                        job["job_title"] = parts[0].strip()
+                        job["company_name"] = parts[1].strip()
+
+            if job["job_title"] != "N/A":
+                jobs.append(job)
+        except:
+            continue
+
+    return jobs
+
+def devjobs_url(keyword: str, location: str) -> str:
+    return f"https://devjobs.com/jobs?q={quote(keyword)}&l={quote(location)}"
 
 def scrape_devjobs(keyword: str, location: str, max_jobs: int) -> List[Dict]:
     """Scrape DevJobs"""
-    headers = get_realistic_headers()
-    session = requests.Session()
-    session.headers.update(headers)
-    
-    try:
-        url = f"https://devjobs.com/jobs?q={quote(keyword)}&l={quote(location)}"
-        time.sleep(random.uniform(2, 4))
-        response = session.get(url, timeout=10)
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            jobs = []
-            
-            job_elements = soup.select('.job, .job-card, .job-listing')
-            
-            for element in job_elements[:max_jobs]:
-                try:
-                    job = {
-                        "job_title": "N/A",
-                        "company_name": "N/A",
-                        "location": "N/A",
-                        "job_description": "N/A",
-                        "salary": "N/A",
-                        "source_url": "https://devjobs.com"
-                    }
-                    
-                    # Extract title
-                    title_elem = element.select_one('h3 a, .job-title a, h2 a')
-                    if title_elem:
-                        job["job_title"] = title_elem.get_text(strip=True)
-                        if title_elem.get('href'):
-                            job["source_url"] = f"https://devjobs.com{title_elem.get('href')}"
-                    
-                    # Extract company
-                    company_elem = element.select_one('.company, .company-name')
-                    if company_elem:
-                        job["company_name"] = company_elem.get_text(strip=True)
-                    
-                    # Extract location
-                    location_elem = element.select_one('.location, .job-location')
-                    if location_elem:
-                        job["location"] = location_elem.get_text(strip=True)
-                    
-                    if job["job_title"] != "N/A" or job["company_name"] != "N/A":
-                        jobs.append(job)
-                except:
-                    continue
-            
-            return jobs
-    except:
-        pass
-    
-    return []
+    return fetch_site(devjobs_url(keyword, location), parse_devjobs_response, max_jobs, delay=(2, 4))
+
+def parse_devjobs_response(html: str, max_jobs: int) -> List[Dict]:
+    soup = BeautifulSoup(html, 'html.parser')
+    jobs = []
+
+    job_elements = soup.select('.job, .job-card, .job-listing')
+
+    for element in job_elements[:max_jobs]:
+        try:
+            job = {
+                "job_title": "N/A",
+                "company_name": "N/A",
+                "location": "N/A",
+                "job_description": "N/A",
+                "salary": "N/A",
+                "source_url": "https://devjobs.com"
+            }
+
+            # Extract title
+            title_elem = element.select_one('h3 a, .job-title a, h2 a')
+            if title_elem:
+                job["job_title"] = title_elem.get_text(strip=True)
+                if title_elem.get('href'):
+                    job["source_url"] = f"https://devjobs.com{title_elem.get('href')}"
+
+            # Extract company
+            company_elem = element.select_one('.company, .company-name')
+            if company_elem:
+                job["company_name"] = company_elem.get_text(strip=True)
+
+            # Extract location
+            location_elem = element.select_one('.location, .job-location')
+            if location_elem:
+                job["location"] = location_elem.get_text(strip=True)
+
+            if job["job_title"] != "N/A" or job["company_name"] != "N/A":
+                jobs.append(job)
+        except:
+            continue
+
+    return jobs
+
+# Requested together by scrape_real_jobs; results are taken in arrival order
+REAL_SITES = [
+    RealSite("GitHub Jobs", github_jobs_url, parse_github_jobs_response),
+    RealSite("Stack Overflow Jobs", stackoverflow_jobs_url, parse_stackoverflow_jobs_response),
+    RealSite("Remote.co", remote_co_url, parse_remote_co_response),
+    RealSite("FlexJobs", flexjobs_url, parse_flexjobs_response),
+    RealSite("AngelList (Wellfound)", wellfound_url, parse_wellfound_response),
+    RealSite("Built In", builtin_url, parse_builtin_response),
+    RealSite("Hacker News Jobs", hackernews_jobs_url, parse_hackernews_jobs_response),
+    RealSite("DevJobs", devjobs_url, parse_devjobs_response),
+]
@@ -1,4 +1,5 @@
 import re, unicodedata
+import hashlib
 import tldextract
 from urllib.parse import urlparse
 
@@ -19,6 +20,34 @@ def fingerprint(title: str, company: str, location: str) -> str:
     return re.sub(r"[^a-z0-9|]+", "", base)
 
 
+def fingerprint_hash(fp: str) -> int:
+    """Signed 64-bit hash of a fingerprint string (fits a BigIntegerField)."""
+    digest = hashlib.blake2b(fp.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+# Legal-form suffixes dropped from company names ("Google LLC" -> "google")
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "llc", "llp", "lp", "ltd", "limited", "corp", "corporation",
+    "co", "company", "plc", "gmbh", "ag", "sa", "sas", "bv", "nv", "pty", "pvt", "srl", "oy", "ab",
+}
+
+
+def company_key(name: str) -> str:
+    """Canonical company key: lowercase words without punctuation or trailing legal suffixes."""
+    words = re.findall(r"[^\W_]+", normalize_text(name).replace("&", " and "))
+    stripped = True
+    while stripped:
+        stripped = False
+        # Up to three words so dotted forms like "L.L.C." or "S.A." count too
+        for size in (1, 2, 3):
+            if len(words) > size and "".join(words[-size:]) in LEGAL_SUFFIXES:
+                del words[-size:]
+                stripped = True
+                break
+    return " ".join(words)
+
+
 def is_social_or_info(url: str) -> bool:
     host = tldextract.extract(url).registered_domain
     return host in SOCIAL_HOSTS
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Full-text job search backed by the SQLite FTS5 table ``jobs_job_fts``.
+
+The table and the triggers keeping it in sync with ``jobs_job`` are created
+by migration 0004. Results are ranked with bm25 (title > company >
+description) and carry an HTML snippet of the matching description text.
+"""
+import re
+from html import escape
+from typing import Dict, List, Tuple
+
+from django.db import connection
+
+from .models import Job
+
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+
+# Private-use markers so highlighting survives HTML escaping of the text
+_MARK_START = "\ue000"
+_MARK_END = "\ue001"
+
+_TOKEN_RE = re.compile(r"\w+\*?", re.UNICODE)
+
+SEARCH_SQL = f"""
+SELECT rowid,
+       highlight(jobs_job_fts, 0, '{_MARK_START}', '{_MARK_END}'),
+       snippet(jobs_job_fts, 2, '{_MARK_START}', '{_MARK_END}', '…', 16),
+       rank
+FROM jobs_job_fts
+WHERE jobs_job_fts MATCH %s
+ORDER BY rank
+LIMIT %s OFFSET %s
+"""
+
+COUNT_SQL = "SELECT count(*) FROM jobs_job_fts WHERE jobs_job_fts MATCH %s"
+
+
+class SearchUnavailable(Exception):
+    """Raised when the database has no FTS5 index (non-SQLite backends)."""
+
+
+def build_match_query(text: str) -> str:
+    """
+    Turn free text into a safe FTS5 query.
+
+    Every word becomes a quoted term (so FTS syntax in user input can't
+    break the query) and all terms must match; a trailing ``*`` keeps
+    prefix matching, e.g. ``pyth*``.
+    """
+    terms = []
+    for token in _TOKEN_RE.findall(text or ""):
+        prefix = token.endswith("*")
+        word = token.rstrip("*")
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return " ".join(terms)
+
+
+def _render_marks(text: str) -> str:
+    return escape(text or "").replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+def search_jobs(text: str, page: int = 1, per_page: int = SEARCH_PAGE_SIZE) -> Tuple[List[Dict], int]:
+    """
+    Return one page of ranked matches for ``text`` and the total match count.
+    """
+    if connection.vendor != "sqlite":
+        raise SearchUnavailable("Full-text search requires the SQLite FTS5 index")
+
+    match = build_match_query(text)
+    if not match:
+        return [], 0
+
+    per_page = max(1, min(per_page, SEARCH_MAX_PAGE_SIZE))
+    page = max(1, page)
+    with connection.cursor() as cursor:
+        cursor.execute(COUNT_SQL, [match])
+        total = cursor.fetchone()[0]
+        cursor.execute(SEARCH_SQL, [match, per_page, (page - 1) * per_page])
+        rows = cursor.fetchall()
+
+    jobs = {
+        job["id"]: job
+        for job in Job.objects.filter(id__in=[row[0] for row in rows]).values(
+            "id", "title", "company__name", "location", "source_url", "sources", "scraped_at"
+        )
+    }
+
+    results = []
+    for job_id, title_hl, snippet, rank in rows:
+        job = jobs.get(job_id)
+        if job is None:
+            continue
+        results.append({
+            "id": job_id,
+            "title": job["title"],
+            "title_highlighted": _render_marks(title_hl),
+            "company": job["company__name"],
+            "location": job["location"],
+            "source_url": job["source_url"],
+            "sources": job["sources"],
+            "scraped_at": job["scraped_at"].strftime("%Y-%m-%d %H:%M"),
+            "snippet": _render_marks(snippet),
+            "score": -rank,
+        })
+    return results, total
@@ -0,0 +1,122 @@
+"""
+Dashboard statistics kept in the ``JobStat`` summary table.
+
+Every write path adds its deltas (jobs per platform, company, location
+and day, plus the total) in the same transaction as the rows it changes,
+so ``/stats/`` reads a handful of indexed rows instead of grouping the
+jobs table. Counts cover live jobs: purges and archiving subtract what
+they remove. ``rebuild_stats`` recomputes everything from scratch.
+"""
+from collections import Counter
+from datetime import timedelta
+from typing import Dict, Iterable
+
+from django.db import connection, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Company, Job, JobSource, JobStat
+
+STATS_TOP_LIMIT = 20
+STATS_MAX_LIMIT = 200
+STATS_DAYS = 30
+
+# Portable between SQLite (3.24+) and PostgreSQL
+UPSERT_SQL = (
+    'INSERT INTO {table} ("dimension", "key", "count") VALUES {values} '
+    'ON CONFLICT ("dimension", "key") DO UPDATE SET "count" = {table}."count" + excluded."count"'
+)
+UPSERT_BATCH_SIZE = 300
+
+
+def _location_key(location: str) -> str:
+    return (location or "")[:255]
+
+
+def job_deltas(jobs: Iterable[Job], platform: str) -> Counter:
+    """Deltas for newly inserted ``jobs`` first seen on ``platform``."""
+    deltas = Counter()
+    for job in jobs:
+        deltas["total", ""] += 1
+        deltas["platform", platform] += 1
+        deltas["company", str(job.company_id)] += 1
+        deltas["location", _location_key(job.location)] += 1
+        deltas["day", timezone.localdate(job.scraped_at).isoformat()] += 1
+    return deltas
+
+
+def apply_deltas(deltas: Dict[tuple, int]):
+    """Add ``{(dimension, key): delta}`` to the summary rows (one upsert per batch)."""
+    items = [(dimension, key, delta) for (dimension, key), delta in deltas.items() if delta]
+    if not items:
+        return
+    table = connection.ops.quote_name(JobStat._meta.db_table)
+    with connection.cursor() as cursor:
+        for start in range(0, len(items), UPSERT_BATCH_SIZE):
+            chunk = items[start:start + UPSERT_BATCH_SIZE]
+            sql = UPSERT_SQL.format(table=table, values=", ".join(["(%s, %s, %s)"] * len(chunk)))
+            cursor.execute(sql, [value for item in chunk for value in item])
+    if any(delta < 0 for _, _, delta in items):
+        JobStat.objects.filter(count__lte=0)._raw_delete(JobStat.objects.db)
+
+
+def _grouped_counts(jobs) -> Counter:
+    """Counts per dimension value of the jobs in queryset ``jobs``."""
+    counts = Counter()
+    counts["total", ""] = jobs.count()
+    for row in jobs.order_by().values("company_id").annotate(n=Count("id")):
+        counts["company", str(row["company_id"])] += row["n"]
+    for row in jobs.order_by().values("location").annotate(n=Count("id")):
+        counts["location", _location_key(row["location"])] += row["n"]
+    for row in jobs.order_by().annotate(day=TruncDate("scraped_at")).values("day").annotate(n=Count("id")):
+        counts["day", row["day"].isoformat()] += row["n"]
+    links = JobSource.objects.filter(job_id__in=jobs.values("id"))
+    for row in links.order_by().values("platform").annotate(n=Count("id")):
+        counts["platform", row["platform"]] += row["n"]
+    return counts
+
+
+def subtract_jobs(jobs):
+    """Remove the jobs in queryset ``jobs`` from the stats; call before deleting them."""
+    apply_deltas({key: -n for key, n in _grouped_counts(jobs).items()})
+
+
+@transaction.atomic
+def rebuild_stats() -> int:
+    """Recompute every summary row from the jobs table; returns the row count."""
+    JobStat.objects.all()._raw_delete(JobStat.objects.db)
+    counts = _grouped_counts(Job.objects.all())
+    JobStat.objects.bulk_create(
+        [JobStat(dimension=dimension, key=key, count=n) for (dimension, key), n in counts.items() if n],
+        batch_size=500,
+    )
+    return len(counts)
+
+
+def _top(dimension: str, limit: int):
+    return list(
+        JobStat.objects.filter(dimension=dimension).order_by("-count", "key").values_list("key", "count")[:limit]
+    )
+
+
+def stats_snapshot(limit: int = STATS_TOP_LIMIT, days: int = STATS_DAYS) -> Dict:
+    """The dashboard payload: totals, per platform, top companies/locations, recent days."""
+    limit = max(1, min(limit, STATS_MAX_LIMIT))
+    total = JobStat.objects.filter(dimension="total", key="").values_list("count", flat=True).first() or 0
+
+    companies = _top("company", limit)
+    names = dict(Company.objects.filter(id__in=[int(key) for key, _ in companies]).values_list("id", "name"))
+
+    since = (timezone.localdate() - timedelta(days=days - 1)).isoformat()
+    per_day = JobStat.objects.filter(dimension="day", key__gte=since).order_by("key").values_list("key", "count")
+
+    return {
+        "total_jobs": total,
+        "platforms": dict(_top("platform", STATS_MAX_LIMIT)),
+        "companies": [
+            {"company_id": int(key), "company": names.get(int(key), ""), "count": n} for key, n in companies
+        ],
+        "locations": [{"location": key, "count": n} for key, n in _top("location", limit)],
+        "days": [{"day": key, "count": n} for key, n in per_day],
+    }
@@ -0,0 +1,265 @@
+"""
+Database-backed queue of scrape tasks.
+
+``run_scrape`` only enqueues a ``ScrapeTask`` and returns its operation id;
+"manage.py scrape_worker" claims queued tasks and runs each one in a
+bounded process pool, so a Chrome session that takes minutes never holds
+a web worker. A task is claimed with a conditional UPDATE (queued ->
+running), so several workers can share one queue.
+
+The scrape reports through the progress store as before; while the task
+waits, or after its progress entry is gone, ``task_progress`` answers
+``get_progress`` from the task row.
+
+Worker processes are spawned and import this module before Django is set
+up, so models are imported inside the functions.
+"""
+import multiprocessing
+import os
+import socket
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.utils import timezone
+
+SCRAPE_WORKER_CONCURRENCY = 2
+WORKER_POLL_INTERVAL = 1.0
+# Worker processes are replaced after this many tasks (Chrome/driver leaks)
+MAX_TASKS_PER_CHILD = 20
+# Seconds a terminated worker process gets before it is killed
+CHILD_STOP_TIMEOUT = 10.0
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_scrape(operation_id: str, platform: str, role_name: str, location: str, limit: int,
+                   incremental: bool = False):
+    from .models import ScrapeTask
+
+    return ScrapeTask.objects.create(
+        operation_id=operation_id,
+        platform=platform,
+        role_name=role_name,
+        location=location,
+        limit=limit,
+        incremental=incremental,
+    )
+
+
+def claim_next_task(worker: str):
+    """Mark the oldest queued task as running for ``worker`` and return it."""
+    from .models import ScrapeTask
+
+    queued = ScrapeTask.objects.filter(status=ScrapeTask.QUEUED).order_by("created_at", "id")
+    for task_id in queued.values_list("id", flat=True)[:10]:
+        claimed = ScrapeTask.objects.filter(id=task_id, status=ScrapeTask.QUEUED).update(
+            status=ScrapeTask.RUNNING, worker=worker, started_at=timezone.now()
+        )
+        if claimed:
+            return ScrapeTask.objects.get(id=task_id)
+    return None
+
+
+def finish_task(task_id: int, worker: str, status: str, result_count: Optional[int] = None, error: str = ""):
+    """Record the outcome, unless the task was requeued (and maybe claimed again) meanwhile."""
+    from .models import ScrapeTask
+
+    ScrapeTask.objects.filter(id=task_id, status=ScrapeTask.RUNNING, worker=worker).update(
+        status=status, result_count=result_count, error=error, finished_at=timezone.now()
+    )
+
+
+def requeue_tasks(task_ids, worker: str) -> int:
+    """Put ``worker``'s running tasks among ``task_ids`` back in the queue."""
+    from .models import ScrapeTask
+
+    return ScrapeTask.objects.filter(id__in=list(task_ids), status=ScrapeTask.RUNNING, worker=worker).update(
+        status=ScrapeTask.QUEUED, worker="", started_at=None
+    )
+
+
+def requeue_orphaned_tasks() -> int:
+    """Put back running tasks whose worker process on this host is gone."""
+    from .models import ScrapeTask
+
+    host = socket.gethostname()
+    requeued = 0
+    for task in ScrapeTask.objects.filter(status=ScrapeTask.RUNNING, worker__startswith=f"{host}:"):
+        pid = int(task.worker.rsplit(":", 1)[1])
+        try:
+            os.kill(pid, 0)
+            continue
+        except ProcessLookupError:
+            pass
+        except PermissionError:
+            continue
+        requeued += ScrapeTask.objects.filter(id=task.id, status=ScrapeTask.RUNNING, worker=task.worker).update(
+            status=ScrapeTask.QUEUED, worker="", started_at=None
+        )
+    return requeued
+
+
+def run_task(task_id: int) -> int:
+    """Run one claimed task (in a worker process); returns the number of jobs added/merged."""
+    from .models import ScrapeTask
+    from .scraper.pipeline import ALL_PLATFORMS, purge_platform_jobs, run_scrape_pipeline
+    from .scraper.progress import PROGRESS_RETAIN_SECONDS, ProgressTracker
+
+    close_old_connections()
+    task = ScrapeTask.objects.get(id=task_id)
+    progress = ProgressTracker(task.operation_id, platform=task.platform,
+                               query=f"{task.role_name} | {task.location}")
+    print(f"Starting scrape: platform={task.platform}, role={task.role_name}, "
+          f"location={task.location}, limit={task.limit}")
+    print(f"Operation ID: {task.operation_id}")
+    try:
+        # Clear previous jobs for this platform before new search;
+        # an incremental refresh builds on them instead
+        if not task.incremental:
+            for platform in (ALL_PLATFORMS if task.platform == "all" else (task.platform,)):
+                purge_platform_jobs(platform, progress)
+
+        progress.update("initializing", 0, 100, f"Starting scrape for '{task.role_name}' jobs in '{task.location}'...")
+        count = run_scrape_pipeline(task.platform, task.role_name, task.limit, task.location, progress,
+                                    task.incremental)
+        # The pipeline reports its own failures through the tracker
+        if progress.failed:
+            finish_task(task_id, task.worker, ScrapeTask.FAILED, count, error=progress.error_message)
+            return count
+        progress.complete(f"Scrape complete. Added/merged {count} jobs.")
+        print(f"Scrape completed with {count} jobs")
+        finish_task(task_id, task.worker, ScrapeTask.COMPLETED, count)
+        return count
+    except Exception as e:
+        traceback.print_exc()
+        progress.error(f"Scrape failed: {str(e)}")
+        finish_task(task_id, task.worker, ScrapeTask.FAILED, error=str(e))
+        raise
+    finally:
+        # Keep the final progress readable for a while; the reaper removes it
+        progress.cleanup(delay=PROGRESS_RETAIN_SECONDS)
+
+
+def _init_worker_process():
+    import django
+
+    django.setup()
+    from .scraper.driver import get_driver_pool
+
+    # Start launching Chrome before the first task arrives
+    get_driver_pool()
+
+
+def _worker_pool(concurrency: int, max_tasks_per_child: int) -> ProcessPoolExecutor:
+    # Fresh interpreters: no inherited database connections or browser state
+    connections.close_all()
+    return ProcessPoolExecutor(
+        max_workers=concurrency,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker_process,
+        max_tasks_per_child=max_tasks_per_child,
+    )
+
+
+def _stop_pool(executor: ProcessPoolExecutor):
+    """Shut the pool down without waiting, terminating children still running a scrape."""
+    # No public API to stop busy workers; shutdown() drops the process table
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    for process in processes:
+        process.join(CHILD_STOP_TIMEOUT)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+
+def task_progress(operation_id: str) -> Optional[Dict[str, Any]]:
+    """Progress entry derived from the task row, for operations without live progress."""
+    from .models import ScrapeTask
+
+    task = ScrapeTask.objects.filter(operation_id=operation_id).first()
+    if task is None:
+        return None
+    if task.status == ScrapeTask.QUEUED:
+        ahead = ScrapeTask.objects.filter(status=ScrapeTask.QUEUED, created_at__lt=task.created_at).count()
+        stage, percentage, message = "queued", 0, f"Waiting for a worker ({ahead} scrapes ahead)"
+    elif task.status == ScrapeTask.RUNNING:
+        stage, percentage, message = "running", 0, f"Running on {task.worker}"
+    elif task.status == ScrapeTask.COMPLETED:
+        stage, percentage, message = "completed", 100, f"Scrape complete. Added/merged {task.result_count} jobs."
+    else:
+        stage, percentage, message = "error", 0, f"Scrape failed: {task.error or 'see the worker log'}"
+    changed_at = task.finished_at or task.started_at or task.created_at
+    return {
+        "operation_id": operation_id,
+        "stage": stage,
+        "current": percentage,
+        "total": 100,
+        "percentage": percentage,
+        "message": message,
+        "elapsed_time": ((task.finished_at or timezone.now()) - (task.started_at or task.created_at)).total_seconds(),
+        # Stable until the task changes, so streams only push real changes
+        "timestamp": changed_at.timestamp(),
+        "metrics": {},
+    }
+
+
+def run_worker(concurrency: Optional[int] = None, poll_interval: float = WORKER_POLL_INTERVAL,
+               max_tasks_per_child: int = MAX_TASKS_PER_CHILD, once: bool = False, log=print):
+    """Claim and run tasks with at most ``concurrency`` scrapes at a time."""
+    from .models import ScrapeTask
+
+    concurrency = concurrency or getattr(settings, "SCRAPE_WORKER_CONCURRENCY", SCRAPE_WORKER_CONCURRENCY)
+    worker = worker_id()
+    requeued = requeue_orphaned_tasks()
+    if requeued:
+        log(f"Requeued {requeued} tasks from workers that are gone")
+
+    executor = _worker_pool(concurrency, max_tasks_per_child)
+    running = {}
+    try:
+        while True:
+            while len(running) < concurrency:
+                task = claim_next_task(worker)
+                if task is None:
+                    break
+                log(f"Running task {task.id} ({task.platform} '{task.role_name}', operation {task.operation_id})")
+                running[executor.submit(run_task, task.id)] = task.id
+
+            if not running:
+                if once:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                task_id = running.pop(future)
+                try:
+                    log(f"Task {task_id} finished: {future.result()} jobs")
+                except Exception as e:
+                    log(f"Task {task_id} failed: {e}")
+                    broken = broken or isinstance(e, BrokenProcessPool)
+                    # A crashed child can't record its own failure
+                    finish_task(task_id, worker, ScrapeTask.FAILED, error=str(e) or e.__class__.__name__)
+            if broken and not running:
+                log("Worker process died; starting a new pool")
+                executor.shutdown(wait=False)
+                executor = _worker_pool(concurrency, max_tasks_per_child)
+    finally:
+        # Don't wait for running scrapes; their tasks go back to the queue, so
+        # the children are stopped first to keep two workers off one task
+        _stop_pool(executor)
+        if running:
+            log(f"Requeued {requeue_tasks(running.values(), worker)} running tasks")
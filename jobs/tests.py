@@ -1,3 +1,630 @@
-from django.test import TestCase
+import asyncio
+import os
+import shutil
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from unittest import mock
+from urllib.parse import urlsplit
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from selenium.common.exceptions import SessionNotCreatedException
+
+from . import tasks
+from .compression import compress_text
+from .db import register_functions, sqlite_pragmas
+from .models import Company, CompanyAlias, Job, JobSource, ScrapeRun, ScrapeTask, ScrapeWatermark
+from .scraper import (
+    chromedriver, companies, driver as driver_module, fingerprint_index, near_duplicates, pipeline, progress,
+    real_scraper,
+)
+from .scraper.companies import CompanyResolver, bump_company_generation
+from .scraper.chromedriver import ChromeDriverUnavailable, record_chromedriver, verified_manifest
+from .scraper.driver import DriverPool, build_driver
+from .scraper.fingerprint_index import FingerprintIndex
+from .scraper.hedging import SourceStats, run_hedged
+from .scraper.incremental import IncrementalCrawl
+from .scraper.near_duplicates import (
+    compute_signature, description_shingles, is_near_duplicate, locations_compatible, minhash, similarity,
+)
+from .scraper.pipeline import purge_platform_jobs, save_jobs_to_database
+from .scraper.progress import (
+    CacheProgressBackend, MemoryProgressBackend, RateMeter, SQLiteProgressBackend,
+)
+from .scraper.real_scraper import RealSite, SharedClient, fan_out_real_jobs
+
+
+class SqlitePragmaTests(SimpleTestCase):
+    def test_wal_is_on_unless_disabled(self):
+        self.assertEqual(sqlite_pragmas()["journal_mode"], "WAL")
+        self.assertEqual(sqlite_pragmas()["synchronous"], "NORMAL")
+        with override_settings(SQLITE_WAL=False):
+            self.assertNotIn("journal_mode", sqlite_pragmas())
+
+    def test_plain_connections_can_register_the_trigger_functions(self):
+        conn = sqlite3.connect(":memory:")
+        self.addCleanup(conn.close)
+        register_functions(conn)
+        self.assertEqual(conn.execute("SELECT jobs_decompress(?)", (compress_text("Data Engineer"),)).fetchone(),
+                         ("Data Engineer",))
+        # Unreadable data leaves the description unindexed instead of failing the write
+        self.assertEqual(conn.execute("SELECT jobs_decompress(?)", (b"not compressed",)).fetchone(), (None,))
+
+
+class CompanyResolverTests(TestCase):
+    def test_same_key_resolves_to_one_company(self):
+        resolver = CompanyResolver()
+        ids = resolver.resolve_many(["Google", "Google LLC", "Google, Inc."])
+        self.assertEqual(len(set(ids.values())), 1)
+        self.assertEqual(Company.objects.get().name, "Google")
+
+    def test_cache_is_dropped_when_another_process_deletes_companies(self):
+        # Two resolvers stand in for two worker processes; a zero interval
+        # checks the generation on every call
+        purging, other = CompanyResolver(check_interval=0), CompanyResolver(check_interval=0)
+        # Resolved ids are cached on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            stale_id = other.resolve("Acme")
+        self.assertEqual(len(other), 1)
+        CompanyAlias.objects.all().delete()
+        Company.objects.all().delete()
+        bump_company_generation()
+
+        fresh_id = other.resolve("Acme")
+        self.assertNotEqual(fresh_id, stale_id)
+        self.assertTrue(Company.objects.filter(id=fresh_id).exists())
+        self.assertEqual(purging.resolve("Acme"), fresh_id)
+
+    def test_generation_is_checked_once_per_interval(self):
+        resolver = CompanyResolver()
+        with self.captureOnCommitCallbacks(execute=True):
+            resolver.resolve("Acme")
+        with self.assertNumQueries(0):
+            for _ in range(3):
+                resolver.resolve("Acme")
+        # Another process deletes companies: noticed once the interval passes
+        with mock.patch.object(companies, "company_generation", return_value=1) as generation:
+            resolver.resolve("Acme")
+            generation.assert_not_called()
+            with mock.patch.object(companies.time, "monotonic", return_value=time.monotonic() + 60), \
+                    mock.patch.object(resolver, "invalidate", wraps=resolver.invalidate) as invalidate:
+                resolver.resolve("Acme")
+            generation.assert_called_once()
+            invalidate.assert_called_once()
+
+
+DESCRIPTION = (
+    "We are hiring an engineer to build and run our data platform. You will design pipelines, "
+    "own the warehouse, work with analysts on reporting and mentor other engineers on the team."
+)
+
+
+def scraped(title, company="Acme", location="New York, NY", description=DESCRIPTION, platform="indeed"):
+    return {"title": title, "company": company, "location": location, "description": description,
+            "source_url": f"https://{platform}.example/{title}", "sources": [platform]}
+
+
+class TempIndexMixin:
+    """Point the process-wide fingerprint index at a throwaway file and start with an empty company cache."""
+
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        for patcher in (
+            mock.patch.object(fingerprint_index, "_index", FingerprintIndex(os.path.join(tmp, "fp.idx"))),
+            # Ids cached on commit would outlive the test's rollback
+            mock.patch.object(companies, "_resolver", CompanyResolver()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class MinHashTests(SimpleTestCase):
+    def test_similarity_tracks_shared_shingles(self):
+        a = minhash(description_shingles(DESCRIPTION))
+        self.assertEqual(similarity(a, minhash(description_shingles(DESCRIPTION))), 1.0)
+        edited = minhash(description_shingles(DESCRIPTION.replace("mentor other engineers", "hire engineers")))
+        self.assertGreater(similarity(a, edited), 0.6)
+        unrelated = minhash(description_shingles(
+            "Our bakery is looking for a pastry chef to prepare croissants, cakes and seasonal desserts "
+            "every morning and to keep the kitchen clean and stocked."
+        ))
+        self.assertLess(similarity(a, unrelated), 0.2)
+
+    def test_empty_text_has_no_signature(self):
+        self.assertIsNone(minhash([]))
+        self.assertEqual(similarity(None, minhash(description_shingles(DESCRIPTION))), 0.0)
+
+    def test_near_duplicates_share_a_band(self):
+        a = compute_signature("Sr. Data Engineer", "Acme", "New York, NY", DESCRIPTION)
+        b = compute_signature("Senior Data Engineer", "Acme", "New York, NY 10001", DESCRIPTION)
+        self.assertTrue(set(a.band_keys()) & set(b.band_keys()))
+        self.assertTrue(is_near_duplicate(a, b))
+
+    def test_other_companies_share_no_bucket(self):
+        a = compute_signature("Software Engineer", "Acme", "New York, NY", DESCRIPTION)
+        b = compute_signature("Software Engineer", "Globex", "New York, NY", DESCRIPTION)
+        self.assertEqual(a.title, b.title)
+        self.assertFalse(set(a.band_keys()) & set(b.band_keys()))
+        same = compute_signature("Software Engineer", "Acme, Inc.", "Brooklyn, NY", DESCRIPTION)
+        self.assertEqual(set(a.band_keys()), set(same.band_keys()))
+
+    def test_pure_python_fallback_matches_numpy(self):
+        shingles = description_shingles(DESCRIPTION)
+        expected = minhash(shingles)
+        with mock.patch.object(near_duplicates, "np", None):
+            self.assertEqual(minhash(shingles), expected)
+
+
+class NearDuplicateTests(TempIndexMixin, TestCase):
+    def test_same_posting_on_another_platform_is_merged(self):
+        save_jobs_to_database([scraped("Sr. Data Engineer")], "indeed")
+        save_jobs_to_database([scraped("Senior Data Engineer", location="New York, NY 10001",
+                                       platform="glassdoor")], "glassdoor")
+        job = Job.objects.get()
+        self.assertEqual(sorted(job.sources), ["glassdoor", "indeed"])
+        self.assertEqual(JobSource.objects.filter(job=job).count(), 2)
+
+    def test_different_levels_are_not_merged(self):
+        save_jobs_to_database([scraped("Software Engineer II")], "indeed")
+        save_jobs_to_database([scraped("Software Engineer III", platform="glassdoor")], "glassdoor")
+        self.assertEqual(Job.objects.count(), 2)
+
+    def test_level_word_is_a_mismatch(self):
+        a = compute_signature("Data Engineer", "Acme", "New York, NY", DESCRIPTION)
+        b = compute_signature("Senior Data Engineer", "Acme", "New York, NY", DESCRIPTION)
+        self.assertFalse(is_near_duplicate(a, b))
+
+    def test_missing_description_is_not_agreement(self):
+        a = compute_signature("Data Engineer", "Acme", "New York, NY", DESCRIPTION)
+        b = compute_signature("Data Engineer", "Acme", "New York, NY", "N/A")
+        self.assertIsNone(b.description)
+        self.assertFalse(is_near_duplicate(a, b))
+
+    def test_empty_location_matches_nothing(self):
+        a = compute_signature("Data Engineer", "Acme", "", DESCRIPTION)
+        b = compute_signature("Data Engineer", "Acme", "Austin, TX", DESCRIPTION)
+        self.assertFalse(locations_compatible("", "Austin, TX"))
+        self.assertFalse(is_near_duplicate(a, b))
+
+    def test_same_platform_listings_are_kept_apart(self):
+        save_jobs_to_database([scraped("Sr. Data Engineer"),
+                               scraped("Senior Data Engineer", location="New York, NY 10001")], "indeed")
+        save_jobs_to_database([scraped("Senior Data Engineer", location="New York, NY 10010")], "indeed")
+        self.assertEqual(Job.objects.count(), 3)
+
+
+class StaleIndexTests(TempIndexMixin, TestCase):
+    def test_retry_keeps_near_duplicate_merges(self):
+        # Inside a TestCase the index is never updated on commit, so it stays stale
+        save_jobs_to_database([scraped("Backend Engineer", description="N/A"),
+                               scraped("Sr. Data Engineer")], "indeed")
+        save_jobs_to_database([scraped("Backend Engineer", description="N/A", platform="glassdoor"),
+                               scraped("Senior Data Engineer", location="New York, NY 10001",
+                                       platform="glassdoor")], "glassdoor")
+        self.assertEqual(Job.objects.count(), 2)
+        for job in Job.objects.all():
+            self.assertEqual(sorted(job.sources), ["glassdoor", "indeed"], job.title)
+            self.assertEqual(JobSource.objects.filter(job=job).count(), 2)
+
+    def test_purged_jobs_are_saved_again_while_the_index_still_knows_them(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            save_jobs_to_database([scraped("Data Engineer")], "indeed")
+        fp_hash = Job.objects.get().fingerprint_hash
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_platform_jobs("indeed")
+        # The purge leaves the index alone; the stale entry costs one lookup
+        self.assertIn(fp_hash, fingerprint_index._index)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(save_jobs_to_database([scraped("Data Engineer")], "indeed"), 1)
+        self.assertEqual(Job.objects.get().fingerprint_hash, fp_hash)
+
+
+class LatestJobsTests(TempIndexMixin, TestCase):
+    def latest(self, **params):
+        return self.client.get(reverse("jobs:latest_jobs"), params).json()
+
+    def test_cursor_picks_up_jobs_merged_from_another_platform(self):
+        save_jobs_to_database([scraped("Sr. Data Engineer", platform="glassdoor")], "glassdoor")
+        save_jobs_to_database([scraped("Backend Engineer")], "indeed")
+        cursor = self.latest(platform="all")["cursor"]
+        self.assertEqual(cursor, JobSource.objects.latest("id").id)
+
+        # Older job, new link
+        save_jobs_to_database([scraped("Senior Data Engineer", location="New York, NY 10001")], "indeed")
+        for platform in ("all", "indeed"):
+            data = self.latest(platform=platform, since=cursor)
+            self.assertEqual([job["title"] for job in data["jobs"]], ["Sr. Data Engineer"], platform)
+            self.assertEqual(data["cursor"], JobSource.objects.latest("id").id)
+            self.assertEqual(self.latest(platform=platform, since=data["cursor"])["count"], 0)
+
+    def test_timestamp_cursor_lists_a_job_with_two_sources_once(self):
+        save_jobs_to_database([scraped("Sr. Data Engineer")], "indeed")
+        save_jobs_to_database([scraped("Senior Data Engineer", location="New York, NY 10001",
+                                       platform="glassdoor")], "glassdoor")
+        save_jobs_to_database([scraped("Backend Engineer")], "indeed")
+        for platform in ("all", "indeed", "glassdoor"):
+            ids = [job["id"] for job in self.latest(platform=platform, since="2000-01-01T00:00:00")["jobs"]]
+            self.assertEqual(len(ids), len(set(ids)), platform)
+            self.assertEqual(len(ids), 1 if platform == "glassdoor" else 2, platform)
+
+    def test_etag_changes_when_an_older_job_is_merged(self):
+        save_jobs_to_database([scraped("Sr. Data Engineer", platform="glassdoor")], "glassdoor")
+        save_jobs_to_database([scraped("Backend Engineer")], "indeed")
+        params = {"platform": "all", "since": self.latest(platform="all")["cursor"]}
+        url = reverse("jobs:latest_jobs")
+        etag = self.client.get(url, params)["ETag"]
+        save_jobs_to_database([scraped("Senior Data Engineer", location="New York, NY 10001")], "indeed")
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+class PipelineProgressTests(TempIndexMixin, TestCase):
+    def test_platform_stage_keeps_one_scale(self):
+        def scrape(role_name, limit, location, progress=None, **kwargs):
+            for found in (1, 2):
+                progress.update("indeed", found, limit, f"Found {found} jobs")
+            return [{"job_title": title, "company_name": "Acme", "location": "New York, NY",
+                     "job_description": DESCRIPTION, "source_url": f"https://indeed.example/{title}"}
+                    for title in ("Data Engineer", "Backend Engineer")]
+
+        progress = mock.Mock(failed=False)
+        with mock.patch("jobs.scraper.indeed_scraper.scrape_indeed_jobs", side_effect=scrape):
+            pipeline.run_scrape_pipeline("indeed", "Data Engineer", 4, progress=progress)
+        updates = [c.args[1:3] for c in progress.update.call_args_list if c.args[0] == "indeed"]
+        self.assertEqual(updates, [(0, 4), (1, 4), (2, 4), (2, 4)])
+
+
+class WatermarkTests(TempIndexMixin, TestCase):
+    def test_purge_forgets_the_platform_watermark(self):
+        save_jobs_to_database([scraped("Data Engineer")], "indeed")
+        crawl = IncrementalCrawl("indeed", "data engineer", "New York, NY")
+        crawl.record("Data Engineer", "Acme", "New York, NY")
+        crawl.finish()
+        ScrapeWatermark.objects.create(platform="glassdoor", query="data engineer|", head_hashes=[1])
+
+        purge_platform_jobs("indeed")
+
+        self.assertEqual(list(ScrapeWatermark.objects.values_list("platform", flat=True)), ["glassdoor"])
+        self.assertEqual(IncrementalCrawl("indeed", "data engineer", "New York, NY").watermark, set())
+
+    def test_clear_forgets_every_watermark(self):
+        ScrapeWatermark.objects.create(platform="indeed", query="data engineer|", head_hashes=[1])
+        ScrapeWatermark.objects.create(platform="glassdoor", query="data engineer|", head_hashes=[2])
+        self.client.post(reverse("jobs:clear"))
+        self.assertFalse(ScrapeWatermark.objects.exists())
+
+
+def fake_driver(headless=True):
+    return mock.MagicMock(window_handles=["main"])
+
+
+class DriverPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.pool = DriverPool(size=1, factory=fake_driver)
+        self.addCleanup(self.pool.close)
+
+    def test_returned_session_is_cleared_for_every_origin(self):
+        driver = self.pool.checkout()
+        self.pool.checkin(driver)
+        driver.execute_cdp_cmd.assert_any_call("Network.clearBrowserCookies", {})
+        driver.execute_cdp_cmd.assert_any_call("Storage.clearDataForOrigin", {"origin": "*", "storageTypes": "all"})
+        self.assertIs(self.pool.checkout(), driver)
+
+    def test_session_that_cannot_be_cleared_is_replaced(self):
+        driver = self.pool.checkout()
+        driver.execute_cdp_cmd.side_effect = RuntimeError("CDP unavailable")
+        self.pool.checkin(driver)
+        driver.quit.assert_called_once()
+        self.assertIsNot(self.pool.checkout(), driver)
+
+
+class ChromeDriverManifestTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        self.binary = os.path.join(tmp, "chromedriver")
+        with open(self.binary, "w") as f:
+            f.write("#!/bin/sh\necho 'ChromeDriver 120.0.6099.109'\n")
+        os.chmod(self.binary, os.stat(self.binary).st_mode | stat.S_IEXEC)
+        settings = override_settings(CHROMEDRIVER_MANIFEST=os.path.join(tmp, "chromedriver.json"))
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_manifest_is_stale_once_chrome_is_upgraded(self):
+        with mock.patch.object(chromedriver, "browser_major_version", return_value="120"):
+            entry = record_chromedriver(self.binary)
+            self.assertEqual(entry["browser_major"], "120")
+            self.assertEqual(verified_manifest(), entry)
+        with mock.patch.object(chromedriver, "browser_major_version", return_value="121"):
+            self.assertIsNone(verified_manifest())
+
+    def test_refused_driver_is_downloaded_again_once(self):
+        session = mock.MagicMock()
+        with mock.patch.object(driver_module, "resolve_chromedriver", return_value={"path": "/old"}), \
+                mock.patch.object(driver_module, "redownload_chromedriver", return_value={"path": "/new"}) as redownload, \
+                mock.patch.object(driver_module, "ChromeService") as service, \
+                mock.patch.object(driver_module.webdriver, "Chrome",
+                                  side_effect=[SessionNotCreatedException("too old"), session]):
+            self.assertIs(build_driver(), session)
+        redownload.assert_called_once_with("/old")
+        self.assertEqual(service.call_args.args, ("/new",))
+
+    def test_refused_driver_is_reported_when_offline(self):
+        with mock.patch.object(driver_module, "resolve_chromedriver", return_value={"path": "/old"}), \
+                mock.patch.object(driver_module, "redownload_chromedriver",
+                                  side_effect=ChromeDriverUnavailable("offline")), \
+                mock.patch.object(driver_module, "ChromeService"), \
+                mock.patch.object(driver_module.webdriver, "Chrome", side_effect=SessionNotCreatedException("too old")):
+            with self.assertRaises(SessionNotCreatedException):
+                build_driver()
+
+
+class ScrapeWorkerTests(TestCase):
+    def test_interrupted_worker_requeues_running_tasks(self):
+        task = tasks.enqueue_scrape("op-1", "indeed", "Data Engineer", "New York, NY", 10)
+        executor = mock.MagicMock()
+        executor.submit.return_value = Future()
+        with mock.patch.object(tasks, "_worker_pool", return_value=executor), \
+                mock.patch.object(tasks, "wait", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                tasks.run_worker(concurrency=1, log=lambda message: None)
+        executor.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.worker), (ScrapeTask.QUEUED, ""))
+
+    def test_stopping_the_pool_terminates_busy_children(self):
+        child = mock.MagicMock()
+        child.is_alive.side_effect = [True, False]
+        executor = mock.MagicMock(_processes={1: child})
+        tasks._stop_pool(executor)
+        executor.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+        child.terminate.assert_called_once_with()
+        child.join.assert_called_once_with(tasks.CHILD_STOP_TIMEOUT)
+        child.kill.assert_not_called()
+
+    def test_late_result_of_a_requeued_task_is_ignored(self):
+        task = tasks.enqueue_scrape("op-1", "indeed", "Data Engineer", "New York, NY", 10)
+        tasks.claim_next_task("host:1")
+        tasks.requeue_tasks([task.id], "host:1")
+        tasks.claim_next_task("host:2")
+        tasks.finish_task(task.id, "host:1", ScrapeTask.COMPLETED, 5)
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.worker), (ScrapeTask.RUNNING, "host:2"))
+
+    def test_finished_run_records_one_terminal_stage(self):
+        task = tasks.enqueue_scrape("op-1", "indeed", "Data Engineer", "New York, NY", 10, incremental=True)
+        tasks.claim_next_task(tasks.worker_id())
+        with mock.patch.object(progress, "_backend", progress.MemoryProgressBackend()), \
+                mock.patch.object(pipeline, "scrape_indeed_from_role", return_value=[]):
+            self.assertEqual(tasks.run_task(task.id), 0)
+            self.assertEqual(progress.get_progress("op-1")["stage"], "completed")
+        run = ScrapeRun.objects.get(operation_id="op-1")
+        self.assertEqual(run.status, "completed")
+        self.assertEqual([stage["stage"] for stage in run.stages], ["initializing", "scraping", "processing"])
+
+
+class FingerprintIndexTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        self.path = os.path.join(tmp, "fp.idx")
+
+    def index(self):
+        # Each instance stands in for another worker process sharing the files
+        index = FingerprintIndex(self.path)
+        self.addCleanup(index.close)
+        return index
+
+    def test_appended_hashes_are_seen_by_other_processes(self):
+        writer, reader = self.index(), self.index()
+        self.assertEqual(reader.known([1, 2]), set())
+        writer.add_many([2, -5])
+        self.assertEqual(reader.known([1, 2, -5]), {2, -5})
+        self.assertEqual(os.path.getsize(writer.log_path), 16)
+
+    def test_compaction_merges_the_log_into_the_snapshot(self):
+        writer, reader = self.index(), self.index()
+        writer.rebuild([1, 3, 5])
+        writer.add_many([4, 2])
+        self.assertEqual(len(reader), 5)
+        writer.compact()
+        self.assertEqual(os.path.getsize(writer.log_path), 0)
+        self.assertEqual(reader.known(range(7)), {1, 2, 3, 4, 5})
+        self.assertEqual(len(reader), 5)
+
+    def test_log_compacts_itself_past_the_threshold(self):
+        index = self.index()
+        with mock.patch.object(fingerprint_index, "COMPACT_THRESHOLD", 3):
+            index.add_many([9, 7])
+            self.assertEqual(os.path.getsize(index.log_path), 16)
+            index.add(8)
+        self.assertEqual(os.path.getsize(index.log_path), 0)
+        self.assertEqual(index.known([7, 8, 9]), {7, 8, 9})
+
+    def test_rebuild_replaces_everything(self):
+        writer, reader = self.index(), self.index()
+        writer.add_many([1, 2])
+        self.assertEqual(len(reader), 2)
+        writer.rebuild([10, 20])
+        self.assertEqual(reader.known([1, 2, 10, 20]), {10, 20})
+
+
+class RateMeterTests(SimpleTestCase):
+    def test_rate_over_the_window(self):
+        meter = RateMeter(0, window=10)
+        meter.add(10, 10)
+        meter.add(10, 20)
+        self.assertEqual(meter.count, 20)
+        self.assertAlmostEqual(meter.rate(20), 1.0)
+        # Half of the 10..20 interval is still in the window
+        self.assertAlmostEqual(meter.rate(25), 0.5)
+
+    def test_rate_drops_to_zero_when_idle(self):
+        meter = RateMeter(0, window=10)
+        meter.add(5, 1)
+        self.assertEqual(meter.rate(100), 0.0)
+        self.assertEqual(RateMeter(0).rate(0), 0.0)
+
+
+class ProgressBackendTests(SimpleTestCase):
+    def backends(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        return [MemoryProgressBackend(), CacheProgressBackend(), SQLiteProgressBackend(os.path.join(tmp, "p.sqlite3"))]
+
+    def test_set_get_delete(self):
+        for backend in self.backends():
+            with self.subTest(backend=type(backend).__name__):
+                self.assertIsNone(backend.get("op"))
+                backend.set("op", {"stage": "scraping", "current": 3}, ttl=60)
+                self.assertEqual(backend.get("op"), {"stage": "scraping", "current": 3})
+                backend.set("op", {"stage": "completed"}, ttl=60)
+                self.assertEqual(backend.get("op")["stage"], "completed")
+                backend.delete("op")
+                self.assertIsNone(backend.get("op"))
+
+    def test_expired_entries_are_gone(self):
+        for backend in self.backends():
+            with self.subTest(backend=type(backend).__name__):
+                backend.set("old", {"stage": "scraping"}, ttl=-1)
+                backend.set("new", {"stage": "scraping"}, ttl=60)
+                backend.purge_expired()
+                self.assertIsNone(backend.get("old"))
+                self.assertIsNotNone(backend.get("new"))
+                backend.delete("new")
+
+    def test_legacy_files_are_removed_from_the_project_directory_only(self):
+        project, elsewhere = tempfile.mkdtemp(), tempfile.mkdtemp()
+        for directory in (project, elsewhere):
+            self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+            open(os.path.join(directory, "progress_op.json"), "w").close()
+        with override_settings(BASE_DIR=project), mock.patch("os.getcwd", return_value=elsewhere):
+            progress.ProgressReaper.remove_legacy_files()
+        self.assertEqual(os.listdir(project), [])
+        self.assertEqual(os.listdir(elsewhere), ["progress_op.json"])
+
+
+class HedgingTests(SimpleTestCase):
+    def test_failing_source_is_ranked_last(self):
+        stats = SourceStats()
+        for _ in range(3):
+            stats.record("flaky", False, 10.0)
+            stats.record("steady", True, 2.0)
+        self.assertEqual(stats.rank(["flaky", "new", "steady"]), ["steady", "new", "flaky"])
+
+    def test_fast_first_source_is_not_hedged(self):
+        second = mock.Mock(return_value=[2])
+        name, jobs = run_hedged([("first", lambda: [1]), ("second", second)], bool,
+                                hedge_delay=5, stats=SourceStats())
+        self.assertEqual((name, jobs), ("first", [1]))
+        second.assert_not_called()
+
+    def test_slow_source_is_hedged(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def slow():
+            release.wait(5)
+            return [1]
+
+        name, jobs = run_hedged([("slow", slow), ("fast", lambda: [1, 2])], bool,
+                                hedge_delay=0.05, stats=SourceStats())
+        self.assertEqual((name, jobs), ("fast", [1, 2]))
+
+    def test_failed_source_is_replaced_straight_away(self):
+        def broken():
+            raise RuntimeError("blocked")
+
+        started = time.monotonic()
+        name, _ = run_hedged([("broken", broken), ("backup", lambda: [1])], bool,
+                             hedge_delay=30, stats=SourceStats())
+        self.assertEqual(name, "backup")
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_largest_result_wins_when_none_is_adequate(self):
+        name, jobs = run_hedged([("a", lambda: [1]), ("b", lambda: [1, 2]), ("c", lambda: [])],
+                                lambda jobs: len(jobs) >= 3, hedge_delay=0, stats=SourceStats())
+        self.assertEqual((name, jobs), ("b", [1, 2]))
+
+
+class FakeTransport:
+    """Stands in for httpx.AsyncClient; each URL answers with its own text after ``delays[url]`` seconds."""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.active = Counter()
+        self.peak = Counter()
+        self.most_in_flight = 0
+        self.cancelled = []
+
+    async def get(self, url):
+        host = urlsplit(url).netloc
+        self.active[host] += 1
+        self.peak[host] = max(self.peak[host], self.active[host])
+        self.most_in_flight = max(self.most_in_flight, sum(self.active.values()))
+        try:
+            await asyncio.sleep(self.delays.get(url, 0.01))
+        except asyncio.CancelledError:
+            self.cancelled.append(url)
+            raise
+        finally:
+            self.active[host] -= 1
+        return mock.Mock(status_code=200, text=url)
+
+    async def aclose(self):
+        pass
+
+
+def site(url, titles, parsed_on=None):
+    def parse(text, max_jobs):
+        if parsed_on is not None:
+            parsed_on.append(threading.get_ident())
+        return [{"job_title": title, "company_name": "Acme", "source_url": text} for title in titles][:max_jobs]
+
+    return RealSite(url, lambda keyword, location: url, parse)
+
+
+class RealScraperTests(SimpleTestCase):
+    def fan_out(self, sites, transport, max_jobs=50):
+        # A fake httpx module makes SharedClient use the transport
+        with mock.patch.object(real_scraper, "httpx", mock.Mock(AsyncClient=lambda **kwargs: transport)):
+            return asyncio.run(fan_out_real_jobs("data engineer", "Remote", max_jobs,
+                                                 sites=sites, client=SharedClient()))
+
+    def test_sites_are_fetched_together_and_parsed_off_the_loop(self):
+        transport, parsed_on = FakeTransport(), []
+        sites = [site(f"https://{host}.example/jobs", ["Data Engineer", f"{host} Engineer"], parsed_on)
+                 for host in ("a", "b", "c")]
+        jobs = self.fan_out(sites, transport)
+        # The shared job is kept once
+        self.assertEqual(sorted(job["job_title"] for job in jobs),
+                         ["Data Engineer", "a Engineer", "b Engineer", "c Engineer"])
+        self.assertEqual(transport.most_in_flight, 3)
+        self.assertEqual(len(parsed_on), 3)
+        self.assertNotIn(threading.get_ident(), parsed_on)
+
+    def test_requests_per_host_are_limited(self):
+        transport = FakeTransport()
+        sites = [site(f"https://busy.example/jobs?page={page}", [f"Job {page}"]) for page in range(5)]
+        sites.append(site("https://quiet.example/jobs", ["Quiet Job"]))
+        self.assertEqual(len(self.fan_out(sites, transport)), 6)
+        self.assertEqual(transport.peak["busy.example"], real_scraper.HOST_CONCURRENCY)
+        self.assertEqual(transport.peak["quiet.example"], 1)
+
+    def test_outstanding_requests_are_cancelled_once_max_jobs_are_in(self):
+        slow = "https://slow.example/jobs"
+        transport = FakeTransport({slow: 30})
+        sites = [site(slow, ["Slow Job"]), site("https://fast.example/jobs", ["Job 1", "Job 2", "Job 3"])]
+        started = time.monotonic()
+        jobs = self.fan_out(sites, transport, max_jobs=2)
+        self.assertEqual([job["job_title"] for job in jobs], ["Job 1", "Job 2"])
+        self.assertEqual(transport.cancelled, [slow])
+        self.assertLess(time.monotonic() - started, 5)
@@ -9,7 +9,12 @@ urlpatterns = [
 path('', views.dashboard, name='dashboard'),
 path('scrape/', views.run_scrape, name='scrape'),
 path('progress/<str:operation_id>/', views.get_scrape_progress, name='progress'),
+path('progress/<str:operation_id>/stream/', views.stream_progress, name='progress_stream'),
 path('clear/', views.clear_jobs, name='clear'),
 path('latest-jobs/', views.get_latest_jobs, name='latest_jobs'),
+path('search/', views.search_jobs_view, name='search'),
+path('stats/', views.job_stats, name='stats'),
+path('jobs/<int:job_id>/description/', views.job_description, name='job_description'),
 path('download-csv/', views.download_csv, name='download_csv'),
+path('download-parquet/', views.download_parquet, name='download_parquet'),
 ]
\ No newline at end of file
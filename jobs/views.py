@@ -1,14 +1,28 @@
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse, FileResponse
 from django.views.decorators.csrf import csrf_exempt
 import json
 import uuid
 import csv
+import hashlib
+import zlib
+import tempfile
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import condition
+from .export import write_parquet
 from .forms import ScrapeForm
-from .scraper.pipeline import run_scrape_pipeline
-from .scraper.progress import ProgressTracker, get_progress
-from .models import Job
+from .scraper.companies import bump_company_generation
+from .scraper.fingerprint_index import rebuild_fingerprint_index
+from .scraper.progress import get_progress
+from .events import ProgressStream
+from .models import Job, JobSource
+from .search import SEARCH_MAX_PAGE_SIZE, SEARCH_PAGE_SIZE, SearchUnavailable, search_jobs
+from .stats import STATS_DAYS, STATS_TOP_LIMIT, stats_snapshot
+from .tasks import enqueue_scrape
 
 
 
@@ -28,68 +42,32 @@ def run_scrape(request):
             role_name = form.cleaned_data['role_name']
             location = form.cleaned_data['location']
             limit = form.cleaned_data['limit']
+            incremental = form.cleaned_data['incremental']
             
-            # Generate operation ID for progress tracking
-            operation_id = str(uuid.uuid4())
-            progress = ProgressTracker(operation_id)
+            # Operation ID for progress tracking; the dashboard sends its own
+            # so it can open the progress stream before the task starts
+            operation_id = str(form.cleaned_data['operation_id'] or uuid.uuid4())
             
-            print(f"Starting scrape: platform={platform}, role={role_name}, location={location}, limit={limit}")
+            # A scrape_worker process runs it; progress/<operation_id>/ follows it
+            enqueue_scrape(operation_id, platform, role_name, location, limit, incremental)
+            print(f"Queued scrape: platform={platform}, role={role_name}, location={location}, limit={limit}")
             print(f"Operation ID: {operation_id}")
             
-            try:
-                # Clear previous jobs for this platform before new search
-                print(f"Clearing previous {platform} jobs before new search...")
-                all_jobs = Job.objects.all()
-                jobs_to_delete = [job for job in all_jobs if platform in job.sources]
-                for job in jobs_to_delete:
-                    job.delete()
-                print(f"Cleared {len(jobs_to_delete)} previous {platform} jobs")
-                
-                # Update progress
-                progress.update("initializing", 0, 100, f"Starting scrape for '{role_name}' jobs in '{location}'...")
-                
-                # Run the scrape pipeline
-                count = run_scrape_pipeline(platform, role_name, limit, location, progress)
-                
-                # Mark as complete
-                progress.complete(f"Scrape complete. Added/merged {count} jobs.")
-                
-                print(f"Scrape completed with {count} jobs")
-                
-                # Show search results after successful scrape
-                if count > 0:
-                    # Get the most recent jobs for this search (SQLite compatible)
-                    all_jobs = Job.objects.all().order_by('-scraped_at')
-                    recent_jobs = [job for job in all_jobs if platform in job.sources][:50]
-                    return render(request, 'jobs/dashboard.html', {
-                        "form": ScrapeForm(),
-                        "jobs": recent_jobs,
-                        "search_role": role_name,
-                        "search_location": location,
-                        "search_platform": platform
-                    })
-                
-            except Exception as e:
-                progress.error(f"Scrape failed: {str(e)}")
-                print(f"Scrape failed: {e}")
-                messages.error(request, f"Scrape failed: {str(e)}")
-            
-            finally:
-                # Clean up progress file after a delay
-                import threading
-                def cleanup():
-                    import time
-                    time.sleep(10)  # Keep progress for 10 seconds
-                    progress.cleanup()
-                
-                threading.Thread(target=cleanup).start()
-            
+            if _wants_json(request):
+                return JsonResponse({'success': True, 'operation_id': operation_id, 'status': 'queued'}, status=202)
+            messages.success(request, f"Scrape queued for '{role_name}' in '{location}' (operation {operation_id}).")
             return redirect('jobs:dashboard')
         else:
             print(f"Form validation failed: {form.errors}")
+            if _wants_json(request):
+                return JsonResponse({'success': False, 'errors': form.errors}, status=400)
             messages.error(request, "Form validation failed.")
             return redirect('jobs:dashboard')
 
+
+def _wants_json(request):
+    return 'application/json' in request.headers.get('Accept', '')
+
 @csrf_exempt
 def get_scrape_progress(request, operation_id):
     """Get progress for a scraping operation"""
@@ -98,52 +76,115 @@ def get_scrape_progress(request, operation_id):
         return JsonResponse(progress_data)
     return JsonResponse({"error": "Method not allowed"}, status=405)
 
+def stream_progress(request, operation_id):
+    """Server-Sent Events with the progress and new job rows of an operation"""
+    if request.method != 'GET':
+        return JsonResponse({"error": "Method not allowed"}, status=405)
+    cursor = request.headers.get('Last-Event-ID') or request.GET.get('since', '')
+    stream = ProgressStream(
+        operation_id,
+        request.GET.get('platform', 'indeed'),
+        int(cursor) if cursor.isdigit() else None,
+    )
+    # Async iteration lets an ASGI server hold the connection without a thread
+    events = stream.aevents() if isinstance(request, ASGIRequest) else stream.events()
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
 def clear_jobs(request):
     """Clear all jobs from the database"""
     if request.method == 'POST':
         try:
             Job.objects.all().delete()
-            from .models import Company
+            from .models import Company, Description, JobStat, ScrapeWatermark
             Company.objects.all().delete()
+            Description.objects.all().delete()
+            JobStat.objects.all().delete()
+            ScrapeWatermark.objects.all().delete()
+            rebuild_fingerprint_index()
+            bump_company_generation()
             messages.success(request, "All jobs and companies cleared successfully!")
         except Exception as e:
             messages.error(request, f"Error clearing jobs: {str(e)}")
     return redirect('jobs:dashboard')
 
 
+CSV_HEADER = ['Job Title', 'Company Name', 'Job Location', 'Job Description', 'Source URL', 'Sources', 'Scraped At']
+CSV_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """File-like object whose write() hands the value back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_rows(jobs):
+    """Yield the export as encoded CSV lines, one database chunk at a time."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_HEADER).encode('utf-8')
+    for job in jobs:
+        sources_str = ', '.join(job.sources) if job.sources else ''
+        yield writer.writerow([
+            job.title,
+            job.company.name,
+            job.location,
+            job.description,
+            job.source_url,
+            sources_str,
+            job.scraped_at.strftime('%Y-%m-%d %H:%M:%S')
+        ]).encode('utf-8')
+
+
+def _gzip_stream(chunks, flush_every=64 * 1024):
+    """Compress an iterable of byte strings into a gzip stream."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    pending = 0
+    for chunk in chunks:
+        pending += len(chunk)
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+        if pending >= flush_every:
+            yield compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+    yield compressor.flush()
+
+
 def download_csv(request):
-    """Download jobs as CSV file"""
+    """Download jobs as CSV file, streamed in chunks (``?compress=gzip`` for .csv.gz,
+    ``?history=1`` to include archived jobs)"""
     if request.method == 'GET':
         try:
             # Get the platform from request parameters
             platform = request.GET.get('platform', 'all')
+            compress = request.GET.get('compress', '')
+            if compress not in ('', 'gzip'):
+                raise ValueError(f"Unsupported compression: {compress}")
             
             # Get jobs based on platform filter
             if platform == 'all':
                 jobs = Job.objects.all().order_by('-scraped_at')
             else:
-                all_jobs = Job.objects.all().order_by('-scraped_at')
-                jobs = [job for job in all_jobs if platform in job.sources]
-            
-            # Create CSV response
-            response = HttpResponse(content_type='text/csv')
-            response['Content-Disposition'] = f'attachment; filename="jobs_{platform}_{platform if platform != "all" else "all"}.csv"'
-            
-            writer = csv.writer(response)
-            writer.writerow(['Job Title', 'Company Name', 'Job Location', 'Job Description', 'Source URL', 'Sources', 'Scraped At'])
-            
-            for job in jobs:
-                sources_str = ', '.join(job.sources) if job.sources else ''
-                writer.writerow([
-                    job.title,
-                    job.company.name,
-                    job.location,
-                    job.description,
-                    job.source_url,
-                    sources_str,
-                    job.scraped_at.strftime('%Y-%m-%d %H:%M:%S')
-                ])
+                jobs = Job.objects.for_platform(platform)
+            if request.GET.get('history') == '1':
+                jobs = Job.objects.with_history(platform=None if platform == 'all' else platform)
+            else:
+                jobs = jobs.select_related('company', 'description_blob').only(
+                    'title', 'company__name', 'location', 'description_blob__data', 'source_url', 'sources', 'scraped_at'
+                ).iterator(chunk_size=CSV_CHUNK_SIZE)
             
+            # Create streaming CSV response
+            filename = f'jobs_{platform}_{platform if platform != "all" else "all"}.csv'
+            if compress == 'gzip':
+                response = StreamingHttpResponse(_gzip_stream(_csv_rows(jobs)), content_type='application/gzip')
+                filename += '.gz'
+            else:
+                response = StreamingHttpResponse(_csv_rows(jobs), content_type='text/csv')
+            response['Content-Disposition'] = f'attachment; filename="{filename}"'
             return response
             
         except Exception as e:
@@ -152,37 +193,176 @@ def download_csv(request):
     
     return redirect('jobs:dashboard')
 
+def download_parquet(request):
+    """Download jobs as a Parquet file (dictionary-encoded, one row group per batch)"""
+    if request.method == 'GET':
+        try:
+            platform = request.GET.get('platform', 'all')
+            # Parquet writes its footer last, so build the file on disk first
+            export_file = tempfile.NamedTemporaryFile(suffix='.parquet')
+            write_parquet(export_file.name, platform)
+            export_file.seek(0)
+            return FileResponse(export_file, as_attachment=True, filename=f'jobs_{platform}.parquet',
+                                content_type='application/vnd.apache.parquet')
+        except Exception as e:
+            messages.error(request, f"Error generating Parquet export: {str(e)}")
+            return redirect('jobs:dashboard')
+
+    return redirect('jobs:dashboard')
+
+
+LATEST_JOBS_LIMIT = 50
+LATEST_JOBS_FIELDS = ('id', 'title', 'company__name', 'location', 'sources', 'source_url', 'scraped_at')
+
+
+def _latest_jobs_query(request):
+    """
+    Build the queryset behind get_latest_jobs from the request parameters.
+
+    ``since`` is either a JobSource id (the ``cursor`` of the previous
+    response) or an ISO timestamp; when present only jobs linked to the
+    platform after it are returned, oldest first, so clients can page
+    forward. Keying on the link rather than the job means a job merged from
+    another platform shows up too, although its own id is old.
+    """
+    platform = request.GET.get('platform', 'indeed')
+    since = request.GET.get('since', '').strip()
+
+    # Conditions on the platform's link go in one filter() call with it, so
+    # they apply to the same JobSource row (separate calls add a join each,
+    # repeating jobs linked to several platforms)
+    if platform == 'all':
+        # Every job once, by its own scrape time
+        links = JobSource.objects.all()
+        on_link = {}
+        scraped_at = 'scraped_at'
+    else:
+        links = JobSource.objects.filter(platform=platform)
+        on_link = {'source_links__platform': platform}
+        scraped_at = 'source_links__scraped_at'
+    if not since:
+        return links, Job.objects.filter(**on_link).order_by(f'-{scraped_at}')
+    if since.isdigit():
+        jobs = Job.objects.filter(source_links__id__gt=int(since), **on_link)
+        return links.filter(id__gt=int(since)), jobs.annotate(link_id=Max('source_links__id')).order_by('link_id')
+
+    since_at = parse_datetime(since)
+    if since_at is None:
+        raise ValueError(f"Invalid since cursor: {since}")
+    if timezone.is_naive(since_at):
+        since_at = timezone.make_aware(since_at)
+    return (
+        links.filter(scraped_at__gt=since_at),
+        Job.objects.filter(**{f'{scraped_at}__gt': since_at}, **on_link).order_by(scraped_at, 'id'),
+    )
+
+def _latest_jobs_etag(request):
+    """ETag derived from the newest link id and row count of the requested window."""
+    try:
+        links, _ = _latest_jobs_query(request)
+    except ValueError:
+        return None
+    state = links.aggregate(last=Max('id'), total=Count('id'))
+    key = f"{request.GET.urlencode()}|{state['last']}|{state['total']}"
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+@condition(etag_func=_latest_jobs_etag)
 def get_latest_jobs(request):
     """Get the latest jobs for real-time display"""
     if request.method == 'GET':
         try:
-            # Get the platform from request parameters
-            platform = request.GET.get('platform', 'indeed')
-            
-            # Get the most recent jobs for the current platform (SQLite compatible)
-            all_jobs = Job.objects.all().order_by('-scraped_at')
-            jobs = [job for job in all_jobs if platform in job.sources][:50]
-            
+            links, jobs = _latest_jobs_query(request)
+            keyset = 'link_id' in jobs.query.annotations
+            fields = LATEST_JOBS_FIELDS + ('link_id',) if keyset else LATEST_JOBS_FIELDS
+            rows = list(jobs.values(*fields)[:LATEST_JOBS_LIMIT + 1])
+            has_more = len(rows) > LATEST_JOBS_LIMIT
+            rows = rows[:LATEST_JOBS_LIMIT]
+
             jobs_data = []
-            for job in jobs:
+            for row in rows:
                 jobs_data.append({
-                    'id': job.id,
-                    'title': job.title,
-                    'company': job.company.name,
-                    'location': job.location,
-                    'sources': job.sources,
-                    'source_url': job.source_url,
-                    'scraped_at': job.scraped_at.strftime('%Y-%m-%d %H:%M')
+                    'id': row['id'],
+                    'title': row['title'],
+                    'company': row['company__name'],
+                    'location': row['location'],
+                    'sources': row['sources'],
+                    'source_url': row['source_url'],
+                    'scraped_at': row['scraped_at'].strftime('%Y-%m-%d %H:%M')
                 })
-            
+
+            # Cursor for the next poll: the highest JobSource id the client has seen
+            since = request.GET.get('since', '')
+            if keyset:
+                cursor = rows[-1]['link_id'] if rows else int(since)
+            else:
+                cursor = links.aggregate(last=Max('id'))['last']
+
             return JsonResponse({
                 'success': True,
                 'jobs': jobs_data,
-                'count': len(jobs_data)
+                'count': len(jobs_data),
+                'cursor': cursor,
+                'has_more': has_more,
             })
         except Exception as e:
             return JsonResponse({
                 'success': False,
                 'error': str(e)
             })
-    return JsonResponse({'success': False, 'error': 'Method not allowed'}, status=405)
\ No newline at end of file
+    return JsonResponse({'success': False, 'error': 'Method not allowed'}, status=405)
+
+
+def job_stats(request):
+    """Dashboard statistics from the summary table (?limit= top entries, ?days= of history)"""
+    if request.method == 'GET':
+        try:
+            limit = int(request.GET.get('limit', STATS_TOP_LIMIT))
+            days = int(request.GET.get('days', STATS_DAYS))
+        except ValueError:
+            return JsonResponse({'success': False, 'error': 'limit and days must be integers'}, status=400)
+        return JsonResponse({'success': True, **stats_snapshot(limit, max(1, days))})
+    return JsonResponse({'success': False, 'error': 'Method not allowed'}, status=405)
+
+
+def job_description(request, job_id):
+    """Description text of one job; list views load it on demand instead of per row"""
+    if request.method == 'GET':
+        job = Job.objects.with_descriptions().only('id', 'description_blob__data').filter(id=job_id).first()
+        if job is None:
+            return JsonResponse({'success': False, 'error': 'Job not found'}, status=404)
+        return JsonResponse({'success': True, 'id': job.id, 'description': job.description})
+    return JsonResponse({'success': False, 'error': 'Method not allowed'}, status=405)
+
+
+def search_jobs_view(request):
+    """Full-text search over title, company and description (?q=&page=&per_page=)"""
+    if request.method == 'GET':
+        query = request.GET.get('q', '').strip()
+        try:
+            page = int(request.GET.get('page', 1))
+            per_page = int(request.GET.get('per_page', SEARCH_PAGE_SIZE))
+        except ValueError:
+            return JsonResponse({'success': False, 'error': 'page and per_page must be integers'}, status=400)
+
+        try:
+            results, total = search_jobs(query, page, per_page)
+        except SearchUnavailable as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=501)
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            })
+
+        per_page = max(1, min(per_page, SEARCH_MAX_PAGE_SIZE))
+        return JsonResponse({
+            'success': True,
+            'query': query,
+            'page': max(1, page),
+            'per_page': per_page,
+            'total': total,
+            'pages': (total + per_page - 1) // per_page,
+            'jobs': results,
+        })
+    return JsonResponse({'success': False, 'error': 'Method not allowed'}, status=405)
@@ -2,6 +2,9 @@
 ASGI config for jobsuite project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serving the project with an ASGI server (e.g. ``uvicorn jobsuite.asgi:application``)
+lets the scrape progress streams (jobs/events.py) wait on the event loop
+instead of holding a worker thread each.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
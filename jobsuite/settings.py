@@ -77,9 +77,66 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections open between requests instead of reconnecting
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Seconds to wait for a lock before "database is locked"
+            'timeout': 20,
+            # Take the write lock up front so transactions don't deadlock on upgrade
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
+# Shared sorted array of job fingerprint hashes (see jobs/scraper/fingerprint_index.py)
+FINGERPRINT_INDEX_PATH = BASE_DIR / 'fingerprints.idx'
+
+# Pragmas applied to every new SQLite connection (see jobs/db.py); entries
+# here override the defaults there.
+SQLITE_PRAGMAS = {}
+# WAL journaling lets the dashboard read while scrapers write. The database
+# keeps git-ignored -wal/-shm files beside it while connections are open
+# (see jobs/db.py); False keeps the rollback journal
+SQLITE_WAL = True
+
+# Jobs scraped longer ago than this move to the archive table when
+# "manage.py archive_jobs" runs (see jobs/archive.py)
+ARCHIVE_AFTER_DAYS = 90
+
+# Where scrape progress is kept (see jobs/scraper/progress.py): "memory" for a
+# single web process, "cache" (Django cache) or "sqlite" to share it between
+# processes and nodes. Scrapes run in "manage.py scrape_worker", so the web
+# process needs a shared store. Entries expire PROGRESS_TTL seconds after
+# their last update.
+PROGRESS_BACKEND = 'sqlite'
+PROGRESS_TTL = 3600
+PROGRESS_SQLITE_PATH = BASE_DIR / 'progress.sqlite3'
+
+# Scrapes "manage.py scrape_worker" runs at once, each in its own process
+# (see jobs/tasks.py)
+SCRAPE_WORKER_CONCURRENCY = 2
+
+# Seconds an "all platforms" scrape may run; each platform stops paging then
+ALL_PLATFORMS_DEADLINE = 15 * 60
+
+# Seconds the multi-site fallback gives its best-ranked site before starting
+# the next ones in parallel (see jobs/scraper/hedging.py)
+SCRAPE_HEDGE_DELAY = 5.0
+
+# Chrome sessions each scrape worker process keeps warm and shares between its
+# scrapers; a session is replaced after DRIVER_MAX_USES scrapes
+# (see jobs/scraper/driver.py)
+DRIVER_POOL_SIZE = 2
+DRIVER_MAX_USES = 20
+
+# chromedriver is resolved once per process and recorded, with its checksum,
+# in CHROMEDRIVER_MANIFEST (see jobs/scraper/chromedriver.py). Air-gapped
+# workers set CHROMEDRIVER_PATH (or run "manage.py chromedriver --path ...")
+# and CHROMEDRIVER_OFFLINE so webdriver-manager is never consulted.
+CHROMEDRIVER_MANIFEST = BASE_DIR / 'chromedriver.json'
+CHROMEDRIVER_OFFLINE = False
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators